@@ -1,9 +1,11 @@
-import pandas as pd
-import numpy_financial as npf
+from Flujo_de_caja_columnar import calcular_columnas
 
-def calcular_flujo_de_caja(años, precio_energia, produccion_anual, subsidios, costos_om, costos_combustible, costos_capital, costos_seguro, otros_costos, inversion_inicial, tasa_impuestos, tasa_descuento):
+def calcular_flujo_de_caja(años, precio_energia, produccion_anual, subsidios, costos_om, costos_combustible, costos_capital, costos_seguro, otros_costos, inversion_inicial, tasa_impuestos, tasa_descuento, columnas=None):
     """
-    Calcula el flujo de caja de una planta de energía y retorna un DataFrame con los resultados.
+    Calcula el flujo de caja de una planta de energía y retorna los resultados por columnas.
+
+    Las columnas se calculan en arreglos de NumPy; el DataFrame de pandas se construye solo al llamar a
+    `to_dataframe()` sobre el resultado.
 
     Args:
     años (int): Número de años de análisis.
@@ -18,56 +20,12 @@ def calcular_flujo_de_caja(años, precio_energia, produccion_anual, subsidios, c
     inversion_inicial (float): Inversión inicial en la planta.
     tasa_impuestos (float): Tasa de impuestos sobre la renta.
     tasa_descuento (float): Tasa de descuento para el cálculo del VAN.
+    columnas (list of str, opcional): Columnas a calcular (ver Flujo_de_caja_columnar.COLUMNAS). Por defecto, todas.
 
     Returns:
-    pd.DataFrame: DataFrame con los resultados del flujo de caja, incluyendo VAN y TIR.
+    ResultadoFlujoDeCaja: Resultado columnar del flujo de caja, incluyendo VAN y TIR.
     """
-    
-    # Definición de las columnas del DataFrame
-    columnas = ['Año', 'Ingresos', 'Subsidios', 'Costos de O&M', 'Costos de Combustible', 'Costos de Capital', 'Seguros', 'Otros Costos', 'Total Gastos', 'Ingresos Netos', 'Impuestos', 'Flujo de Caja Operativo', 'Inversiones de Capital', 'Flujo de Caja Libre', 'VAN', 'TIR']
-    data = []
-
-    # Lista para almacenar los flujos de caja libre de cada año
-    flujos_caja_libre = []
-    
-    for año in range(1, años + 1):
-        # Cálculo de ingresos por venta de energía
-        ingresos = produccion_anual * precio_energia
-        
-        # Cálculo del total de gastos
-        total_gastos = costos_om + costos_combustible + costos_capital + costos_seguro + otros_costos
-        
-        # Cálculo de ingresos netos (ingresos más subsidios menos total de gastos)
-        ingresos_netos = ingresos + subsidios - total_gastos
-        
-        # Cálculo de impuestos
-        impuestos = ingresos_netos * tasa_impuestos
-        
-        # Cálculo del flujo de caja operativo
-        flujo_caja_operativo = ingresos_netos - impuestos
-        
-        # Inversión de capital en el primer año
-        inversiones_capital = inversion_inicial if año == 1 else 0
-        lo
-        # Cálculo del flujo de caja libre
-        flujo_caja_libre = flujo_caja_operativo - inversiones_capital
-        
-        # Almacenar el flujo de caja libre en la lista
-        flujos_caja_libre.append(flujo_caja_libre)
-        
-        # Cálculo del VAN utilizando numpy_financial
-        VAN = npf.npv(tasa_descuento, flujos_caja_libre)
-        
-        # Cálculo de la TIR utilizando numpy_financial
-        TIR = npf.irr(flujos_caja_libre)
-
-        # Añadir los datos del año al DataFrame
-        data.append([año, ingresos, subsidios, costos_om, costos_combustible, costos_capital, costos_seguro, otros_costos, total_gastos, ingresos_netos, impuestos, flujo_caja_operativo, inversiones_capital, flujo_caja_libre, VAN, TIR])
-    
-    # Crear el DataFrame con los datos
-    df_flujo_caja = pd.DataFrame(data, columns=columnas)
-
-    return df_flujo_caja
+    return calcular_columnas(años, precio_energia, produccion_anual, subsidios, costos_om, costos_combustible, costos_capital, costos_seguro, otros_costos, inversion_inicial, tasa_impuestos, tasa_descuento, columnas)
 
 
 
@@ -86,7 +44,7 @@ def calcular_flujo_de_caja(años, precio_energia, produccion_anual, subsidios, c
 # tasa_descuento = 0.1  # Tasa de descuento para el cálculo del VAN
 
 # # Llamada a la función calcular_flujo_de_caja
-# df_flujo_caja = calcular_flujo_de_caja(años, precio_energia, produccion_anual, subsidios, costos_om, costos_combustible, costos_capital, costos_seguro, otros_costos, inversion_inicial, tasa_impuestos, tasa_descuento)
+# df_flujo_caja = calcular_flujo_de_caja(años, precio_energia, produccion_anual, subsidios, costos_om, costos_combustible, costos_capital, costos_seguro, otros_costos, inversion_inicial, tasa_impuestos, tasa_descuento).to_dataframe()
 
 # # Mostrar el DataFrame resultante
 # print(df_flujo_caja)
@@ -1,9 +1,17 @@
-import numpy_financial as npf
-import pandas as pd
+import numpy as np
 
-def calcular_flujo_de_caja(años, precio_energia, produccion_anual, subsidios, costos_om, costos_combustible, costos_capital, costos_seguro, otros_costos, inversion_inicial, tasa_impuestos, tasa_descuento):
+from Flujo_de_caja_columnar import calcular_columnas
+
+# Parámetros de calcular_flujo_de_caja y calcular_flujo_de_caja_portafolio, en orden
+PARAMETROS_FLUJO = ('años', 'precio_energia', 'produccion_anual', 'subsidios', 'costos_om', 'costos_combustible', 'costos_capital',
+                    'costos_seguro', 'otros_costos', 'inversion_inicial', 'tasa_impuestos', 'tasa_descuento')
+
+def calcular_flujo_de_caja(años, precio_energia, produccion_anual, subsidios, costos_om, costos_combustible, costos_capital, costos_seguro, otros_costos, inversion_inicial, tasa_impuestos, tasa_descuento, columnas=None):
     """
-    Calcula el flujo de caja de una planta de energía y retorna un DataFrame con los resultados.
+    Calcula el flujo de caja de una planta de energía y retorna los resultados por columnas.
+
+    Las columnas se calculan en arreglos de NumPy; el DataFrame de pandas se construye solo al llamar a
+    `to_dataframe()` sobre el resultado.
 
     Args:
     años (int): Número de años de análisis.
@@ -18,58 +26,37 @@ def calcular_flujo_de_caja(años, precio_energia, produccion_anual, subsidios, c
     inversion_inicial (float): Inversión inicial en la planta.
     tasa_impuestos (float): Tasa de impuestos sobre la renta.
     tasa_descuento (float): Tasa de descuento para el cálculo del VAN.
+    columnas (list of str, opcional): Columnas a calcular (ver Flujo_de_caja_columnar.COLUMNAS). Por defecto, todas.
 
     Returns:
-    pd.DataFrame: DataFrame con los resultados del flujo de caja, incluyendo VAN y TIR.
+    ResultadoFlujoDeCaja: Resultado columnar del flujo de caja, incluyendo VAN y TIR.
     """
-    
-    # Definición de las columnas del DataFrame
-    columnas = ['Año', 'Ingresos', 'Subsidios', 'Costos de O&M', 'Costos de Combustible', 'Costos de Capital', 'Seguros', 'Otros Costos', 'Total Gastos', 'Ingresos Netos', 'Impuestos', 'Flujo de Caja Operativo', 'Inversiones de Capital', 'Flujo de Caja Libre', 'VAN', 'TIR']
-    data = []
+    return calcular_columnas(años, precio_energia, produccion_anual, subsidios, costos_om, costos_combustible, costos_capital, costos_seguro, otros_costos, inversion_inicial, tasa_impuestos, tasa_descuento, columnas, truncar=True)
 
-    # Lista para almacenar los flujos de caja libre de cada año
-    flujos_caja_libre = []
-    
-    for año in range(1, años + 1):
-        # Asegurarse de que los índices sean válidos para las listas
-        idx = año - 1
-        if idx >= len(precio_energia) or idx >= len(produccion_anual) or idx >= len(subsidios) or idx >= len(costos_om) or idx >= len(costos_combustible) or idx >= len(costos_capital) or idx >= len(costos_seguro) or idx >= len(otros_costos):
-            raise ValueError("Las listas de parámetros deben tener al menos tantos elementos como el número de años especificado.")
 
-        # Cálculo de ingresos por venta de energía
-        ingresos = produccion_anual[idx] * precio_energia[idx]
-        
-        # Cálculo del total de gastos
-        total_gastos = costos_om[idx] + costos_combustible[idx] + costos_capital[idx] + costos_seguro[idx] + otros_costos[idx]
-        
-        # Cálculo de ingresos netos (ingresos más subsidios menos total de gastos)
-        ingresos_netos = ingresos + subsidios[idx] - total_gastos
-        
-        # Cálculo de impuestos
-        impuestos = ingresos_netos * tasa_impuestos
-        
-        # Cálculo del flujo de caja operativo
-        flujo_caja_operativo = ingresos_netos - impuestos
-        
-        # Inversión de capital en el primer año
-        inversiones_capital = inversion_inicial if año == 1 else 0
-        
-        # Cálculo del flujo de caja libre
-        flujo_caja_libre = flujo_caja_operativo - inversiones_capital
-        
-        # Almacenar el flujo de caja libre en la lista
-        flujos_caja_libre.append(flujo_caja_libre)
-        
-        # Cálculo del VAN utilizando numpy_financial
-        VAN = npf.npv(tasa_descuento, flujos_caja_libre)
-        
-        # Cálculo de la TIR utilizando numpy_financial
-        TIR = npf.irr(flujos_caja_libre)
+def calcular_flujo_de_caja_portafolio(años, precio_energia, produccion_anual, subsidios, costos_om, costos_combustible, costos_capital, costos_seguro, otros_costos, inversion_inicial, tasa_impuestos, tasa_descuento, columnas=None):
+    """
+    Calcula el flujo de caja de un portafolio de plantas en forma vectorizada (plantas × años).
 
-        # Añadir los datos del año al DataFrame
-        data.append([año, ingresos, subsidios[idx], costos_om[idx], costos_combustible[idx], costos_capital[idx], costos_seguro[idx], otros_costos[idx], total_gastos, ingresos_netos, impuestos, flujo_caja_operativo, inversiones_capital, flujo_caja_libre, VAN, TIR])
-    
-    # Crear el DataFrame con los datos
-    df_flujo_caja = pd.DataFrame(data, columns=columnas)
+    Las formas de los parámetros se validan una sola vez y todas las columnas, incluidos el VAN acumulado y la TIR,
+    se calculan para todas las plantas a la vez.
 
-    return df_flujo_caja
+    Args:
+    años (int): Número de años de análisis.
+    precio_energia, produccion_anual, subsidios, costos_om, costos_combustible, costos_capital, costos_seguro, otros_costos
+        (float o np.ndarray): Escalares (iguales para todas las plantas y años), arreglos por año (años,), por planta
+        (plantas × 1) o por planta y año (plantas × años). Un arreglo de una dimensión siempre es por año y debe tener
+        exactamente `años` elementos; un valor por planta se entrega como columna (plantas × 1), nunca como (plantas,),
+        y una matriz debe tener 1 o `años` columnas.
+    inversion_inicial (float o np.ndarray): Inversión inicial, escalar o una por planta (plantas,).
+    tasa_impuestos (float o np.ndarray): Tasa de impuestos sobre la renta, escalar o una por planta (plantas,).
+    tasa_descuento (float o np.ndarray): Tasa de descuento para el VAN, escalar o una por planta (plantas,).
+    columnas (list of str, opcional): Columnas a calcular (ver Flujo_de_caja_columnar.COLUMNAS). Por defecto, todas.
+
+    Returns:
+    ResultadoFlujoDeCaja: Resultado con una matriz (plantas × años) por columna.
+    """
+    resultado = calcular_columnas(años, precio_energia, produccion_anual, subsidios, costos_om, costos_combustible, costos_capital, costos_seguro, otros_costos, inversion_inicial, tasa_impuestos, tasa_descuento, columnas)
+    # Un portafolio de una sola planta igual se entrega como matriz (1 × años)
+    resultado.columnas = {nombre: np.atleast_2d(valores) for nombre, valores in resultado.columnas.items()}
+    return resultado
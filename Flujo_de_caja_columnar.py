@@ -0,0 +1,181 @@
+import numpy as np
+
+from tasa_interna_retorno import calcular_tir, calcular_tir_filas
+
+# Columnas del flujo de caja, en el orden del DataFrame original
+COLUMNAS = ['Año', 'Ingresos', 'Subsidios', 'Costos de O&M', 'Costos de Combustible', 'Costos de Capital', 'Seguros', 'Otros Costos', 'Total Gastos', 'Ingresos Netos', 'Impuestos', 'Flujo de Caja Operativo', 'Inversiones de Capital', 'Flujo de Caja Libre', 'VAN', 'TIR']
+
+
+class ResultadoFlujoDeCaja:
+    def __init__(self, columnas):
+        """
+        Resultado columnar del flujo de caja: un arreglo de NumPy por columna calculada.
+
+        Args:
+        columnas (dict): Diccionario {nombre de columna: np.ndarray}, en el orden de COLUMNAS.
+        """
+        self.columnas = columnas
+
+    def __getitem__(self, nombre):
+        return self.columnas[nombre]
+
+    def __contains__(self, nombre):
+        return nombre in self.columnas
+
+    def __len__(self):
+        return next(iter(self.columnas.values())).shape[-1] if self.columnas else 0
+
+    def keys(self):
+        return self.columnas.keys()
+
+    def to_dataframe(self):
+        """
+        Construye el DataFrame de pandas con las columnas calculadas. pandas se importa solo aquí.
+
+        Para un portafolio (columnas de plantas × años) se agrega una columna 'Planta' y se apilan las plantas.
+
+        Returns:
+        pd.DataFrame: DataFrame con una fila por año (y por planta).
+        """
+        import pandas as pd
+        if not self.columnas or next(iter(self.columnas.values())).ndim == 1:
+            return pd.DataFrame(self.columnas)
+        forma = next(iter(self.columnas.values())).shape
+        datos = {'Planta': np.repeat(np.arange(forma[0]), forma[1])}
+        datos.update({nombre: np.broadcast_to(valores, forma).ravel() for nombre, valores in self.columnas.items()})
+        return pd.DataFrame(datos)
+
+
+def _por_año(valor, años, nombre, truncar=False):
+    """
+    Convierte un parámetro escalar, por año (años,), por planta (plantas × 1) o por planta y año (plantas × años)
+    en un arreglo cuyo último eje tiene largo `años` (o 1 si es constante).
+
+    Un arreglo de una dimensión siempre se interpreta como valores por año y debe tener exactamente `años`
+    elementos; un valor por planta se entrega como matriz (plantas × 1). Con `truncar=True` se aceptan además
+    listas más largas que `años` y se usan sus primeros `años` elementos, como en calcular_flujo_de_caja.
+    """
+    arreglo = np.asarray(valor, dtype=np.float64)
+    if arreglo.ndim == 0:
+        return arreglo.reshape(1)
+    if arreglo.ndim > 2:
+        raise ValueError(f"El parámetro '{nombre}' debe ser escalar, por año, por planta o por planta y año.")
+    largo = arreglo.shape[-1]
+    if arreglo.ndim == 2 and largo == 1:
+        return arreglo
+    if largo != años and not (truncar and largo > años):
+        if truncar:
+            raise ValueError(f"Las listas de parámetros deben tener al menos tantos elementos como el número de años especificado ('{nombre}').")
+        raise ValueError(f"El parámetro '{nombre}' tiene {largo} valores por año y el análisis es de {años} años; "
+                         "un valor por planta se entrega como matriz (plantas × 1).")
+    return arreglo[..., :años]
+
+
+def _por_planta(valor, nombre):
+    """
+    Convierte un parámetro escalar o por planta (plantas,) en un arreglo que se combina con las columnas (plantas × años).
+    """
+    arreglo = np.asarray(valor, dtype=np.float64)
+    if arreglo.ndim > 1:
+        raise ValueError(f"El parámetro '{nombre}' debe ser escalar o tener un valor por planta.")
+    return arreglo[:, None] if arreglo.ndim == 1 else arreglo
+
+
+def tir_acumulada(flujos_caja_libre):
+    """
+    Calcula la TIR de los flujos acumulados hasta cada año, partiendo de la TIR del año anterior.
+
+    Args:
+    flujos_caja_libre (np.ndarray): Flujos de caja libre de cada año (años,) o de cada planta y año (plantas × años).
+
+    Returns:
+    np.ndarray: TIR de los flujos de los años 1..t para cada t, con la misma forma que la entrada.
+    """
+    tir = np.empty(flujos_caja_libre.shape)
+    anterior = None
+    for i in range(flujos_caja_libre.shape[-1]):
+        if flujos_caja_libre.ndim == 1:
+            anterior = calcular_tir(flujos_caja_libre[:i + 1], anterior)
+        else:
+            anterior = calcular_tir_filas(flujos_caja_libre[:, :i + 1], anterior)
+        tir[..., i] = anterior
+    return tir
+
+
+def calcular_columnas(años, precio_energia, produccion_anual, subsidios, costos_om, costos_combustible, costos_capital, costos_seguro, otros_costos, inversion_inicial, tasa_impuestos, tasa_descuento, columnas=None, truncar=False):
+    """
+    Calcula las columnas del flujo de caja en arreglos de NumPy.
+
+    Solo se calculan las columnas pedidas y aquellas de las que dependen; por ejemplo, si no se pide 'TIR' no se
+    resuelve ninguna TIR.
+
+    Args:
+    años (int): Número de años de análisis.
+    precio_energia, produccion_anual, subsidios, costos_om, costos_combustible, costos_capital, costos_seguro, otros_costos
+        (float, list of float o np.ndarray): Valores anuales, constantes, uno por año (años,), por planta
+        (plantas × 1) o por planta y año (plantas × años). Un arreglo de una dimensión siempre es por año y debe tener
+        exactamente `años` elementos.
+    inversion_inicial (float o array_like): Inversión inicial en la planta (o una por planta).
+    tasa_impuestos (float o array_like): Tasa de impuestos sobre la renta (o una por planta).
+    tasa_descuento (float o array_like): Tasa de descuento para el cálculo del VAN (o una por planta).
+    columnas (list of str, opcional): Columnas a calcular. Por defecto, todas las de COLUMNAS.
+    truncar (bool): Si es True, los valores por año más largos que `años` se recortan en vez de rechazarse.
+
+    Returns:
+    ResultadoFlujoDeCaja: Resultado con las columnas pedidas.
+    """
+    if columnas is None:
+        columnas = COLUMNAS
+    desconocidas = [columna for columna in columnas if columna not in COLUMNAS]
+    if desconocidas:
+        raise ValueError(f"Columnas desconocidas: {desconocidas}")
+
+    # Las entradas se validan y convierten a arreglos una sola vez; la forma final es (años,) o (plantas × años)
+    entradas = {
+        'Subsidios': _por_año(subsidios, años, 'subsidios', truncar),
+        'Costos de O&M': _por_año(costos_om, años, 'costos_om', truncar),
+        'Costos de Combustible': _por_año(costos_combustible, años, 'costos_combustible', truncar),
+        'Costos de Capital': _por_año(costos_capital, años, 'costos_capital', truncar),
+        'Seguros': _por_año(costos_seguro, años, 'costos_seguro', truncar),
+        'Otros Costos': _por_año(otros_costos, años, 'otros_costos', truncar),
+    }
+    precio_energia = _por_año(precio_energia, años, 'precio_energia', truncar)
+    produccion_anual = _por_año(produccion_anual, años, 'produccion_anual', truncar)
+    inversion_inicial = _por_planta(inversion_inicial, 'inversion_inicial')
+    tasa_impuestos = _por_planta(tasa_impuestos, 'tasa_impuestos')
+    tasa_descuento = _por_planta(tasa_descuento, 'tasa_descuento')
+    try:
+        forma = np.broadcast_shapes((años,), precio_energia.shape, produccion_anual.shape, inversion_inicial.shape, tasa_impuestos.shape,
+                                    tasa_descuento.shape, *(arreglo.shape for arreglo in entradas.values()))
+    except ValueError:
+        raise ValueError("Los parámetros por planta deben tener el mismo número de plantas.") from None
+    entradas = {nombre: np.broadcast_to(arreglo, forma) for nombre, arreglo in entradas.items()}
+
+    def inversiones(c):
+        inversiones_capital = np.zeros(forma)
+        inversiones_capital[..., :1] = inversion_inicial
+        return inversiones_capital
+
+    calculadores = {
+        'Año': lambda c: np.broadcast_to(np.arange(1, años + 1), forma),
+        'Ingresos': lambda c: np.broadcast_to(produccion_anual * precio_energia, forma),
+        'Total Gastos': lambda c: c('Costos de O&M') + c('Costos de Combustible') + c('Costos de Capital') + c('Seguros') + c('Otros Costos'),
+        'Ingresos Netos': lambda c: c('Ingresos') + c('Subsidios') - c('Total Gastos'),
+        'Impuestos': lambda c: c('Ingresos Netos') * tasa_impuestos,
+        'Flujo de Caja Operativo': lambda c: c('Ingresos Netos') - c('Impuestos'),
+        'Inversiones de Capital': inversiones,
+        'Flujo de Caja Libre': lambda c: c('Flujo de Caja Operativo') - c('Inversiones de Capital'),
+        # VAN acumulado: una sola suma corriente de los flujos descontados (misma convención que npf.npv)
+        'VAN': lambda c: np.cumsum(c('Flujo de Caja Libre') / (1 + tasa_descuento) ** np.arange(años), axis=-1),
+        'TIR': lambda c: tir_acumulada(c('Flujo de Caja Libre')),
+    }
+    calculadas = dict(entradas)
+
+    def columna(nombre):
+        if nombre not in calculadas:
+            calculadas[nombre] = calculadores[nombre](columna)
+        return calculadas[nombre]
+
+    for nombre in columnas:
+        columna(nombre)
+    return ResultadoFlujoDeCaja({nombre: calculadas[nombre] for nombre in COLUMNAS if nombre in columnas})
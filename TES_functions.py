@@ -1,3 +1,7 @@
+import numbers
+
+from anualidad import factor_anualidad
+
 def capex_knobloch(iron_volume, insulation_volume, price_per_cubic_meter_iron, price_per_cubic_meter_insulation, components):
     """
     Calcula el CAPEX utilizando el método de Knobloch.
@@ -144,12 +148,17 @@ def LCOS(annual_discount_rate, tes_energy_capacity, cycles_per_year, service_yea
     """
     Calcula el Costo Nivelado de Almacenamiento de Energía (LCOS).
 
+    Como en TES.LCOS, cycles_per_year, tes_efficiency y electricity_cost_per_joule pueden tener valores por año (una
+    lista con uno por año de servicio o una función de los años, ver perfiles_anuales); entonces el OPEX y la energía
+    descargada de cada año se descuentan por separado. Los arreglos de NumPy, en cambio, se interpretan como un valor
+    por diseño.
+
     Parámetros:
     - annual_discount_rate (float): Tasa de descuento anual.
     - tes_energy_capacity (float): Capacidad de energía del TES en kWh.
-    - cycles_per_year (float): Ciclos por año.
+    - cycles_per_year (float, list o callable): Ciclos por año.
     - service_years (float): Años de servicio.
-    - tes_efficiency (float): Eficiencia del TES.
+    - tes_efficiency (float, list o callable): Eficiencia del TES.
     - iron_volume (float): Volumen de acero en metros cúbicos.
     - insulation_volume (float): Volumen de aislamiento en metros cúbicos.
     - price_per_cubic_meter_iron (float): Precio por metro cúbico de acero en dólares.
@@ -161,76 +170,96 @@ def LCOS(annual_discount_rate, tes_energy_capacity, cycles_per_year, service_yea
     - working_fluid_density (float): Densidad del fluido de trabajo en kg/m³.
     - charging_time (float): Tiempo de carga en horas.
     - discharging_time (float): Tiempo de descarga en horas.
-    - electricity_cost_per_joule (float): Costo de electricidad por joule en dólares.
+    - electricity_cost_per_joule (float, list o callable): Costo de electricidad por joule en dólares.
     - fan_efficiency (float): Eficiencia del ventilador.
     - capex_maintenance_percentage (float): Porcentaje de mantenimiento del CAPEX.
 
     Retorna:
     - float: El LCOS calculado.
     """
+    if any(callable(value) or isinstance(value, (list, tuple)) for value in (cycles_per_year, tes_efficiency, electricity_cost_per_joule)):
+        from perfiles_anuales import factores_descuento, suma_descontada, valores_anuales
+
+        if not isinstance(annual_discount_rate, numbers.Real) or not isinstance(service_years, numbers.Real):
+            raise ValueError("Con valores por año, annual_discount_rate y service_years deben ser escalares.")
+        years = int(service_years)
+        cycles_per_year, tes_efficiency, electricity_cost_per_joule = (valores_anuales(value, years) for value in
+                                                                       (cycles_per_year, tes_efficiency, electricity_cost_per_joule))
+        discount_factors = factores_descuento(annual_discount_rate, years)
+        capex = capex_knobloch(iron_volume, insulation_volume, price_per_cubic_meter_iron, price_per_cubic_meter_insulation, components)
+        opex_by_year = opex(initial_pressure, final_pressure, working_fluid_flow, working_fluid_density, charging_time, discharging_time, cycles_per_year,
+                            service_years, electricity_cost_per_joule, fan_efficiency, capex_maintenance_percentage, iron_volume, insulation_volume,
+                            price_per_cubic_meter_iron, price_per_cubic_meter_insulation, components)
+        opex_total = suma_descontada(opex_by_year, discount_factors)
+        total_cycles = tes_energy_capacity * suma_descontada(cycles_per_year * tes_efficiency, discount_factors)
+        return float((capex + opex_total) / total_cycles)
+
     capex = capex_knobloch(iron_volume, insulation_volume, price_per_cubic_meter_iron, price_per_cubic_meter_insulation, components)
-    opex_total = sum(opex(initial_pressure, final_pressure, working_fluid_flow, working_fluid_density, charging_time, discharging_time, cycles_per_year, 
-                          service_years, electricity_cost_per_joule, fan_efficiency, capex_maintenance_percentage, iron_volume, insulation_volume, 
-                          price_per_cubic_meter_iron, price_per_cubic_meter_insulation, components) / (1 + annual_discount_rate) ** n 
-                     for n in range(1, service_years + 1))
-    total_cycles = sum(cycles_per_year * tes_energy_capacity * tes_efficiency / (1 + annual_discount_rate) ** n for n in range(1, service_years + 1))
+    opex_value = opex(initial_pressure, final_pressure, working_fluid_flow, working_fluid_density, charging_time, discharging_time, cycles_per_year, 
+                      service_years, electricity_cost_per_joule, fan_efficiency, capex_maintenance_percentage, iron_volume, insulation_volume, 
+                      price_per_cubic_meter_iron, price_per_cubic_meter_insulation, components)
+    # Suma de factores de descuento compartida por el OPEX y la energía descargada
+    discount_factor_sum = factor_anualidad(annual_discount_rate, service_years)
+    opex_total = opex_value * discount_factor_sum
+    total_cycles = cycles_per_year * tes_energy_capacity * tes_efficiency * discount_factor_sum
     lcos = (capex + opex_total) / total_cycles
     return lcos
 
 # Ejemplo de uso
 
-# Datos de entrada
-iron_volume = 100.0  # m³
-insulation_volume = 50.0  # m³
-price_per_cubic_meter_iron = 200  # $/m³
-price_per_cubic_meter_insulation = 50  # $/m³
-components = [("Pump", 5000, 2), ("Valve", 1500, 4)]  # lista de componentes
-
-density_tes_material = 1600  # kg/m³
-volume_tes_material = 1200.0  # m³
-specific_heat_tes_material = 1  # kJ/(kg·K)
-temperature_difference = 300  # K
-tes_efficiency = 0.9
-k_mctigue = 0.02
-initial_pressure = 101325  # Pa (1 atm)
-final_pressure = 202650  # Pa (2 atm)
-temporal_adjustment_index = 1.05
-installation_percentage = 0.15
-cycles_per_year = 250
-service_years = 20
-electricity_cost_per_joule = 0.00005  # $/J
-fan_efficiency = 0.85
-charging_time = 5  # horas
-discharging_time = 5  # horas
-working_fluid_flow = 0.1  # m³/s
-working_fluid_density = 1000  # kg/m³
-capex_maintenance_percentage = 0.02
-annual_discount_rate = 0.05
-tes_energy_capacity = 2  # kWh
-
-# Calcular diferentes valores de CAPEX
-capex_knobloch_value = capex_knobloch(iron_volume, insulation_volume, price_per_cubic_meter_iron, price_per_cubic_meter_insulation, components)
-capex_kocher_value = capex_kocher(density_tes_material, volume_tes_material, specific_heat_tes_material, temperature_difference, tes_efficiency, 
-                                  iron_volume, insulation_volume, price_per_cubic_meter_iron, price_per_cubic_meter_insulation)
-capex_mctigue_value = capex_mctigue(k_mctigue, volume_tes_material, final_pressure, iron_volume, price_per_cubic_meter_iron)
-capex_trevisan_value = capex_trevisan(temporal_adjustment_index, iron_volume, insulation_volume, price_per_cubic_meter_iron, price_per_cubic_meter_insulation)
-capex_pereira_value = capex_pereira(temporal_adjustment_index, installation_percentage, iron_volume, insulation_volume, price_per_cubic_meter_iron, 
-                                    price_per_cubic_meter_insulation, components)
-
-print(f"CAPEX Knobloch: ${capex_knobloch_value:.2f}")
-print(f"CAPEX Kocher: ${capex_kocher_value:.2f}")
-print(f"CAPEX McTigue: ${capex_mctigue_value:.2f}")
-print(f"CAPEX Trevisan: ${capex_trevisan_value:.2f}")
-print(f"CAPEX Pereira: ${capex_pereira_value:.2f}")
-
-# Calcular OPEX
-opex_value = opex(initial_pressure, final_pressure, working_fluid_flow, working_fluid_density, charging_time, discharging_time, cycles_per_year, 
-                  service_years, electricity_cost_per_joule, fan_efficiency, capex_maintenance_percentage, iron_volume, insulation_volume, 
-                  price_per_cubic_meter_iron, price_per_cubic_meter_insulation, components)
-print(f"OPEX: ${opex_value:.2f}")
-
-# Calcular LCOS
-lcos_value = LCOS(annual_discount_rate, tes_energy_capacity, cycles_per_year, service_years, tes_efficiency, iron_volume, insulation_volume, 
-                  price_per_cubic_meter_iron, price_per_cubic_meter_insulation, components, initial_pressure, final_pressure, working_fluid_flow, 
-                  working_fluid_density, charging_time, discharging_time, electricity_cost_per_joule, fan_efficiency, capex_maintenance_percentage)
-print(f"LCOS: ${lcos_value:.2f} $/kWh")
+if __name__ == "__main__":
+    # Datos de entrada
+    iron_volume = 100.0  # m³
+    insulation_volume = 50.0  # m³
+    price_per_cubic_meter_iron = 200  # $/m³
+    price_per_cubic_meter_insulation = 50  # $/m³
+    components = [("Pump", 5000, 2), ("Valve", 1500, 4)]  # lista de componentes
+
+    density_tes_material = 1600  # kg/m³
+    volume_tes_material = 1200.0  # m³
+    specific_heat_tes_material = 1  # kJ/(kg·K)
+    temperature_difference = 300  # K
+    tes_efficiency = 0.9
+    k_mctigue = 0.02
+    initial_pressure = 101325  # Pa (1 atm)
+    final_pressure = 202650  # Pa (2 atm)
+    temporal_adjustment_index = 1.05
+    installation_percentage = 0.15
+    cycles_per_year = 250
+    service_years = 20
+    electricity_cost_per_joule = 0.00005  # $/J
+    fan_efficiency = 0.85
+    charging_time = 5  # horas
+    discharging_time = 5  # horas
+    working_fluid_flow = 0.1  # m³/s
+    working_fluid_density = 1000  # kg/m³
+    capex_maintenance_percentage = 0.02
+    annual_discount_rate = 0.05
+    tes_energy_capacity = 2  # kWh
+
+    # Calcular diferentes valores de CAPEX
+    capex_knobloch_value = capex_knobloch(iron_volume, insulation_volume, price_per_cubic_meter_iron, price_per_cubic_meter_insulation, components)
+    capex_kocher_value = capex_kocher(density_tes_material, volume_tes_material, specific_heat_tes_material, temperature_difference, tes_efficiency, 
+                                      iron_volume, insulation_volume, price_per_cubic_meter_iron, price_per_cubic_meter_insulation)
+    capex_mctigue_value = capex_mctigue(k_mctigue, volume_tes_material, final_pressure, iron_volume, price_per_cubic_meter_iron)
+    capex_trevisan_value = capex_trevisan(temporal_adjustment_index, iron_volume, insulation_volume, price_per_cubic_meter_iron, price_per_cubic_meter_insulation)
+    capex_pereira_value = capex_pereira(temporal_adjustment_index, installation_percentage, iron_volume, insulation_volume, price_per_cubic_meter_iron, 
+                                        price_per_cubic_meter_insulation, components)
+
+    print(f"CAPEX Knobloch: ${capex_knobloch_value:.2f}")
+    print(f"CAPEX Kocher: ${capex_kocher_value:.2f}")
+    print(f"CAPEX McTigue: ${capex_mctigue_value:.2f}")
+    print(f"CAPEX Trevisan: ${capex_trevisan_value:.2f}")
+    print(f"CAPEX Pereira: ${capex_pereira_value:.2f}")
+
+    # Calcular OPEX
+    opex_value = opex(initial_pressure, final_pressure, working_fluid_flow, working_fluid_density, charging_time, discharging_time, cycles_per_year, 
+                      service_years, electricity_cost_per_joule, fan_efficiency, capex_maintenance_percentage, iron_volume, insulation_volume, 
+                      price_per_cubic_meter_iron, price_per_cubic_meter_insulation, components)
+    print(f"OPEX: ${opex_value:.2f}")
+
+    # Calcular LCOS
+    lcos_value = LCOS(annual_discount_rate, tes_energy_capacity, cycles_per_year, service_years, tes_efficiency, iron_volume, insulation_volume, 
+                      price_per_cubic_meter_iron, price_per_cubic_meter_insulation, components, initial_pressure, final_pressure, working_fluid_flow, 
+                      working_fluid_density, charging_time, discharging_time, electricity_cost_per_joule, fan_efficiency, capex_maintenance_percentage)
+    print(f"LCOS: ${lcos_value:.2f} $/kWh")
@@ -1,6 +1,110 @@
+import functools
 import math
+import numbers
+
+from anualidad import factor_anualidad
+
+# Marca de parámetro no asignado en get_parameters
+_MISSING = object()
+
+
+def _results(tes):
+    """
+    Diccionario de resultados en caché del TES, que se crea al guardar el primero. __setattr__ e invalidate_cache
+    borran sus entradas cuando cambia un parámetro.
+    """
+    cache = tes._cache
+    if cache is None:
+        cache = {}
+        object.__setattr__(tes, '_cache', cache)
+    return cache
+
+
+def _memoized(method):
+    """
+    Guarda en caché el resultado de un método del TES hasta que cambie alguno de los parámetros de los que depende.
+    """
+    name = method.__name__
+
+    @functools.wraps(method)
+    def wrapper(self):
+        cache = _results(self)
+        if name not in cache:
+            cache[name] = method(self)
+        return cache[name]
+    return wrapper
+
+
+def _components_cost(components):
+    """
+    Costo total de los componentes: una lista de tuplas (nombre, precio, cantidad) o una ListaMateriales, que guarda su total.
+    """
+    if hasattr(components, 'costo_total'):
+        return components.costo_total()
+    return sum(price * quantity for name, price, quantity in components)
+
+
+def _varies_by_year(value):
+    """
+    Indica si un parámetro tiene valores por año (una lista o arreglo de valores, o una función de los años) en vez de un escalar.
+    """
+    return not isinstance(value, numbers.Real)
+
 
 class TES:
+    # Esquema de parámetros conocidos y su tipo. Se guardan en __slots__ y se validan al asignarlos; otros parámetros
+    # van al diccionario _extra, que solo se crea si hay alguno
+    _SCHEMA = {
+        'iron_volume': float,
+        'insulation_volume': float,
+        'price_per_cubic_meter_iron': float,
+        'price_per_cubic_meter_insulation': float,
+        'components': list,
+        'temporal_adjustment_index': float,
+        'installation_percentage': float,
+        'density_tes_material': float,
+        'volume_tes_material': float,
+        'specific_heat_tes_material': float,
+        'temperature_difference': float,
+        'tes_efficiency': float,
+        'k_mctigue': float,
+        'initial_pressure': float,
+        'final_pressure': float,
+        'delta_pressure_charge': float,
+        'delta_pressure_discharge': float,
+        'mass_flow_rate_charge': float,
+        'mass_flow_rate_discharge': float,
+        'working_fluid_density': float,
+        'charging_time': float,
+        'discharging_time': float,
+        'working_fluid_flow': float,
+        'flow_section_area': float,
+        'cycles_per_year': float,
+        'service_years': int,
+        'electricity_cost_per_joule': float,
+        'fan_efficiency': float,
+        'capex_maintenance_percentage': float,
+        'annual_discount_rate': float,
+        'tes_energy_capacity': float,
+    }
+    __slots__ = (*_SCHEMA, '_cache', '_extra')
+
+    # Parámetros (y otros métodos) de los que depende cada resultado guardado en caché
+    _DEPENDENCIES = {
+        'capex_knobloch': {'iron_volume', 'insulation_volume', 'price_per_cubic_meter_iron', 'price_per_cubic_meter_insulation', 'components'},
+        'capex_kocher': {'density_tes_material', 'volume_tes_material', 'specific_heat_tes_material', 'temperature_difference', 'tes_efficiency',
+                         'iron_volume', 'insulation_volume', 'price_per_cubic_meter_iron', 'price_per_cubic_meter_insulation'},
+        'capex_mctigue': {'k_mctigue', 'volume_tes_material', 'final_pressure', 'iron_volume', 'price_per_cubic_meter_iron'},
+        'capex_trevisan': {'temporal_adjustment_index', 'iron_volume', 'insulation_volume', 'price_per_cubic_meter_iron', 'price_per_cubic_meter_insulation'},
+        'capex_pereira': {'temporal_adjustment_index', 'installation_percentage', 'iron_volume', 'insulation_volume', 'price_per_cubic_meter_iron',
+                          'price_per_cubic_meter_insulation', 'components'},
+        'opex': {'delta_pressure_charge', 'delta_pressure_discharge', 'mass_flow_rate_charge', 'mass_flow_rate_discharge', 'working_fluid_density',
+                 'charging_time', 'discharging_time', 'cycles_per_year', 'service_years', 'electricity_cost_per_joule', 'fan_efficiency',
+                 'capex_maintenance_percentage', 'capex_knobloch'},
+        'opex_by_year': {'opex'},
+        'LCOS': {'annual_discount_rate', 'tes_energy_capacity', 'tes_efficiency', 'opex', 'capex_pereira'},
+    }
+
     def __init__(self, iron_volume, insulation_volume, price_per_cubic_meter_iron, price_per_cubic_meter_insulation, components):
         """
         Inicializa el objeto TES con los parámetros esenciales.
@@ -12,12 +116,92 @@ class TES:
         - price_per_cubic_meter_insulation (float): Precio por metro cúbico de aislamiento en dólares.
         - components (list of tuples): Lista de componentes, donde cada componente es una tupla con el nombre, el precio por unidad y la cantidad.
         """
+        object.__setattr__(self, '_cache', None)
+        object.__setattr__(self, '_extra', None)
         self.iron_volume = iron_volume
         self.insulation_volume = insulation_volume
         self.price_per_cubic_meter_iron = price_per_cubic_meter_iron
         self.price_per_cubic_meter_insulation = price_per_cubic_meter_insulation
         self.components = components
 
+    def __setattr__(self, name, value):
+        """
+        Asigna un parámetro e invalida solo los resultados en caché que dependen de él.
+
+        Los parámetros escalares del esquema deben ser números y se guardan tal cual; tes_efficiency, cycles_per_year y
+        electricity_cost_per_joule también aceptan valores por año (ver perfiles_anuales). Un valor que no corresponde
+        al esquema lanza TypeError. Los parámetros fuera del esquema se guardan tal cual en _extra.
+        """
+        if name in _SCALARS:
+            if type(value) is not float and type(value) is not int:
+                value = _scalar(name, value)
+            object.__setattr__(self, name, value)
+        elif name == 'components':
+            if not isinstance(value, (list, tuple)) and not hasattr(value, 'costo_total'):
+                raise TypeError(f"'components' debe ser una lista de (nombre, precio, cantidad) o una ListaMateriales, no {type(value).__name__}.")
+            object.__setattr__(self, name, value)
+        else:
+            _set_extra(self, name, value)
+        cache = self._cache
+        if cache:
+            for method in _INVALIDATES.get(name, ()):
+                cache.pop(method, None)
+
+    def __delattr__(self, name):
+        if name in self._SCHEMA:
+            object.__delattr__(self, name)
+        elif self._extra is not None and name in self._extra:
+            del self._extra[name]
+        else:
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+        self.invalidate_cache()
+
+    def __getattr__(self, name):
+        # Solo se llama si el atributo no está en los __slots__ asignados: se busca entre los parámetros adicionales
+        if name not in ('_cache', '_extra'):
+            extra = self._extra
+            if extra is not None and name in extra:
+                return extra[name]
+        raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+
+    def __getstate__(self):
+        """
+        Estado para pickle y copy: solo los parámetros, sin los resultados en caché.
+        """
+        return self.get_parameters()
+
+    def __setstate__(self, state):
+        object.__setattr__(self, '_cache', None)
+        object.__setattr__(self, '_extra', None)
+        for key, value in state.items():
+            if key in self._SCHEMA:
+                object.__setattr__(self, key, value)
+            else:
+                _set_extra(self, key, value)
+
+    def invalidate_cache(self):
+        """
+        Borra todos los resultados en caché. Necesario solo si se modifica un parámetro mutable en su lugar
+        (por ejemplo, agregando un elemento a `components` sin reasignar la lista).
+        """
+        object.__setattr__(self, '_cache', None)
+
+    def get_parameters(self):
+        """
+        Retorna los parámetros del sistema TES.
+
+        Retorna:
+        - dict: Diccionario con el nombre y valor de cada parámetro, incluidos los componentes.
+        """
+        parameters = {}
+        for key in self._SCHEMA:
+            value = getattr(self, key, _MISSING)
+            if value is not _MISSING:
+                parameters[key] = value
+        if self._extra:
+            parameters.update(self._extra)
+        return parameters
+
     def set_additional_parameters(self, **kwargs):
         """
         Establece los parámetros adicionales necesarios para los cálculos de costos.
@@ -44,6 +228,16 @@ class TES:
                 missing_params.append((param, unit))
         return missing_params
 
+    def _first_year(self, name):
+        """
+        Valor del primer año de un parámetro que puede variar por año (ver perfiles_anuales).
+        """
+        value = getattr(self, name)
+        if _varies_by_year(value):
+            from perfiles_anuales import valores_anuales
+            return float(valores_anuales(value, 1)[0])
+        return value
+
     def display_info(self):
         """
         Muestra la información básica del sistema TES.
@@ -56,6 +250,7 @@ class TES:
         for component in self.components:
             print(f"  - {component[0]}: ${component[1]} x {component[2]}")
 
+    @_memoized
     def capex_knobloch(self):
         """
         Calcula el CAPEX utilizando el método de Knobloch.
@@ -70,10 +265,11 @@ class TES:
         
         iron_cost = self.iron_volume * self.price_per_cubic_meter_iron
         insulation_cost = self.insulation_volume * self.price_per_cubic_meter_insulation
-        components_cost = sum(price * quantity for name, price, quantity in self.components)
+        components_cost = _components_cost(self.components)
         capex = iron_cost + insulation_cost + components_cost
         return capex
 
+    @_memoized
     def capex_kocher(self):
         """
         Calcula el CAPEX utilizando el método de Kocher.
@@ -95,9 +291,10 @@ class TES:
         etes = (self.density_tes_material * self.specific_heat_tes_material * self.temperature_difference) / 3600
         iron_cost = self.iron_volume * self.price_per_cubic_meter_iron
         insulation_cost = self.insulation_volume * self.price_per_cubic_meter_insulation
-        capex = (iron_cost + insulation_cost) / (etes * self.volume_tes_material * self.tes_efficiency)
+        capex = (iron_cost + insulation_cost) / (etes * self.volume_tes_material * self._first_year('tes_efficiency'))
         return capex
 
+    @_memoized
     def capex_mctigue(self):
         """
         Calcula el CAPEX utilizando el método de McTigue.
@@ -119,6 +316,7 @@ class TES:
         capex = iron_cost + mctigue_cost
         return capex
 
+    @_memoized
     def capex_trevisan(self):
         """
         Calcula el CAPEX utilizando el método de Trevisan, Kost, Calderon-Vasquez
@@ -138,6 +336,7 @@ class TES:
         capex = iron_cost + insulation_cost
         return capex
 
+    @_memoized
     def capex_pereira(self):
         """
         Calcula el CAPEX utilizando el método de Pereira, Trevisan, Kost, Calderon-Vasquez
@@ -155,10 +354,48 @@ class TES:
         
         iron_cost = self.iron_volume * self.price_per_cubic_meter_iron
         insulation_cost = self.insulation_volume * self.price_per_cubic_meter_insulation * self.temporal_adjustment_index
-        components_cost = sum(price * quantity for name, price, quantity in self.components)
+        components_cost = _components_cost(self.components)
         capex = (iron_cost + insulation_cost + components_cost) * (1 + self.installation_percentage)
         return capex
 
+    def capex_all(self):
+        """
+        Calcula el CAPEX con los cinco métodos (Knobloch, Kocher, McTigue, Trevisan y Pereira) en una sola pasada.
+
+        Los costos de acero, aislamiento y componentes se calculan una vez y cada estimación da el mismo valor que su
+        método individual. Los resultados quedan en la caché de esos métodos.
+
+        Retorna:
+        - dict: {nombre del método: CAPEX calculado o mensaje indicando los parámetros faltantes}.
+        """
+        cache = _results(self)
+        pending = [method for method in _CAPEX_METHODS if method not in cache]
+        if pending:
+            iron_cost = self.iron_volume * self.price_per_cubic_meter_iron
+            insulation_cost = self.insulation_volume * self.price_per_cubic_meter_insulation
+            components_cost = None
+            for method in pending:
+                if any(not hasattr(self, param) for param in _CAPEX_PARAMETERS[method]):
+                    # El método individual arma el mensaje de parámetros faltantes
+                    getattr(self, method)()
+                    continue
+                if method in ('capex_knobloch', 'capex_pereira') and components_cost is None:
+                    components_cost = _components_cost(self.components)
+                if method == 'capex_knobloch':
+                    capex = iron_cost + insulation_cost + components_cost
+                elif method == 'capex_kocher':
+                    etes = (self.density_tes_material * self.specific_heat_tes_material * self.temperature_difference) / 3600
+                    capex = (iron_cost + insulation_cost) / (etes * self.volume_tes_material * self._first_year('tes_efficiency'))
+                elif method == 'capex_mctigue':
+                    capex = iron_cost + self.k_mctigue * self.volume_tes_material * self.final_pressure
+                elif method == 'capex_trevisan':
+                    capex = iron_cost + insulation_cost * self.temporal_adjustment_index
+                else:
+                    capex = (iron_cost + insulation_cost * self.temporal_adjustment_index + components_cost) * (1 + self.installation_percentage)
+                cache[method] = capex
+        return {method: cache[method] for method in _CAPEX_METHODS}
+
+    @_memoized
     def opex(self):
         """
         Calcula el OPEX del sistema TES.
@@ -183,17 +420,55 @@ class TES:
         missing_params = self.check_parameters(required_params)
         if missing_params:
             return f"Faltan los siguientes datos: {missing_params}"
+
+        if _varies_by_year(self.cycles_per_year) or _varies_by_year(self.electricity_cost_per_joule):
+            # Con ciclos o costo de electricidad por año, el OPEX es el promedio de los años de servicio
+            return float(self._opex_profile().mean())
         
         charge_term = (self.mass_flow_rate_charge * self.delta_pressure_charge / self.working_fluid_density) * self.charging_time  # Cambiado aquí
         discharge_term = (self.mass_flow_rate_discharge * self.delta_pressure_discharge / self.working_fluid_density) * self.discharging_time  # Cambiado aquí
         opex = (self.cycles_per_year / self.service_years) * (self.electricity_cost_per_joule / self.fan_efficiency) * (charge_term + discharge_term) + (self.capex_maintenance_percentage * self.capex_knobloch()) / self.service_years
         return opex
 
+    @_memoized
+    def opex_by_year(self):
+        """
+        Calcula el OPEX de cada año de servicio. cycles_per_year y electricity_cost_per_joule pueden ser constantes,
+        listas de valores por año o funciones de los años (ver perfiles_anuales).
 
+        Retorna:
+        - np.ndarray o str: El OPEX de los años 1, ..., service_years (de solo lectura, porque queda en la caché) o un
+          mensaje indicando los parámetros faltantes.
+        """
+        opex = self.opex()
+        if isinstance(opex, str):
+            return opex
+        profile = self._opex_profile()
+        profile.setflags(write=False)
+        return profile
+
+    def _opex_profile(self):
+        """
+        OPEX de cada año de servicio, sin verificar los parámetros.
+        """
+        from perfiles_anuales import valores_anuales
+
+        charge_term = (self.mass_flow_rate_charge * self.delta_pressure_charge / self.working_fluid_density) * self.charging_time
+        discharge_term = (self.mass_flow_rate_discharge * self.delta_pressure_discharge / self.working_fluid_density) * self.discharging_time
+        years = int(self.service_years)
+        cycles = valores_anuales(self.cycles_per_year, years)
+        electricity_cost = valores_anuales(self.electricity_cost_per_joule, years)
+        return (cycles / self.service_years) * (electricity_cost / self.fan_efficiency) * (charge_term + discharge_term) + (self.capex_maintenance_percentage * self.capex_knobloch()) / self.service_years
+
+
+    @_memoized
     def LCOS(self):
         """
         Calcula el Costo Nivelado de Almacenamiento de Energía (LCOS).
 
+        Si tes_efficiency, cycles_per_year o electricity_cost_per_joule varían por año (ver perfiles_anuales), el OPEX
+        y la energía descargada de cada año se descuentan por separado.
+
         Retorna:
         - float o str: El LCOS calculado o un mensaje indicando los parámetros faltantes.
         """
@@ -216,11 +491,79 @@ class TES:
         if isinstance(capex, str):
             return capex
 
-        opex_total = sum(self.opex() / (1 + self.annual_discount_rate) ** n for n in range(1, self.service_years + 1))
-        total_cycles = sum(self.cycles_per_year * self.tes_energy_capacity * self.tes_efficiency / (1 + self.annual_discount_rate) ** n for n in range(1, self.service_years + 1))
+        if any(_varies_by_year(getattr(self, name)) for name in ('tes_efficiency', 'cycles_per_year', 'electricity_cost_per_joule')):
+            from perfiles_anuales import factores_descuento, suma_descontada, valores_anuales
+
+            years = int(self.service_years)
+            discount_factors = factores_descuento(self.annual_discount_rate, years)
+            opex_total = suma_descontada(self.opex_by_year(), discount_factors)
+            cycles = valores_anuales(self.cycles_per_year, years) * valores_anuales(self.tes_efficiency, years)
+            total_cycles = self.tes_energy_capacity * suma_descontada(cycles, discount_factors)
+            return float((capex + opex_total) / total_cycles)
+
+        # Suma de factores de descuento compartida por el OPEX y la energía descargada
+        discount_factor_sum = factor_anualidad(self.annual_discount_rate, self.service_years)
+        opex_total = opex * discount_factor_sum
+        total_cycles = self.cycles_per_year * self.tes_energy_capacity * self.tes_efficiency * discount_factor_sum
         lcos = (capex + opex_total) / total_cycles
         return lcos
 
+
+def _dependent_methods(dependencies):
+    """
+    Construye, para cada parámetro, el conjunto de métodos cuyo resultado depende de él (directa o indirectamente).
+    """
+    def parameters(method):
+        result = set()
+        for dependency in dependencies[method]:
+            result |= parameters(dependency) if dependency in dependencies else {dependency}
+        return result
+
+    invalidates = {}
+    for method in dependencies:
+        for param in parameters(method):
+            invalidates.setdefault(param, set()).add(method)
+    return invalidates
+
+
+_INVALIDATES = _dependent_methods(TES._DEPENDENCIES)
+
+
+def _set_extra(tes, name, value):
+    """
+    Guarda un parámetro fuera del esquema en el diccionario _extra del TES.
+    """
+    if tes._extra is None:
+        object.__setattr__(tes, '_extra', {})
+    tes._extra[name] = value
+
+
+_SCALARS = frozenset(name for name, kind in TES._SCHEMA.items() if kind in (float, int))
+# Parámetros del esquema que pueden tener valores por año (los mismos que perfiles_anuales.PARAMETROS_ANUALES, que
+# no se importa aquí para no cargar NumPy con TES)
+_PER_YEAR = frozenset({'tes_efficiency', 'cycles_per_year', 'electricity_cost_per_joule'})
+
+
+def _scalar(name, value):
+    """
+    Valida el valor de un parámetro escalar del esquema y lo retorna sin convertirlo, o lanza TypeError si no corresponde.
+    """
+    if getattr(value, 'ndim', None) == 0 and getattr(value, 'dtype', None) is not None and value.dtype.kind in 'iuf':
+        # Arreglo de NumPy de dimensión 0, como los que retornan las funciones de geometria con entradas de NumPy
+        value = value.item()
+    if isinstance(value, numbers.Real) and not isinstance(value, bool):
+        return value
+    if name in _PER_YEAR and (callable(value) or isinstance(value, (list, tuple)) or hasattr(value, '__array__')):
+        return value
+    raise TypeError(f"El parámetro '{name}' debe ser un número{' o valores por año' if name in _PER_YEAR else ''}, no {type(value).__name__}.")
+
+
+_CAPEX_METHODS = ('capex_knobloch', 'capex_kocher', 'capex_mctigue', 'capex_trevisan', 'capex_pereira')
+# Parámetros adicionales (fuera de los esenciales) que necesita cada método de CAPEX
+_CAPEX_PARAMETERS = {method: sorted(TES._DEPENDENCIES[method] - {'iron_volume', 'insulation_volume', 'price_per_cubic_meter_iron',
+                                                                 'price_per_cubic_meter_insulation', 'components'})
+                     for method in _CAPEX_METHODS}
+
 # # Example usage
 # # Create an instance of the TES object with example data
 # tes_system = TES(
@@ -0,0 +1,55 @@
+import numbers
+from functools import lru_cache
+
+
+def factor_anualidad(annual_discount_rate, service_years):
+    """
+    Calcula la suma de factores de descuento sum(1 / (1 + r)^n) para n = 1, ..., N en forma cerrada.
+
+    Se usa (1 - (1 + r)^-N) / r escrito con expm1/log1p para no perder precisión con tasas pequeñas.
+    Con escalares el resultado se guarda en caché por (tasa, años); con arreglos se usa factores_anualidad.
+    Ambos casos usan las funciones de NumPy, de modo que un escalar da exactamente el mismo valor que el
+    elemento correspondiente de un arreglo (math.expm1 y math.log1p pueden diferir en el último bit).
+
+    Parámetros:
+    - annual_discount_rate (float o array_like): Tasa de descuento anual.
+    - service_years (int o array_like): Años de servicio.
+
+    Retorna:
+    - float o np.ndarray: La suma de los factores de descuento.
+    """
+    if isinstance(annual_discount_rate, numbers.Real) and isinstance(service_years, numbers.Real):
+        return _factor_anualidad_escalar(annual_discount_rate, service_years)
+    return factores_anualidad(annual_discount_rate, service_years)
+
+
+@lru_cache(maxsize=1024)
+def _factor_anualidad_escalar(annual_discount_rate, service_years):
+    """
+    factor_anualidad para una tasa y unos años escalares.
+    """
+    import numpy as np
+
+    if annual_discount_rate == 0:
+        return float(service_years)
+    return float(-np.expm1(-float(service_years) * np.log1p(annual_discount_rate)) / annual_discount_rate)
+
+
+def factores_anualidad(annual_discount_rate, service_years):
+    """
+    Versión vectorizada de factor_anualidad para arreglos de tasas y años de servicio.
+
+    Parámetros:
+    - annual_discount_rate (array_like): Tasas de descuento anuales.
+    - service_years (array_like): Años de servicio.
+
+    Retorna:
+    - np.ndarray: La suma de los factores de descuento de cada elemento.
+    """
+    # NumPy se importa aquí para que TES_object no lo cargue al importarse
+    import numpy as np
+
+    annual_discount_rate = np.asarray(annual_discount_rate, dtype=np.float64)
+    service_years = np.asarray(service_years, dtype=np.float64)
+    numerador = -np.expm1(-service_years * np.log1p(annual_discount_rate))
+    return np.divide(numerador, annual_discount_rate, out=np.array(np.broadcast_to(service_years, numerador.shape)), where=annual_discount_rate != 0)
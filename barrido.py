@@ -0,0 +1,136 @@
+import json
+import os
+
+import numpy as np
+
+from cache_resultados import huella
+from TES_batch import TESBatch
+
+
+class CuboResultados:
+    def __init__(self, ruta, modo='r'):
+        """
+        Abre un cubo de resultados guardado en disco por barrido_parametrico.
+
+        El directorio contiene un `manifiesto.json` con los ejes, las métricas y el avance, y un archivo
+        `<métrica>.npy` por métrica que se abre como memoria mapeada.
+
+        Parámetros:
+        - ruta (str): Directorio del cubo.
+        - modo (str): Modo de apertura de los arreglos ('r' solo lectura, 'r+' lectura y escritura).
+        """
+        self.ruta = ruta
+        with open(os.path.join(ruta, 'manifiesto.json'), encoding='utf-8') as archivo:
+            self.manifiesto = json.load(archivo)
+        self.ejes = {nombre: np.asarray(valores) for nombre, valores in self.manifiesto['ejes'].items()}
+        self.metricas = list(self.manifiesto['metricas'])
+        self.forma = tuple(len(valores) for valores in self.ejes.values())
+        self.datos = {metrica: np.load(os.path.join(ruta, f"{metrica}.npy"), mmap_mode=modo) for metrica in self.metricas}
+
+    @property
+    def completo(self):
+        """
+        Indica si todos los bloques del barrido ya fueron calculados.
+        """
+        return self.manifiesto['bloques_completados'] == self.manifiesto['numero_bloques']
+
+    def sel(self, metrica, **coordenadas):
+        """
+        Selecciona valores de una métrica por coordenadas (valores de los ejes, no índices).
+
+        Parámetros:
+        - metrica (str): Métrica a seleccionar.
+        - coordenadas: Valor de cada eje a fijar. Los ejes no indicados se conservan completos.
+
+        Retorna:
+        - np.ndarray: El sub-arreglo seleccionado.
+        """
+        indices = []
+        for nombre, valores in self.ejes.items():
+            if nombre in coordenadas:
+                posicion = np.flatnonzero(np.isclose(valores, coordenadas[nombre]))
+                if posicion.size == 0:
+                    raise KeyError(f"El valor {coordenadas[nombre]} no está en el eje '{nombre}'.")
+                indices.append(int(posicion[0]))
+            else:
+                indices.append(slice(None))
+        return self.datos[metrica][tuple(indices)]
+
+
+def _guardar_manifiesto(ruta, manifiesto):
+    """
+    Escribe el manifiesto de forma atómica para que una interrupción no lo deje a medias.
+    """
+    temporal = os.path.join(ruta, 'manifiesto.json.tmp')
+    with open(temporal, 'w', encoding='utf-8') as archivo:
+        json.dump(manifiesto, archivo)
+    os.replace(temporal, os.path.join(ruta, 'manifiesto.json'))
+
+
+def barrido_parametrico(tes, ejes, ruta, metricas=('capex_pereira', 'opex', 'LCOS'), tamano_bloque=1_000_000):
+    """
+    Evalúa un diseño TES sobre la grilla producto de varios parámetros y guarda un cubo N-dimensional en disco.
+
+    La grilla se recorre por bloques de celdas contiguas, cada uno evaluado como un TESBatch, y los resultados
+    se escriben en arreglos .npy mapeados en memoria. Después de cada bloque se actualiza el manifiesto, de modo
+    que si el barrido se interrumpe, llamar de nuevo con los mismos argumentos continúa desde el último bloque completo.
+    El manifiesto guarda la huella del diseño base (cache_resultados.huella), así que un barrido con otro diseño u
+    otra versión del código de cálculo no se continúa sobre el mismo directorio.
+
+    Parámetros:
+    - tes (TES): Diseño base con todos los parámetros necesarios.
+    - ejes (dict): Valores de cada parámetro a barrer, por ejemplo {'iron_volume': [...], 'annual_discount_rate': [...]}.
+      El orden del diccionario define el orden de las dimensiones del cubo.
+    - ruta (str): Directorio donde se guarda el cubo.
+    - metricas (tuple): Métodos de TESBatch a evaluar.
+    - tamano_bloque (int): Número de celdas por bloque.
+
+    Retorna:
+    - CuboResultados: El cubo de resultados abierto en modo lectura.
+    """
+    ejes_lista = {nombre: np.asarray(valores, dtype=np.float64).tolist() for nombre, valores in ejes.items()}
+    forma = tuple(len(valores) for valores in ejes_lista.values())
+    total = int(np.prod(forma))
+    manifiesto = {
+        'diseno': huella(tes),
+        'ejes': ejes_lista,
+        'metricas': list(metricas),
+        'tamano_bloque': tamano_bloque,
+        'numero_bloques': -(-total // tamano_bloque),
+        'bloques_completados': 0,
+    }
+
+    ruta_manifiesto = os.path.join(ruta, 'manifiesto.json')
+    if os.path.exists(ruta_manifiesto):
+        with open(ruta_manifiesto, encoding='utf-8') as archivo:
+            anterior = json.load(archivo)
+        if any(anterior.get(clave) != manifiesto[clave] for clave in ('diseno', 'ejes', 'metricas', 'tamano_bloque')):
+            raise ValueError(f"El directorio {ruta} contiene un barrido distinto; use otra ruta o bórrelo.")
+        manifiesto = anterior
+        datos = {metrica: np.load(os.path.join(ruta, f"{metrica}.npy"), mmap_mode='r+') for metrica in metricas}
+    else:
+        os.makedirs(ruta, exist_ok=True)
+        datos = {metrica: np.lib.format.open_memmap(os.path.join(ruta, f"{metrica}.npy"), mode='w+', dtype=np.float64, shape=forma)
+                 for metrica in metricas}
+        _guardar_manifiesto(ruta, manifiesto)
+
+    valores_ejes = [np.asarray(valores) for valores in ejes_lista.values()]
+    for bloque in range(manifiesto['bloques_completados'], manifiesto['numero_bloques']):
+        inicio = bloque * tamano_bloque
+        fin = min(inicio + tamano_bloque, total)
+        indices = np.unravel_index(np.arange(inicio, fin), forma)
+        columnas = {nombre: valores[indice] for nombre, valores, indice in zip(ejes_lista, valores_ejes, indices)}
+        lote = TESBatch.from_template(tes, fin - inicio, **columnas)
+
+        for metrica in metricas:
+            valores = getattr(lote, metrica)()
+            if isinstance(valores, str):
+                raise ValueError(valores)
+            datos[metrica].reshape(-1)[inicio:fin] = valores
+            datos[metrica].flush()
+
+        manifiesto['bloques_completados'] = bloque + 1
+        _guardar_manifiesto(ruta, manifiesto)
+
+    del datos
+    return CuboResultados(ruta)
@@ -0,0 +1,302 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import timeit
+
+# Módulos de biblioteca y dependencias pesadas que no deberían cargarse al importarlos
+MODULOS_BIBLIOTECA = ('TES_object', 'TES_functions', 'TES_batch', 'anualidad', 'tasa_interna_retorno', 'Flujo_de_caja', 'Flujo_de_caja2',
+                      'montecarlo', 'sensibilidad', 'barrido', 'geometria', 'optimizacion_geometria', 'despacho',
+                      'series_horarias', 'instrumentacion', 'catalogo',
+                      'cache_resultados', 'lista_materiales', 'ejecutar_escenarios',
+                      'punto_equilibrio', 'perfiles_anuales')
+DEPENDENCIAS_PEREZOSAS = ('pandas', 'numpy_financial')
+
+# Tamaños barridos por la suite completa y por la suite rápida (--rapido)
+HORIZONTES = (5, 30, 100, 1000)
+TAMANOS_LOTE = (1, 100, 10_000, 1_000_000)
+TAMANOS_COMPONENTES = (1, 10, 100, 1000)
+METODOS_TES = ('capex_knobloch', 'capex_kocher', 'capex_mctigue', 'capex_trevisan', 'capex_pereira', 'capex_all', 'opex', 'LCOS')
+LINEA_BASE = 'benchmarks_base.json'
+
+_CODIGO_IMPORTACION = """
+import json, sys, time
+inicio = time.perf_counter()
+import {modulo}
+duracion = time.perf_counter() - inicio
+print(json.dumps({{'segundos': duracion, 'cargados': [m for m in {perezosas!r} if m in sys.modules]}}))
+"""
+
+
+def medir_importacion(modulo, repeticiones=5):
+    """
+    Mide el tiempo de importación de un módulo en un intérprete nuevo.
+
+    Parámetros:
+    - modulo (str): Nombre del módulo a importar.
+    - repeticiones (int): Número de intérpretes a lanzar; se informa el mínimo.
+
+    Retorna:
+    - dict: {'segundos': tiempo mínimo de importación, 'cargados': dependencias perezosas que se cargaron al importar}.
+    """
+    resultados = []
+    for _ in range(repeticiones):
+        salida = subprocess.run([sys.executable, '-c', _CODIGO_IMPORTACION.format(modulo=modulo, perezosas=DEPENDENCIAS_PEREZOSAS)],
+                                capture_output=True, text=True, check=True, cwd=os.path.dirname(os.path.abspath(__file__)))
+        resultados.append(json.loads(salida.stdout.strip().splitlines()[-1]))
+    return {'segundos': min(resultado['segundos'] for resultado in resultados), 'cargados': resultados[0]['cargados']}
+
+
+def benchmark_importacion(modulos=MODULOS_BIBLIOTECA, repeticiones=5):
+    """
+    Mide el tiempo de importación de cada módulo de la biblioteca e imprime una tabla.
+
+    Retorna:
+    - dict: Resultado de medir_importacion por módulo.
+    """
+    resultados = {modulo: medir_importacion(modulo, repeticiones) for modulo in modulos}
+    for modulo, resultado in resultados.items():
+        cargados = ', '.join(resultado['cargados']) or '-'
+        print(f"{modulo:<22} {resultado['segundos'] * 1000:8.2f} ms   dependencias perezosas cargadas: {cargados}")
+    return resultados
+
+
+def cronometrar(funcion, repeticiones=5, tiempo_minimo=0.05):
+    """
+    Mide el tiempo por llamada de una función sin argumentos.
+
+    El número de llamadas por medición se duplica hasta que una medición dura al menos `tiempo_minimo` segundos,
+    y se informa el mínimo de `repeticiones` mediciones, que es el menos afectado por el ruido del sistema.
+
+    Parámetros:
+    - funcion (callable): Función a medir.
+    - repeticiones (int): Número de mediciones.
+    - tiempo_minimo (float): Duración mínima de cada medición en segundos.
+
+    Retorna:
+    - float: Segundos por llamada.
+    """
+    temporizador = timeit.Timer(funcion)
+    numero = 1
+    duracion = temporizador.timeit(numero)
+    while duracion < tiempo_minimo:
+        numero *= 2
+        duracion = temporizador.timeit(numero)
+    return min([duracion, *temporizador.repeat(repeticiones - 1, numero)]) / numero
+
+
+def _componentes(n):
+    """
+    Lista de `n` componentes de ejemplo.
+    """
+    return [(f"componente {i}", 100.0 + i, 1 + i % 4) for i in range(n)]
+
+
+def _parametros_ejemplo():
+    """
+    Parámetros de un diseño de ejemplo (estudio de Touzo) con todos los datos de los métodos de costo.
+    """
+    return dict(
+        iron_volume=1.0, insulation_volume=6.45, price_per_cubic_meter_iron=1737.47, price_per_cubic_meter_insulation=2432.64,
+        temporal_adjustment_index=1.0, installation_percentage=0.15, density_tes_material=3005.0, volume_tes_material=8.9,
+        specific_heat_tes_material=0.7527, temperature_difference=300.0, tes_efficiency=0.89, k_mctigue=0.02, final_pressure=2e5,
+        delta_pressure_charge=11000.0, delta_pressure_discharge=1000.0, mass_flow_rate_charge=0.58, mass_flow_rate_discharge=0.65,
+        working_fluid_density=1.274, charging_time=9.0, discharging_time=4.0, cycles_per_year=365.0, service_years=30,
+        electricity_cost_per_joule=0.396, fan_efficiency=0.95, capex_maintenance_percentage=0.02, annual_discount_rate=0.07,
+        tes_energy_capacity=1900.0,
+    )
+
+
+def _tes_ejemplo(n_componentes):
+    """
+    Objeto TES de ejemplo con `n_componentes` componentes.
+    """
+    from TES_object import TES
+
+    parametros = _parametros_ejemplo()
+    tes = TES(parametros.pop('iron_volume'), parametros.pop('insulation_volume'), parametros.pop('price_per_cubic_meter_iron'),
+              parametros.pop('price_per_cubic_meter_insulation'), _componentes(n_componentes))
+    tes.set_additional_parameters(**parametros)
+    return tes
+
+
+def benchmark_tes(componentes=TAMANOS_COMPONENTES, repeticiones=5):
+    """
+    Mide cada método de costo de TES sin caché (se invalida antes de cada llamada) para varios tamaños de la
+    lista de componentes, y una llamada a LCOS ya guardada en caché.
+
+    Retorna:
+    - dict: {nombre del benchmark: segundos por llamada}.
+    """
+    resultados = {}
+    for n in componentes:
+        tes = _tes_ejemplo(n)
+        for metodo in METODOS_TES:
+            funcion = getattr(tes, metodo)
+            resultados[f"TES.{metodo}[componentes={n}]"] = cronometrar(lambda: (tes.invalidate_cache(), funcion()), repeticiones)
+    tes = _tes_ejemplo(componentes[0])
+    tes.LCOS()
+    resultados["TES.LCOS[caché]"] = cronometrar(tes.LCOS, repeticiones)
+
+    from lista_materiales import ListaMateriales
+
+    for n in componentes:
+        lista = ListaMateriales.desde_componentes(_componentes(n))
+        resultados[f"ListaMateriales.subtotales[componentes={n}]"] = cronometrar(lista.subtotales, repeticiones)
+    return resultados
+
+
+def benchmark_funciones(componentes=TAMANOS_COMPONENTES, repeticiones=5):
+    """
+    Mide las funciones libres de TES_functions para varios tamaños de la lista de componentes.
+
+    Retorna:
+    - dict: {nombre del benchmark: segundos por llamada}.
+    """
+    import TES_functions as tf
+
+    p = _parametros_ejemplo()
+    volumenes = (p['iron_volume'], p['insulation_volume'], p['price_per_cubic_meter_iron'], p['price_per_cubic_meter_insulation'])
+    operacion = (1e5, p['final_pressure'], 0.5, p['working_fluid_density'], p['charging_time'], p['discharging_time'])
+    resultados = {}
+    for n in componentes:
+        lista = _componentes(n)
+        llamadas = {
+            'capex_knobloch': lambda: tf.capex_knobloch(*volumenes, lista),
+            'capex_kocher': lambda: tf.capex_kocher(p['density_tes_material'], p['volume_tes_material'], p['specific_heat_tes_material'],
+                                                    p['temperature_difference'], p['tes_efficiency'], *volumenes),
+            'capex_mctigue': lambda: tf.capex_mctigue(p['k_mctigue'], p['volume_tes_material'], p['final_pressure'], p['iron_volume'],
+                                                      p['price_per_cubic_meter_iron']),
+            'capex_trevisan': lambda: tf.capex_trevisan(p['temporal_adjustment_index'], *volumenes),
+            'capex_pereira': lambda: tf.capex_pereira(p['temporal_adjustment_index'], p['installation_percentage'], *volumenes, lista),
+            'opex': lambda: tf.opex(*operacion, p['cycles_per_year'], p['service_years'], p['electricity_cost_per_joule'], p['fan_efficiency'],
+                                    p['capex_maintenance_percentage'], *volumenes, lista),
+            'LCOS': lambda: tf.LCOS(p['annual_discount_rate'], p['tes_energy_capacity'], p['cycles_per_year'], p['service_years'],
+                                    p['tes_efficiency'], *volumenes, lista, *operacion, p['electricity_cost_per_joule'], p['fan_efficiency'],
+                                    p['capex_maintenance_percentage']),
+        }
+        for nombre, funcion in llamadas.items():
+            resultados[f"TES_functions.{nombre}[componentes={n}]"] = cronometrar(funcion, repeticiones)
+    return resultados
+
+
+def benchmark_flujo_de_caja(horizontes=HORIZONTES, repeticiones=5):
+    """
+    Mide ambos calcular_flujo_de_caja (con VAN y TIR acumulados) y la construcción del DataFrame para varios horizontes.
+
+    Retorna:
+    - dict: {nombre del benchmark: segundos por llamada}.
+    """
+    import Flujo_de_caja
+    import Flujo_de_caja2
+
+    resultados = {}
+    for años in horizontes:
+        argumentos = (años, [0.11] * años, [1e8] * años, [0] * años, [1.09e6] * años, [0] * años, [0] * años, [0] * años, [3.09e6] * años,
+                      54.73e6, 0, 0.07)
+        escalares = (años, 0.1, 1e6, 5e4, 1e4, 2e4, 0, 0, 5e3, 5e5, 0.2, 0.1)
+        resultados[f"Flujo_de_caja.calcular_flujo_de_caja[años={años}]"] = cronometrar(lambda: Flujo_de_caja.calcular_flujo_de_caja(*escalares), repeticiones)
+        resultados[f"Flujo_de_caja2.calcular_flujo_de_caja[años={años}]"] = cronometrar(lambda: Flujo_de_caja2.calcular_flujo_de_caja(*argumentos), repeticiones)
+        resultado = Flujo_de_caja2.calcular_flujo_de_caja(*argumentos)
+        resultados[f"ResultadoFlujoDeCaja.to_dataframe[años={años}]"] = cronometrar(resultado.to_dataframe, repeticiones)
+    return resultados
+
+
+def benchmark_lote(tamanos=TAMANOS_LOTE, repeticiones=5):
+    """
+    Mide TESBatch.capex_pereira, TESBatch.capex_all y TESBatch.LCOS para varios tamaños de lote.
+
+    Retorna:
+    - dict: {nombre del benchmark: segundos por llamada}.
+    """
+    import numpy as np
+    from TES_batch import TESBatch
+
+    resultados = {}
+    tes = _tes_ejemplo(3)
+    for tamano in tamanos:
+        lote = TESBatch.from_template(tes, tamano, iron_volume=np.linspace(0.5, 2.0, tamano))
+        resultados[f"TESBatch.capex_pereira[diseños={tamano}]"] = cronometrar(lote.capex_pereira, repeticiones)
+        resultados[f"TESBatch.capex_all[diseños={tamano}]"] = cronometrar(lote.capex_all, repeticiones)
+        resultados[f"TESBatch.LCOS[diseños={tamano}]"] = cronometrar(lote.LCOS, repeticiones)
+    return resultados
+
+
+def ejecutar_benchmarks(rapido=False):
+    """
+    Ejecuta la suite completa e imprime cada resultado con su latencia y rendimiento.
+
+    Parámetros:
+    - rapido (bool): Si es True, usa horizontes, lotes y listas de componentes pequeños y menos repeticiones.
+
+    Retorna:
+    - dict: {nombre del benchmark: segundos por llamada}, incluidos los tiempos de importación ('importación.<módulo>').
+    """
+    repeticiones = 3 if rapido else 5
+    componentes = TAMANOS_COMPONENTES[:3] if rapido else TAMANOS_COMPONENTES
+    horizontes = HORIZONTES[:3] if rapido else HORIZONTES
+    tamanos = TAMANOS_LOTE[:3] if rapido else TAMANOS_LOTE
+
+    resultados = {}
+    resultados.update(benchmark_tes(componentes, repeticiones))
+    resultados.update(benchmark_funciones(componentes, repeticiones))
+    resultados.update(benchmark_flujo_de_caja(horizontes, repeticiones))
+    resultados.update(benchmark_lote(tamanos, repeticiones))
+    for modulo in MODULOS_BIBLIOTECA:
+        resultados[f"importación.{modulo}"] = medir_importacion(modulo, repeticiones)['segundos']
+
+    for nombre, segundos in resultados.items():
+        print(f"{nombre:<60} {segundos * 1e6:14.2f} µs   {1 / segundos:14.1f} llamadas/s")
+    return resultados
+
+
+def guardar_linea_base(resultados, ruta=LINEA_BASE):
+    """
+    Guarda los resultados de ejecutar_benchmarks como línea base en un archivo JSON.
+
+    Parámetros:
+    - resultados (dict): {nombre del benchmark: segundos por llamada}.
+    - ruta (str): Archivo de la línea base.
+    """
+    with open(ruta, 'w', encoding='utf-8') as archivo:
+        json.dump({'python': sys.version, 'resultados': resultados}, archivo, indent=2, ensure_ascii=False)
+
+
+def comparar_con_linea_base(resultados, ruta=LINEA_BASE, umbral=0.25):
+    """
+    Compara los resultados con una línea base guardada e imprime las regresiones.
+
+    Parámetros:
+    - resultados (dict): {nombre del benchmark: segundos por llamada}.
+    - ruta (str): Archivo de la línea base.
+    - umbral (float): Aumento relativo de tiempo tolerado, por ejemplo 0.25 para 25%.
+
+    Retorna:
+    - list: Tuplas (nombre, segundos base, segundos actuales, razón) de los benchmarks más lentos que la base más el umbral.
+    """
+    with open(ruta, encoding='utf-8') as archivo:
+        base = json.load(archivo)['resultados']
+    regresiones = []
+    for nombre, segundos in resultados.items():
+        if nombre in base and segundos > base[nombre] * (1 + umbral):
+            regresiones.append((nombre, base[nombre], segundos, segundos / base[nombre]))
+    for nombre, anterior, actual, razon in regresiones:
+        print(f"REGRESIÓN {nombre}: {anterior * 1e6:.2f} µs -> {actual * 1e6:.2f} µs ({razon:.2f}x)")
+    return regresiones
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmarks de los métodos de costo y del flujo de caja.")
+    parser.add_argument('--rapido', action='store_true', help="Usa tamaños pequeños y menos repeticiones.")
+    parser.add_argument('--guardar', action='store_true', help="Guarda los resultados como línea base.")
+    parser.add_argument('--comparar', action='store_true', help="Compara con la línea base y termina con código 1 si hay regresiones.")
+    parser.add_argument('--linea-base', default=LINEA_BASE, help="Archivo JSON de la línea base.")
+    parser.add_argument('--umbral', type=float, default=0.25, help="Aumento relativo de tiempo tolerado (0.25 = 25%%).")
+    argumentos = parser.parse_args()
+
+    resultados = ejecutar_benchmarks(argumentos.rapido)
+    if argumentos.guardar:
+        guardar_linea_base(resultados, argumentos.linea_base)
+    if argumentos.comparar and comparar_con_linea_base(resultados, argumentos.linea_base, argumentos.umbral):
+        sys.exit(1)
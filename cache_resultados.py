@@ -0,0 +1,374 @@
+import ast
+import contextlib
+import functools
+import hashlib
+import os
+import pickle
+import struct
+import tempfile
+import types
+
+import numpy as np
+
+# Módulos de cálculo; si cambia el código de alguno o de un módulo que importan (ver modulos_calculo), cambian
+# todas las claves
+MODULOS_CALCULO = ('TES_object', 'TES_batch', 'TES_functions', 'lista_materiales', 'perfiles_anuales', 'Flujo_de_caja',
+                   'Flujo_de_caja2', 'Flujo_de_caja_columnar')
+# Directorio y tamaño por defecto; el directorio también se puede fijar con la variable de entorno TES_CACHE
+DIRECTORIO = os.environ.get('TES_CACHE', os.path.join(os.path.expanduser('~'), '.cache', 'tes_resultados'))
+TAMANO_MAXIMO = 512 * 2 ** 20
+# Al superar el tamaño máximo se recorta hasta esta fracción, para no recorrer la caché en cada escritura
+FRACCION_RECORTE = 0.9
+# Cada cuántas escrituras se vuelve a medir la caché (otros procesos también escriben y borran)
+ESCRITURAS_POR_MEDICION = 1000
+METODOS_TES = ('capex_knobloch', 'capex_kocher', 'capex_mctigue', 'capex_trevisan', 'capex_pereira', 'opex', 'LCOS')
+# Cambia si cambia la forma de calcular las claves o de guardar los resultados
+_VERSION = 2
+
+
+def _canonico(valor, h):
+    """
+    Alimenta el hash con una representación estable de `valor`: no depende del orden de los diccionarios, de la
+    sesión ni de si un número es int, float o un escalar de NumPy. Los enteros que no caben exactos en un float se
+    usan completos.
+    """
+    if valor is None or isinstance(valor, (bool, np.bool_)):
+        h.update(b'N' if valor is None else b'B1' if valor else b'B0')
+    elif isinstance(valor, (int, np.integer)):
+        valor = int(valor)
+        if abs(valor) <= 2 ** 53:
+            h.update(b'F' + struct.pack('<d', float(valor)))
+        else:
+            h.update(b'I')
+            _canonico(str(valor), h)
+    elif isinstance(valor, (float, np.floating)):
+        h.update(b'F' + struct.pack('<d', float(valor)))
+    elif isinstance(valor, str):
+        codificado = valor.encode('utf-8')
+        h.update(b'S' + struct.pack('<q', len(codificado)) + codificado)
+    elif isinstance(valor, np.ndarray):
+        forma = struct.pack(f'<{valor.ndim + 1}q', valor.ndim, *valor.shape)
+        if valor.dtype.kind == 'O':
+            # Los bytes de un arreglo de objetos son direcciones de memoria: se usa cada elemento
+            h.update(b'O' + forma)
+            for elemento in valor.ravel():
+                _canonico(elemento, h)
+            return
+        tipo = None
+        if valor.dtype.kind in 'bf' or valor.dtype.kind in 'iu' and (valor.size == 0 or -2 ** 53 <= valor.min() and valor.max() <= 2 ** 53):
+            tipo = np.float64
+        elif valor.dtype.kind in 'iu':
+            tipo = valor.dtype.newbyteorder('<')
+        arreglo = np.ascontiguousarray(valor, dtype=tipo)
+        h.update(b'A' + arreglo.dtype.str.encode() + forma + arreglo.tobytes())
+    elif isinstance(valor, (list, tuple)):
+        h.update(b'L' + struct.pack('<q', len(valor)))
+        for elemento in valor:
+            _canonico(elemento, h)
+    elif isinstance(valor, dict):
+        h.update(b'D' + struct.pack('<q', len(valor)))
+        for clave in sorted(valor, key=str):
+            _canonico(str(clave), h)
+            _canonico(valor[clave], h)
+    elif hasattr(valor, 'get_parameters'):
+        _canonico(type(valor).__name__, h)
+        _canonico(valor.get_parameters(), h)
+    elif isinstance(valor, (types.FunctionType, types.MethodType, types.BuiltinFunctionType, functools.partial)):
+        # Su resultado no depende solo de sus atributos; los parámetros por año deben ser arreglos o perfiles_anuales.CurvaGeometrica
+        raise TypeError(f"No se puede calcular la huella de la función {getattr(valor, '__qualname__', valor)!r}.")
+    elif hasattr(valor, '__dict__'):
+        # Objetos con sus datos como atributos, por ejemplo TESBatch o ResultadoFlujoDeCaja
+        _canonico(type(valor).__name__, h)
+        _canonico({clave: dato for clave, dato in vars(valor).items() if not clave.startswith('_')}, h)
+    else:
+        raise TypeError(f"No se puede calcular la huella de un valor de tipo {type(valor).__name__}.")
+
+
+def _ruta_modulo(modulo):
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), f"{modulo}.py")
+
+
+@functools.lru_cache(maxsize=None)
+def modulos_calculo(raices=MODULOS_CALCULO):
+    """
+    Retorna los módulos `raices` (por defecto MODULOS_CALCULO) y todos los módulos del proyecto que importan,
+    directa o indirectamente, incluidas las importaciones dentro de funciones.
+
+    Parámetros:
+    - raices (tuple of str): Nombres de los módulos de partida.
+
+    Retorna:
+    - tuple of str: Los nombres de los módulos, en orden alfabético.
+    """
+    encontrados, pendientes = set(), list(raices)
+    while pendientes:
+        modulo = pendientes.pop()
+        if modulo in encontrados:
+            continue
+        encontrados.add(modulo)
+        with open(_ruta_modulo(modulo), 'rb') as archivo:
+            arbol = ast.parse(archivo.read())
+        for nodo in ast.walk(arbol):
+            if isinstance(nodo, ast.Import):
+                nombres = [alias.name for alias in nodo.names]
+            elif isinstance(nodo, ast.ImportFrom) and nodo.level == 0 and nodo.module:
+                nombres = [nodo.module]
+            else:
+                continue
+            pendientes.extend(nombre.partition('.')[0] for nombre in nombres if os.path.exists(_ruta_modulo(nombre.partition('.')[0])))
+    return tuple(sorted(encontrados))
+
+
+@functools.lru_cache(maxsize=None)
+def huella_codigo(raices=MODULOS_CALCULO):
+    """
+    Retorna el sha256 del código fuente de modulos_calculo(raices), para que un cambio en los cálculos invalide la caché.
+    """
+    h = hashlib.sha256()
+    for modulo in modulos_calculo(raices):
+        with open(_ruta_modulo(modulo), 'rb') as archivo:
+            _canonico(modulo, h)
+            _canonico(archivo.read().decode('utf-8'), h)
+    return h.hexdigest()
+
+
+def huella(*valores):
+    """
+    Calcula una clave estable (sha256 hexadecimal) para un conjunto de valores: parámetros, objetos TES o TESBatch,
+    componentes, arreglos y entradas del flujo de caja. Incluye la huella del código de cálculo.
+
+    Parámetros:
+    - valores: Valores que identifican el resultado.
+
+    Retorna:
+    - str: La clave.
+    """
+    h = hashlib.sha256(f"{_VERSION}:{huella_codigo()}".encode())
+    _canonico(list(valores), h)
+    return h.hexdigest()
+
+
+@contextlib.contextmanager
+def _bloqueo(ruta):
+    """
+    Bloqueo exclusivo entre procesos sobre el archivo `ruta` (fcntl en Unix, msvcrt en Windows).
+    """
+    with open(ruta, 'a+b') as archivo:
+        try:
+            import fcntl
+        except ImportError:
+            import msvcrt
+            archivo.seek(0)
+            msvcrt.locking(archivo.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                archivo.seek(0)
+                msvcrt.locking(archivo.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            fcntl.flock(archivo.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(archivo.fileno(), fcntl.LOCK_UN)
+
+
+class CacheResultados:
+    def __init__(self, directorio=DIRECTORIO, tamano_maximo=TAMANO_MAXIMO):
+        """
+        Caché en disco de resultados de costos y flujo de caja, direccionada por contenido.
+
+        Cada resultado se guarda en un archivo cuyo nombre es su clave (ver huella). Las escrituras son atómicas
+        (archivo temporal y os.replace), así que varios procesos pueden leer y escribir a la vez sin ver archivos a
+        medio escribir. Cada lectura exitosa actualiza la fecha de modificación del archivo, y al superar
+        `tamano_maximo` se borran los resultados usados hace más tiempo (LRU), bajo un bloqueo entre procesos, hasta
+        quedar en FRACCION_RECORTE del máximo. El tamaño se lleva como un total que suma cada escritura y solo se
+        vuelve a medir al recortar o cada ESCRITURAS_POR_MEDICION escrituras, de modo que guardar no recorre la caché.
+
+        Los resultados se guardan con pickle: use solo directorios de caché propios.
+
+        Parámetros:
+        - directorio (str): Directorio de la caché.
+        - tamano_maximo (int): Tamaño máximo en bytes de los resultados guardados.
+        """
+        self.directorio = directorio
+        self.tamano_maximo = tamano_maximo
+        self.aciertos = 0
+        self.fallos = 0
+        # Tamaño estimado de la caché (None hasta la primera medición) y escrituras desde la última medición
+        self._tamano = None
+        self._escrituras = 0
+        os.makedirs(directorio, exist_ok=True)
+
+    def _ruta(self, clave):
+        return os.path.join(self.directorio, clave[:2], clave[2:] + '.pkl')
+
+    def __contains__(self, clave):
+        return os.path.exists(self._ruta(clave))
+
+    def obtener(self, clave, defecto=None):
+        """
+        Retorna el resultado guardado con `clave`, o `defecto` si no existe.
+        """
+        ruta = self._ruta(clave)
+        try:
+            with open(ruta, 'rb') as archivo:
+                valor = pickle.load(archivo)
+            os.utime(ruta)
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+            # Otro proceso pudo borrarlo entre la búsqueda y la lectura
+            self.fallos += 1
+            return defecto
+        self.aciertos += 1
+        return valor
+
+    def guardar(self, clave, valor):
+        """
+        Guarda `valor` con `clave` y aplica el límite de tamaño.
+        """
+        ruta = self._ruta(clave)
+        os.makedirs(os.path.dirname(ruta), exist_ok=True)
+        anterior = 0
+        with contextlib.suppress(FileNotFoundError):
+            anterior = os.stat(ruta).st_size
+        descriptor, temporal = tempfile.mkstemp(dir=os.path.dirname(ruta), suffix='.tmp')
+        try:
+            with os.fdopen(descriptor, 'wb') as archivo:
+                pickle.dump(valor, archivo, protocol=pickle.HIGHEST_PROTOCOL)
+                escrito = archivo.tell()
+            os.replace(temporal, ruta)
+        except BaseException:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(temporal)
+            raise
+        self._escrituras += 1
+        if self._tamano is None or self._escrituras >= ESCRITURAS_POR_MEDICION:
+            self.recortar()
+            return
+        self._tamano += escrito - anterior
+        if self._tamano > self.tamano_maximo:
+            self.recortar()
+
+    def _archivos(self):
+        """
+        Lista (fecha de uso, tamaño, ruta) de los resultados guardados.
+        """
+        archivos = []
+        for subdirectorio in os.scandir(self.directorio):
+            if not subdirectorio.is_dir():
+                continue
+            for entrada in os.scandir(subdirectorio.path):
+                if entrada.name.endswith('.pkl'):
+                    with contextlib.suppress(FileNotFoundError):
+                        estado = entrada.stat()
+                        archivos.append((estado.st_mtime_ns, estado.st_size, entrada.path))
+        return archivos
+
+    def tamano(self):
+        """
+        Retorna el tamaño total en bytes de los resultados guardados.
+        """
+        return sum(tamano for _, tamano, _ in self._archivos())
+
+    def recortar(self):
+        """
+        Mide la caché y, si supera `tamano_maximo`, borra los resultados usados hace más tiempo hasta quedar bajo
+        FRACCION_RECORTE del máximo.
+        """
+        with _bloqueo(os.path.join(self.directorio, '.bloqueo')):
+            archivos = sorted(self._archivos())
+            total = sum(tamano for _, tamano, _ in archivos)
+            if total > self.tamano_maximo:
+                for _, tamano, ruta in archivos:
+                    if total <= FRACCION_RECORTE * self.tamano_maximo:
+                        break
+                    with contextlib.suppress(FileNotFoundError):
+                        os.remove(ruta)
+                    total -= tamano
+        self._tamano = total
+        self._escrituras = 0
+
+    def limpiar(self):
+        """
+        Borra todos los resultados guardados.
+        """
+        with _bloqueo(os.path.join(self.directorio, '.bloqueo')):
+            for _, _, ruta in self._archivos():
+                with contextlib.suppress(FileNotFoundError):
+                    os.remove(ruta)
+        self._tamano = 0
+        self._escrituras = 0
+
+    def memorizar(self, funcion, *args, **kwargs):
+        """
+        Retorna funcion(*args, **kwargs), calculándola solo si no hay un resultado guardado para esos argumentos.
+
+        Parámetros:
+        - funcion (callable): Función a evaluar; su módulo y nombre forman parte de la clave.
+        - args, kwargs: Argumentos de la función.
+
+        Retorna:
+        - El resultado de la función.
+        """
+        clave = huella(funcion.__module__, funcion.__qualname__, args, kwargs)
+        faltante = object()
+        valor = self.obtener(clave, faltante)
+        if valor is faltante:
+            valor = funcion(*args, **kwargs)
+            self.guardar(clave, valor)
+        return valor
+
+    def resultados_tes(self, tes, metodos=METODOS_TES):
+        """
+        Retorna los resultados de costos de un TES o TESBatch, guardados bajo la huella de sus parámetros y componentes.
+
+        Parámetros:
+        - tes (TES o TESBatch): Diseño o lote de diseños.
+        - metodos (tuple of str): Métodos a evaluar.
+
+        Retorna:
+        - dict: {método: resultado}; los métodos con datos faltantes tienen su mensaje de error, como en TES.
+        """
+        clave = huella('resultados_tes', type(tes).__name__, tes, list(metodos))
+        faltante = object()
+        resultados = self.obtener(clave, faltante)
+        if resultados is faltante:
+            resultados = {metodo: getattr(tes, metodo)() for metodo in metodos}
+            self.guardar(clave, resultados)
+        return resultados
+
+    def flujo_de_caja(self, *args, **kwargs):
+        """
+        Flujo_de_caja2.calcular_flujo_de_caja con caché; recibe los mismos argumentos.
+
+        Retorna:
+        - ResultadoFlujoDeCaja: El resultado, calculado o leído de la caché.
+        """
+        from Flujo_de_caja2 import calcular_flujo_de_caja
+        return self.memorizar(calcular_flujo_de_caja, *args, **kwargs)
+
+    def exportar_excel(self, resultado, ruta, **opciones):
+        """
+        Escribe el flujo de caja en Excel solo si el archivo no existe, cambió desde la última escritura o el
+        resultado es distinto del que se escribió.
+
+        Parámetros:
+        - resultado (ResultadoFlujoDeCaja o pd.DataFrame): Flujo de caja a exportar.
+        - ruta (str): Archivo .xlsx.
+        - opciones: Opciones para DataFrame.to_excel (por defecto index=False).
+
+        Retorna:
+        - bool: True si se escribió el archivo.
+        """
+        opciones.setdefault('index', False)
+        contenido = huella('excel', resultado, opciones)
+        registro = huella('registro_excel', os.path.abspath(ruta))
+        with contextlib.suppress(FileNotFoundError):
+            estado = os.stat(ruta)
+            if self.obtener(registro) == (contenido, estado.st_mtime_ns, estado.st_size):
+                return False
+        datos = resultado.to_dataframe() if hasattr(resultado, 'to_dataframe') else resultado
+        datos.to_excel(ruta, **opciones)
+        estado = os.stat(ruta)
+        self.guardar(registro, (contenido, estado.st_mtime_ns, estado.st_size))
+        return True
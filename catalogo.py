@@ -0,0 +1,306 @@
+import hashlib
+import json
+import os
+
+import numpy as np
+
+import cache_resultados
+import geometria
+from Flujo_de_caja2 import PARAMETROS_FLUJO
+from TES_batch import TESBatch
+from TES_object import TES
+
+# Parámetros esenciales de TES y parámetros adicionales conocidos: los que TES guarda, los de los métodos de costo y
+# los que solo describen el diseño (como en Total.py) sin que ningún método los use
+PARAMETROS_ESENCIALES = ('iron_volume', 'insulation_volume', 'price_per_cubic_meter_iron', 'price_per_cubic_meter_insulation')
+PARAMETROS_DESCRIPTIVOS = ('initial_pressure', 'working_fluid_flow', 'flow_section_area')
+PARAMETROS_CONOCIDOS = frozenset(TES._SCHEMA).difference({'components'}).union(
+    PARAMETROS_ESENCIALES, PARAMETROS_DESCRIPTIVOS, *(requeridos for requeridos in TESBatch._REQUIRED_PARAMS.values()))
+# Geometrías aceptadas en la tabla 'geometria' de un escenario: función de volúmenes y dimensiones que recibe
+GEOMETRIAS = {
+    'cilindro': (geometria.volumenes_cilindro, ('altura', 'radio', 'espesor_acero', 'espesor_aislamiento')),
+    'esfera': (geometria.volumenes_esfera, ('radio', 'espesor_acero', 'espesor_aislamiento')),
+    'lecho_empacado': (geometria.volumenes_lecho_empacado, ('altura', 'radio', 'espesor_acero', 'espesor_aislamiento', 'porosidad')),
+}
+# Cambia si cambia el formato del archivo de caché
+_VERSION_CACHE = 2
+
+
+def _es_numero(valor):
+    return isinstance(valor, (int, float)) and not isinstance(valor, bool)
+
+
+def leer_catalogo(ruta):
+    """
+    Lee un catálogo de escenarios en JSON o TOML (según la extensión).
+
+    El archivo tiene una tabla opcional 'comun' con parámetros compartidos por todos los escenarios y una tabla
+    'escenarios' con un escenario por nombre. Cada escenario tiene los parámetros de TES, `components` como lista
+    de [nombre, precio, cantidad] y, opcionalmente, una tabla `geometria` que reemplaza iron_volume e
+    insulation_volume (ver validar_escenario). Una tabla opcional 'flujo_de_caja' tiene los parámetros del flujo de
+    caja comunes a todos los escenarios (ver validar_flujo_de_caja).
+
+    Parámetros:
+    - ruta (str): Archivo .json o .toml.
+
+    Retorna:
+    - dict: El contenido del archivo.
+    """
+    if ruta.endswith('.toml'):
+        import tomllib
+        with open(ruta, 'rb') as archivo:
+            return tomllib.load(archivo)
+    with open(ruta, encoding='utf-8') as archivo:
+        return json.load(archivo)
+
+
+def validar_escenario(nombre, datos, comun=None):
+    """
+    Valida un escenario y lo normaliza a los parámetros de TES.
+
+    La tabla opcional `geometria` tiene `tipo` ('cilindro', 'esfera' o 'lecho_empacado'), sus dimensiones
+    (ver geometria.py), `numero_estanques` y opcionalmente `componente_medio` = [nombre, precio por m³] o
+    `parametro_medio` (por ejemplo 'volume_tes_material') para el volumen del medio.
+
+    Parámetros:
+    - nombre (str): Nombre del escenario, usado en los mensajes de error.
+    - datos (dict): Parámetros del escenario.
+    - comun (dict, opcional): Parámetros compartidos; los del escenario tienen prioridad.
+
+    Retorna:
+    - tuple: (parámetros numéricos, lista de componentes como tuplas).
+    """
+    datos = {**(comun or {}), **datos}
+    componentes = datos.pop('components', [])
+    forma_geometria = datos.pop('geometria', None)
+
+    if not isinstance(componentes, list) or not all(
+            isinstance(c, (list, tuple)) and len(c) == 3 and isinstance(c[0], str) and _es_numero(c[1]) and _es_numero(c[2]) for c in componentes):
+        raise ValueError(f"Escenario '{nombre}': 'components' debe ser una lista de [nombre, precio, cantidad].")
+    componentes = [tuple(componente) for componente in componentes]
+
+    if forma_geometria is not None:
+        forma_geometria = dict(forma_geometria)
+        tipo = forma_geometria.pop('tipo', None)
+        if tipo not in GEOMETRIAS:
+            raise ValueError(f"Escenario '{nombre}': geometría desconocida {tipo!r}; use una de {sorted(GEOMETRIAS)}.")
+        funcion, dimensiones = GEOMETRIAS[tipo]
+        faltantes = [dimension for dimension in dimensiones if dimension not in forma_geometria]
+        if faltantes:
+            raise ValueError(f"Escenario '{nombre}': faltan las dimensiones {faltantes} de la geometría '{tipo}'.")
+        volumenes = funcion(*(forma_geometria[dimension] for dimension in dimensiones), forma_geometria.get('numero_estanques', 1))
+        datos['iron_volume'] = float(volumenes['acero'])
+        datos['insulation_volume'] = float(volumenes['aislamiento'])
+        if 'parametro_medio' in forma_geometria:
+            datos[forma_geometria['parametro_medio']] = float(volumenes['medio'])
+        if 'componente_medio' in forma_geometria:
+            nombre_medio, precio_medio = forma_geometria['componente_medio']
+            componentes.append((nombre_medio, precio_medio, float(volumenes['medio'])))
+
+    faltantes = [parametro for parametro in PARAMETROS_ESENCIALES if parametro not in datos]
+    if faltantes:
+        raise ValueError(f"Escenario '{nombre}': faltan los parámetros {faltantes}.")
+    desconocidos = sorted(set(datos) - PARAMETROS_CONOCIDOS)
+    if desconocidos:
+        raise ValueError(f"Escenario '{nombre}': parámetros desconocidos {desconocidos}.")
+    no_numericos = [clave for clave, valor in datos.items() if not _es_numero(valor)]
+    if no_numericos:
+        raise ValueError(f"Escenario '{nombre}': los parámetros {no_numericos} deben ser números.")
+    return datos, componentes
+
+
+def validar_flujo_de_caja(flujo_de_caja):
+    """
+    Valida los parámetros del flujo de caja de un catálogo.
+
+    Son los de Flujo_de_caja2.calcular_flujo_de_caja (Flujo_de_caja2.PARAMETROS_FLUJO), como números, listas de valores
+    por año o, igual que en montecarlo, el nombre de un método de TESBatch ('opex', 'capex_pereira', ...) cuyo
+    resultado se usa para cada escenario.
+
+    Parámetros:
+    - flujo_de_caja (dict): Parámetros del flujo de caja.
+
+    Retorna:
+    - dict: Los mismos parámetros.
+    """
+    faltantes = [parametro for parametro in PARAMETROS_FLUJO if parametro not in flujo_de_caja]
+    desconocidos = sorted(set(flujo_de_caja) - set(PARAMETROS_FLUJO))
+    if faltantes or desconocidos:
+        raise ValueError(f"Flujo de caja: faltan los parámetros {faltantes} o hay parámetros desconocidos {desconocidos}.")
+    for parametro, valor in flujo_de_caja.items():
+        if isinstance(valor, str):
+            if not callable(getattr(TESBatch, valor, None)):
+                raise ValueError(f"Flujo de caja: '{parametro}' = {valor!r} no es un método de TESBatch.")
+        elif not (_es_numero(valor) or isinstance(valor, list) and all(_es_numero(elemento) for elemento in valor)):
+            raise ValueError(f"Flujo de caja: '{parametro}' debe ser un número, una lista de números o el nombre de un método.")
+    return dict(flujo_de_caja)
+
+
+class Catalogo:
+    def __init__(self, nombres, columnas, componentes, flujo_de_caja=None):
+        """
+        Catálogo de escenarios compilado: una columna de NumPy por parámetro, con una fila por escenario.
+
+        Los escenarios que no definen un parámetro tienen nan en su columna; grupos los separa de los que sí lo
+        definen para reportar los datos que faltan en cada escenario.
+
+        Parámetros:
+        - nombres (list of str): Nombre de cada escenario, en el orden de las filas.
+        - columnas (dict): {parámetro: np.ndarray de largo igual al número de escenarios}.
+        - componentes (list of lists): Lista de componentes (tuplas) de cada escenario.
+        - flujo_de_caja (dict, opcional): Parámetros del flujo de caja del catálogo (ver validar_flujo_de_caja).
+        """
+        self.nombres = list(nombres)
+        self.columnas = columnas
+        self.componentes = componentes
+        self.flujo_de_caja = flujo_de_caja or {}
+        self._indices = {nombre: i for i, nombre in enumerate(self.nombres)}
+
+    def __len__(self):
+        return len(self.nombres)
+
+    def __contains__(self, nombre):
+        return nombre in self._indices
+
+    @classmethod
+    def compilar(cls, contenido):
+        """
+        Valida cada escenario una vez y compila el catálogo a columnas.
+
+        Parámetros:
+        - contenido (dict): Catálogo leído con leer_catalogo.
+
+        Retorna:
+        - Catalogo: El catálogo compilado.
+        """
+        escenarios = contenido.get('escenarios', {})
+        if not escenarios:
+            raise ValueError("El catálogo no tiene escenarios.")
+        comun = contenido.get('comun', {})
+        validados = [validar_escenario(nombre, datos, comun) for nombre, datos in escenarios.items()]
+
+        parametros = sorted(set().union(*(datos for datos, _ in validados)))
+        columnas = {parametro: np.array([datos.get(parametro, np.nan) for datos, _ in validados], dtype=np.float64) for parametro in parametros}
+        flujo_de_caja = validar_flujo_de_caja(contenido['flujo_de_caja']) if 'flujo_de_caja' in contenido else None
+        return cls(list(escenarios), columnas, [componentes for _, componentes in validados], flujo_de_caja)
+
+    @classmethod
+    def cargar(cls, ruta, usar_cache=True):
+        """
+        Carga un catálogo JSON o TOML, usando la versión compilada en caché si el archivo no cambió.
+
+        La caché se guarda en `__pycache__/<archivo>.npz` junto al catálogo, identificada por el sha256 del
+        contenido del archivo y del código que lo compila (este módulo y los que importa, como geometria; ver
+        cache_resultados.huella_codigo).
+
+        Parámetros:
+        - ruta (str): Archivo del catálogo.
+        - usar_cache (bool): Si es False, siempre se lee y compila el archivo (y no se escribe caché).
+
+        Retorna:
+        - Catalogo: El catálogo compilado.
+        """
+        with open(ruta, 'rb') as archivo:
+            huella = hashlib.sha256(archivo.read() + cache_resultados.huella_codigo(('catalogo',)).encode()).hexdigest()
+        ruta_cache = os.path.join(os.path.dirname(os.path.abspath(ruta)), '__pycache__', os.path.basename(ruta) + '.npz')
+
+        if usar_cache and os.path.exists(ruta_cache):
+            with np.load(ruta_cache, allow_pickle=False) as datos:
+                if str(datos['huella']) == huella and int(datos['version']) == _VERSION_CACHE:
+                    meta = json.loads(str(datos['meta']))
+                    columnas = {parametro: datos[f"columna_{i}"] for i, parametro in enumerate(meta['parametros'])}
+                    componentes = [[tuple(componente) for componente in lista] for lista in meta['componentes']]
+                    return cls(meta['nombres'], columnas, componentes, meta['flujo_de_caja'])
+
+        catalogo = cls.compilar(leer_catalogo(ruta))
+        if usar_cache:
+            os.makedirs(os.path.dirname(ruta_cache), exist_ok=True)
+            meta = {'nombres': catalogo.nombres, 'parametros': list(catalogo.columnas), 'componentes': catalogo.componentes,
+                    'flujo_de_caja': catalogo.flujo_de_caja}
+            temporal = ruta_cache + '.tmp.npz'
+            np.savez(temporal, huella=huella, version=_VERSION_CACHE, meta=json.dumps(meta, ensure_ascii=False),
+                     **{f"columna_{i}": columna for i, columna in enumerate(catalogo.columnas.values())})
+            os.replace(temporal, ruta_cache)
+        return catalogo
+
+    def tes(self, nombre):
+        """
+        Crea el objeto TES de un escenario, solo con los parámetros que el escenario define.
+
+        Parámetros:
+        - nombre (str): Nombre del escenario.
+
+        Retorna:
+        - TES: El diseño del escenario.
+        """
+        if nombre not in self._indices:
+            raise KeyError(f"El catálogo no tiene el escenario '{nombre}'.")
+        fila = self._indices[nombre]
+        parametros = {}
+        for parametro, columna in self.columnas.items():
+            valor = columna[fila].item()
+            if not np.isnan(valor):
+                parametros[parametro] = int(valor) if parametro == 'service_years' else valor
+        tes = TES(*(parametros.pop(parametro) for parametro in PARAMETROS_ESENCIALES), list(self.componentes[fila]))
+        tes.set_additional_parameters(**parametros)
+        return tes
+
+    def _filas(self, nombres):
+        """
+        Índices de las filas de los escenarios pedidos (todos si `nombres` es None).
+        """
+        if nombres is None:
+            return np.arange(len(self.nombres))
+        faltantes = [nombre for nombre in nombres if nombre not in self._indices]
+        if faltantes:
+            raise KeyError(f"El catálogo no tiene los escenarios {faltantes}.")
+        return np.array([self._indices[nombre] for nombre in nombres], dtype=np.int64)
+
+    def grupos(self, nombres=None):
+        """
+        Separa los escenarios en grupos que definen los mismos parámetros, para evaluar cada grupo como un lote.
+
+        Así, si a un escenario le falta un dato, los métodos que lo usan retornan "Faltan los siguientes datos" solo
+        para su grupo y no para los demás escenarios.
+
+        Parámetros:
+        - nombres (list of str, opcional): Escenarios a separar. Por defecto, todos, en el orden del catálogo.
+
+        Retorna:
+        - list of lists of str: Los grupos, cada uno en el orden en que aparecen sus escenarios.
+        """
+        filas = self._filas(nombres)
+        nombres = [self.nombres[fila] for fila in filas]
+        if not self.columnas:
+            return [nombres] if nombres else []
+        definidos = np.stack([~np.isnan(columna[filas]) for columna in self.columnas.values()], axis=1)
+        _, primeros, grupo = np.unique(definidos, axis=0, return_index=True, return_inverse=True)
+        grupo = grupo.reshape(-1)
+        return [[nombres[i] for i in np.flatnonzero(grupo == g)] for g in np.argsort(primeros)]
+
+    def lote(self, nombres=None):
+        """
+        Crea un TESBatch con los escenarios pedidos, tomando las columnas compiladas sin pasar por objetos TES.
+
+        Los escenarios deben definir los mismos parámetros (ver grupos); los parámetros que ninguno define no se
+        incluyen, de modo que los métodos que los usan retornan "Faltan los siguientes datos".
+
+        Parámetros:
+        - nombres (list of str, opcional): Escenarios a incluir. Por defecto, todos, en el orden del catálogo.
+
+        Retorna:
+        - TESBatch: El lote, con una fila por escenario.
+        """
+        filas = self._filas(nombres)
+        columnas, sin_definir = {}, {}
+        for parametro, columna in self.columnas.items():
+            valores = columna[filas]
+            faltan = np.isnan(valores)
+            if not faltan.any():
+                columnas[parametro] = valores
+            elif not faltan.all():
+                for fila in filas[faltan]:
+                    sin_definir.setdefault(self.nombres[fila], []).append(parametro)
+        if sin_definir:
+            raise ValueError(f"Los escenarios no definen los mismos parámetros; faltan {sin_definir}. Sepárelos con Catalogo.grupos.")
+        return TESBatch(components=[list(self.componentes[fila]) for fila in filas], **columnas)
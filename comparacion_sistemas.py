@@ -1,4 +1,5 @@
 from TES_object import TES
+from geometria import volumenes_cilindro
 import numpy as np
 
 
@@ -31,12 +32,15 @@ m_discharge = 590 #m3/h
 t_charge = 9 # h
 t_discharge = 4 # h
 
+# Sistema de dos estanques: acero y aislamiento de ambos, aceite en uno
+volumenes_oil_tes = volumenes_cilindro(height_oil_tes, radius_oil_tes, steel_th_oil, ins_th_oil, numero_estanques=2)
+
 oil_tes = TES(
-    iron_volume = 2 * np.pi * (height_oil_tes * ((radius_oil_tes + steel_th_oil) ** 2 - radius_oil_tes ** 2) + 2 * steel_th_oil * radius_oil_tes ** 2),  # m³
-    insulation_volume = 2 * np.pi * (height_oil_tes * ((radius_oil_tes + steel_th_oil + ins_th_oil) ** 2 - (radius_oil_tes + steel_th_oil) ** 2) + 2 * ins_th_oil * radius_oil_tes ** 2),  # m³
+    iron_volume = volumenes_oil_tes['acero'],  # m³
+    insulation_volume = volumenes_oil_tes['aislamiento'],  # m³
     price_per_cubic_meter_iron=1630,  # $/m³
     price_per_cubic_meter_insulation=7000,  # $/m³
-    components=[("Therminol1",  1.5*Therminol_density/Therminol_cost_kg, np.pi * height_oil_tes * radius_oil_tes**2 )] #m3
+    components=[("Therminol1",  1.5*Therminol_density/Therminol_cost_kg, volumenes_oil_tes['medio'] )] #m3
     # components=[("Pump", 2000, 2), ("Valve", 300, 4)]  # list of components
 )
 
@@ -231,3 +235,20 @@ print(f"OPEX: {opex_experimento}")
 
 lcos_experimento = tes_experimento.LCOS()
 print(f"LCOS: {lcos_experimento}")
+
+
+"""
+Análisis de sensibilidad (tornado) de los cuatro estudios
+"""
+
+if __name__ == "__main__":
+    from sensibilidad import analisis_tornado_estudios
+
+    estudios = {
+        "Orsini": oil_tes,
+        "Touzo": tes_touzo,
+        "Knobloch": tes_knobloch,
+        "Experimento": tes_experimento,
+    }
+    tornado = analisis_tornado_estudios(estudios, variacion=0.1)
+    print(tornado.groupby(['Estudio', 'Métrica'], sort=False).head(5).to_string(index=False))
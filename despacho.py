@@ -0,0 +1,152 @@
+import numpy as np
+
+from perfiles_anuales import valores_anuales
+from TES_batch import TESBatch
+
+
+def _columna(tes, nombre):
+    """
+    Lee un parámetro del TES o del lote como arreglo (diseños,).
+    """
+    if not hasattr(tes, nombre):
+        raise ValueError(f"Faltan los siguientes datos: {[nombre]}")
+    return np.atleast_1d(np.asarray(getattr(tes, nombre), dtype=np.float64))
+
+
+def _columna_anual(tes, nombre, años):
+    """
+    Lee un parámetro que puede variar por año (ver perfiles_anuales) como arreglo (diseños,), o como matriz
+    (años × diseños) con el valor de cada año simulado si tiene valores por año.
+    """
+    valor = getattr(tes, nombre, None)
+    if callable(valor) or np.ndim(valor) == 2 or not isinstance(tes, TESBatch) and np.ndim(valor) == 1:
+        return np.atleast_2d(valores_anuales(valor, años)).T
+    return _columna(tes, nombre)
+
+
+def _serie(valores, nombre):
+    """
+    Convierte una serie de un año (pasos,) o de varios años (años × pasos) en una matriz (años × pasos).
+    """
+    serie = np.asarray(valores, dtype=np.float64)
+    if serie.ndim == 1:
+        serie = serie[None, :]
+    if serie.ndim != 2:
+        raise ValueError(f"La serie '{nombre}' debe ser (pasos,) o (años × pasos).")
+    return serie
+
+
+def simular_despacho(tes, precio, disponibilidad_solar, paso_horas=1.0, precio_umbral=None):
+    """
+    Simula la carga y descarga del TES paso a paso a lo largo de uno o varios años.
+
+    En cada paso el TES se carga con la fracción disponible de su potencia nominal de carga
+    (tes_energy_capacity / charging_time) hasta llenarse, y se descarga a su potencia nominal
+    (tes_energy_capacity / discharging_time) cuando el precio es mayor o igual a `precio_umbral`.
+    La energía entregada es la descargada por tes_efficiency; si tes_efficiency varía por año (ver perfiles_anuales),
+    cada año simulado usa su valor. Los ventiladores trabajan a la potencia
+    m·Δp / (ρ·η) del OPEX, proporcional a la potencia de carga o descarga de cada paso.
+
+    La recursión del estado de carga avanza por pasos, pero cada paso se evalúa para todos los años y
+    diseños a la vez; cada año parte con el TES vacío.
+
+    Parámetros:
+    - tes (TES o TESBatch): Diseño o lote de diseños con los parámetros de OPEX y LCOS.
+    - precio (array_like): Precio de la energía ($/kWh) por paso, (pasos,) o (años × pasos).
+    - disponibilidad_solar (array_like): Fracción (0 a 1) de la potencia de carga disponible en cada paso, misma forma que `precio`.
+    - paso_horas (float): Duración de cada paso en horas (1 para series horarias, 0.25 para series de 15 minutos).
+    - precio_umbral (float o array_like, opcional): Precio desde el cual se descarga, uno por diseño. Por defecto, el precio medio de cada año.
+
+    Retorna:
+    - dict: 'energia_cargada', 'energia_entregada' (kWh), 'energia_ventiladores' (J), 'horas_carga', 'horas_descarga'
+      (horas equivalentes a potencia nominal), 'ciclos' (energía descargada / capacidad) e 'ingresos' ($), cada uno
+      (diseños × años) para un TESBatch o (años,) para un TES.
+    """
+    precio = _serie(precio, 'precio')
+    disponibilidad_solar = np.broadcast_to(_serie(disponibilidad_solar, 'disponibilidad_solar'), precio.shape)
+
+    años, pasos = precio.shape
+    capacidad = _columna(tes, 'tes_energy_capacity')
+    eficiencia = _columna_anual(tes, 'tes_efficiency', años)
+    potencia_carga = capacidad / _columna(tes, 'charging_time')
+    potencia_descarga = capacidad / _columna(tes, 'discharging_time')
+    fluido = _columna(tes, 'working_fluid_density') * _columna(tes, 'fan_efficiency')
+    ventilador_carga = _columna(tes, 'mass_flow_rate_charge') * _columna(tes, 'delta_pressure_charge') / fluido
+    ventilador_descarga = _columna(tes, 'mass_flow_rate_discharge') * _columna(tes, 'delta_pressure_discharge') / fluido
+
+    forma = (años, np.broadcast_shapes(capacidad.shape, eficiencia.shape[-1:], potencia_carga.shape, potencia_descarga.shape)[0])
+    if precio_umbral is None:
+        umbral = np.broadcast_to(precio.mean(axis=1)[:, None], forma)
+    else:
+        umbral = np.broadcast_to(np.asarray(precio_umbral, dtype=np.float64), forma)
+
+    carga_maxima = potencia_carga * paso_horas
+    descarga_maxima = potencia_descarga * paso_horas
+    estado = np.zeros(forma)
+    cargada = np.zeros(forma)
+    descargada = np.zeros(forma)
+    ingresos = np.zeros(forma)
+    for paso in range(pasos):
+        carga = np.minimum(carga_maxima * disponibilidad_solar[:, paso, None], capacidad - estado)
+        estado += carga
+        descarga = np.where(precio[:, paso, None] >= umbral, np.minimum(descarga_maxima, estado), 0.0)
+        estado -= descarga
+        cargada += carga
+        descargada += descarga
+        ingresos += descarga * precio[:, paso, None]
+
+    horas_carga = cargada / potencia_carga
+    horas_descarga = descargada / potencia_descarga
+    resultado = {
+        'energia_cargada': cargada,
+        'energia_entregada': descargada * eficiencia,
+        'energia_ventiladores': 3600 * (ventilador_carga * horas_carga + ventilador_descarga * horas_descarga),
+        'horas_carga': horas_carga,
+        'horas_descarga': horas_descarga,
+        'ciclos': descargada / capacidad,
+        'ingresos': ingresos * eficiencia,
+    }
+    if isinstance(tes, TESBatch):
+        return {nombre: valores.T for nombre, valores in resultado.items()}
+    return {nombre: valores[:, 0] for nombre, valores in resultado.items()}
+
+
+def parametros_opex(despacho):
+    """
+    Convierte el resultado de simular_despacho en los parámetros de operación de TES.opex / TESBatch.opex.
+
+    Se usan los promedios anuales: cycles_per_year son los ciclos equivalentes y charging_time y discharging_time
+    las horas a potencia nominal por ciclo, de modo que cycles_per_year × charging_time son las horas de
+    ventilador simuladas.
+
+    Parámetros:
+    - despacho (dict): Resultado de simular_despacho.
+
+    Retorna:
+    - dict: {'cycles_per_year', 'charging_time', 'discharging_time'}, para usar con set_additional_parameters.
+    """
+    ciclos = despacho['ciclos'].mean(axis=-1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        charging_time = np.where(ciclos > 0, despacho['horas_carga'].mean(axis=-1) / ciclos, 0.0)[()]
+        discharging_time = np.where(ciclos > 0, despacho['horas_descarga'].mean(axis=-1) / ciclos, 0.0)[()]
+    return {'cycles_per_year': ciclos, 'charging_time': charging_time, 'discharging_time': discharging_time}
+
+
+def parametros_flujo_de_caja(despacho):
+    """
+    Convierte el resultado de simular_despacho en la producción y el precio anuales del flujo de caja.
+
+    El precio es el precio medio ponderado por la energía entregada, así produccion_anual × precio_energia
+    son exactamente los ingresos simulados de cada año.
+
+    Parámetros:
+    - despacho (dict): Resultado de simular_despacho.
+
+    Retorna:
+    - dict: {'produccion_anual', 'precio_energia'} por año (o por diseño y año), para Flujo_de_caja2.calcular_flujo_de_caja
+      o calcular_flujo_de_caja_portafolio.
+    """
+    produccion = despacho['energia_entregada']
+    with np.errstate(divide='ignore', invalid='ignore'):
+        precio = np.where(produccion > 0, despacho['ingresos'] / produccion, 0.0)
+    return {'produccion_anual': produccion, 'precio_energia': precio}
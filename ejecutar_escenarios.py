@@ -0,0 +1,259 @@
+import argparse
+import csv
+import functools
+import os
+import sys
+import time
+
+import numpy as np
+
+from catalogo import Catalogo
+from Flujo_de_caja2 import PARAMETROS_FLUJO
+from TES_batch import TESBatch
+
+EXTENSIONES = ('.toml', '.json')
+# Columnas de salida, una fila por escenario
+COLUMNAS_RESULTADO = ('archivo', 'escenario', *TESBatch._CAPEX_METHODS, 'opex', 'LCOS', 'VAN', 'TIR', 'faltantes')
+# Parámetros del flujo de caja que son uno por escenario (el resto puede variar por año)
+_PARAMETROS_POR_PLANTA = ('inversion_inicial', 'tasa_impuestos', 'tasa_descuento')
+
+
+def procesos_disponibles():
+    """
+    Retorna el número de núcleos que el proceso puede usar.
+    """
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def buscar_catalogos(directorio):
+    """
+    Lista los catálogos de escenarios (.toml y .json) de un directorio y sus subdirectorios, en orden.
+
+    Parámetros:
+    - directorio (str): Directorio a recorrer.
+
+    Retorna:
+    - list of str: Rutas de los catálogos.
+    """
+    rutas = []
+    for raiz, subdirectorios, archivos in os.walk(directorio):
+        subdirectorios[:] = sorted(subdirectorio for subdirectorio in subdirectorios if subdirectorio != '__pycache__')
+        rutas.extend(os.path.join(raiz, archivo) for archivo in sorted(archivos) if archivo.endswith(EXTENSIONES))
+    return rutas
+
+
+@functools.lru_cache(maxsize=None)
+def _catalogo(ruta):
+    """
+    Carga un catálogo una vez por proceso (y desde la caché compilada en disco si existe).
+    """
+    return Catalogo.cargar(ruta)
+
+
+def _columna(valor, n):
+    """
+    Convierte el resultado de un método del lote en una columna de `n` valores (nan si faltan datos).
+    """
+    if isinstance(valor, str):
+        return np.full(n, np.nan)
+    return np.broadcast_to(np.asarray(valor, dtype=np.float64), (n,))
+
+
+def _evaluar_lote(catalogo, nombres):
+    """
+    Evalúa escenarios que definen los mismos parámetros como un solo TESBatch.
+
+    Retorna:
+    - tuple: ({columna de COLUMNAS_RESULTADO: np.ndarray}, mensaje de los datos faltantes, '' si no falta ninguno).
+    """
+    from Flujo_de_caja2 import calcular_flujo_de_caja_portafolio
+    from tasa_interna_retorno import calcular_tir_filas
+
+    lote = catalogo.lote(nombres)
+    n = len(nombres)
+    resultados = dict(lote.capex_all(), opex=lote.opex(), LCOS=lote.LCOS())
+    faltantes = [f"{nombre}: {valor}" for nombre, valor in resultados.items() if isinstance(valor, str)]
+    columnas = {nombre: _columna(valor, n) for nombre, valor in resultados.items()}
+    columnas['VAN'] = columnas['TIR'] = np.full(n, np.nan)
+
+    if catalogo.flujo_de_caja:
+        argumentos = {}
+        for parametro in PARAMETROS_FLUJO:
+            valor = catalogo.flujo_de_caja[parametro]
+            if isinstance(valor, str):
+                # Igual que en montecarlo, el valor es el resultado de un método del TES para cada escenario
+                valor = columnas[valor] if valor in columnas else _columna(getattr(lote, valor)(), n)
+                if parametro not in _PARAMETROS_POR_PLANTA:
+                    valor = valor[:, None]
+            argumentos[parametro] = valor
+        flujo = calcular_flujo_de_caja_portafolio(**argumentos, columnas=['Flujo de Caja Libre', 'VAN'])
+        columnas['VAN'] = flujo['VAN'][:, -1]
+        tir = np.full(n, np.nan)
+        finitos = np.isfinite(flujo['Flujo de Caja Libre']).all(axis=1)
+        if finitos.any():
+            tir[finitos] = calcular_tir_filas(flujo['Flujo de Caja Libre'][finitos])
+        columnas['TIR'] = tir
+    return columnas, '; '.join(faltantes)
+
+
+def evaluar_escenarios(ruta, nombres):
+    """
+    Evalúa un grupo de escenarios de un catálogo.
+
+    Se calculan los cinco CAPEX, el OPEX y el LCOS y, si el catálogo tiene una tabla 'flujo_de_caja', el VAN final
+    y la TIR del flujo de caja de cada escenario como un portafolio. Los escenarios que definen los mismos
+    parámetros se evalúan juntos como un TESBatch (Catalogo.grupos); si a un escenario le faltan datos para un
+    método, ese valor queda en nan y la columna 'faltantes' indica qué datos faltan.
+
+    Parámetros:
+    - ruta (str): Archivo del catálogo.
+    - nombres (list of str): Escenarios a evaluar.
+
+    Retorna:
+    - list of tuples: Una fila por escenario, con los valores de COLUMNAS_RESULTADO, en el orden de `nombres`.
+    """
+    catalogo = _catalogo(ruta)
+    archivo = os.path.basename(ruta)
+    filas = {}
+    for grupo in catalogo.grupos(nombres):
+        columnas, faltantes = _evaluar_lote(catalogo, grupo)
+        valores = [columnas[nombre].tolist() for nombre in COLUMNAS_RESULTADO[2:-1]]
+        filas.update((nombre, (archivo, nombre, *fila, faltantes)) for nombre, *fila in zip(grupo, *valores))
+    return [filas[nombre] for nombre in nombres]
+
+
+class EscritorCSV:
+    def __init__(self, ruta):
+        """
+        Escribe las filas de resultados en un CSV a medida que llegan; cada bloque queda en disco al escribirse.
+        """
+        self.archivo = open(ruta, 'w', newline='', encoding='utf-8')
+        self.escritor = csv.writer(self.archivo)
+        self.escritor.writerow(COLUMNAS_RESULTADO)
+
+    def escribir(self, filas):
+        self.escritor.writerows(filas)
+        self.archivo.flush()
+
+    def cerrar(self):
+        self.archivo.close()
+
+
+class EscritorParquet:
+    def __init__(self, ruta):
+        """
+        Escribe las filas de resultados en un Parquet, un grupo de filas por bloque. pyarrow se importa solo aquí.
+        """
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        self.pa = pa
+        self.esquema = pa.schema([(nombre, pa.string() if nombre in ('archivo', 'escenario', 'faltantes') else pa.float64()) for nombre in COLUMNAS_RESULTADO])
+        self.escritor = pq.ParquetWriter(ruta, self.esquema)
+
+    def escribir(self, filas):
+        columnas = list(zip(*filas))
+        self.escritor.write_table(self.pa.Table.from_arrays([self.pa.array(columna, tipo.type) for columna, tipo in zip(columnas, self.esquema)], schema=self.esquema))
+
+    def cerrar(self):
+        self.escritor.close()
+
+
+class Progreso:
+    def __init__(self, total, salida=sys.stderr):
+        """
+        Muestra en una línea el avance, la tasa y el tiempo restante estimado.
+        """
+        self.total = total
+        self.hechos = 0
+        self.salida = salida
+        self.inicio = time.perf_counter()
+
+    def avanzar(self, n):
+        self.hechos += n
+        transcurrido = time.perf_counter() - self.inicio
+        tasa = self.hechos / transcurrido if transcurrido > 0 else 0.0
+        restante = (self.total - self.hechos) / tasa if tasa > 0 else 0.0
+        self.salida.write(f"\r{self.hechos}/{self.total} escenarios ({self.hechos / max(self.total, 1):.0%}), {tasa:,.0f}/s, quedan ~{restante:.0f} s ")
+        self.salida.flush()
+
+    def terminar(self):
+        self.salida.write(f"\n{self.hechos} escenarios en {time.perf_counter() - self.inicio:.2f} s\n")
+
+
+def ejecutar(directorio, salida, procesos=None, tamano_bloque=256, mostrar_progreso=True):
+    """
+    Evalúa todos los escenarios de los catálogos de un directorio en paralelo y escribe una fila por escenario.
+
+    Cada catálogo se divide en bloques de `tamano_bloque` escenarios que se evalúan como un TESBatch en un conjunto de
+    procesos. Las filas de cada bloque se escriben apenas el bloque termina, en el orden en que terminan; solo el
+    proceso principal escribe, así que los bloques no se esperan ni se mezclan.
+
+    Parámetros:
+    - directorio (str): Directorio con los catálogos (ver catalogo.py).
+    - salida (str): Archivo de salida, .csv o .parquet (este último requiere pyarrow).
+    - procesos (int, opcional): Número de procesos. Por defecto, los núcleos disponibles. Con 1 se evalúa en el proceso actual.
+    - tamano_bloque (int): Escenarios por bloque.
+    - mostrar_progreso (bool): Si es True, muestra el avance en stderr.
+
+    Retorna:
+    - list: Errores como tuplas (archivo, mensaje); vacía si todos los bloques se evaluaron.
+    """
+    rutas = buscar_catalogos(directorio)
+    if not rutas:
+        raise ValueError(f"No hay catálogos {EXTENSIONES} en '{directorio}'.")
+    tareas, errores = [], []
+    for ruta in rutas:
+        try:
+            nombres = _catalogo(ruta).nombres
+        except (OSError, ValueError) as error:
+            # Un catálogo inválido no detiene a los demás
+            errores.append((ruta, f"{type(error).__name__}: {error}"))
+            continue
+        tareas.extend((ruta, nombres[inicio:inicio + tamano_bloque]) for inicio in range(0, len(nombres), tamano_bloque))
+
+    escritor = EscritorParquet(salida) if salida.endswith('.parquet') else EscritorCSV(salida)
+    progreso = Progreso(sum(len(nombres) for _, nombres in tareas)) if mostrar_progreso else None
+
+    def registrar(ruta, nombres, obtener):
+        try:
+            escritor.escribir(obtener())
+        except Exception as error:
+            errores.append((ruta, f"{type(error).__name__}: {error}"))
+        if progreso is not None:
+            progreso.avanzar(len(nombres))
+
+    try:
+        procesos = procesos or procesos_disponibles()
+        if procesos == 1:
+            for ruta, nombres in tareas:
+                registrar(ruta, nombres, lambda: evaluar_escenarios(ruta, nombres))
+        else:
+            from concurrent.futures import ProcessPoolExecutor, as_completed
+
+            with ProcessPoolExecutor(max_workers=max(1, min(procesos, len(tareas)))) as executor:
+                futuros = {executor.submit(evaluar_escenarios, ruta, nombres): (ruta, nombres) for ruta, nombres in tareas}
+                for futuro in as_completed(futuros):
+                    registrar(*futuros[futuro], futuro.result)
+    finally:
+        escritor.cerrar()
+        if progreso is not None:
+            progreso.terminar()
+    return errores
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Evalúa en paralelo los catálogos de escenarios de un directorio.")
+    parser.add_argument('directorio', help="Directorio con catálogos .toml o .json.")
+    parser.add_argument('--salida', default='resultados_escenarios.csv', help="Archivo de salida .csv o .parquet.")
+    parser.add_argument('--procesos', type=int, default=None, help="Número de procesos (por defecto, los núcleos disponibles).")
+    parser.add_argument('--bloque', type=int, default=256, help="Escenarios por bloque.")
+    parser.add_argument('--silencioso', action='store_true', help="No mostrar el avance.")
+    argumentos = parser.parse_args()
+
+    errores = ejecutar(argumentos.directorio, argumentos.salida, argumentos.procesos, argumentos.bloque, not argumentos.silencioso)
+    for ruta, mensaje in errores:
+        print(f"{ruta}: {mensaje}", file=sys.stderr)
+    sys.exit(1 if errores else 0)
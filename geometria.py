@@ -0,0 +1,197 @@
+import numpy as np
+
+from TES_batch import TESBatch
+from TES_object import TES
+
+
+def volumenes_cilindro(altura, radio, espesor_acero, espesor_aislamiento, numero_estanques=1):
+    """
+    Calcula los volúmenes de acero, aislamiento y medio de almacenamiento de estanques cilíndricos.
+
+    El manto y las dos tapas de acero, y el aislamiento que los rodea, se cuentan para cada estanque
+    (mismas fórmulas que el estanque de aceite de Orsini). El medio es el volumen interior de un estanque:
+    en un sistema de dos estanques el medio ocupa uno a la vez.
+
+    Parámetros:
+    - altura, radio, espesor_acero, espesor_aislamiento (float o np.ndarray): Dimensiones en metros.
+    - numero_estanques (int): Número de estanques.
+
+    Retorna:
+    - dict: {'acero', 'aislamiento', 'medio'} en m³, con la forma de las dimensiones.
+    """
+    return {
+        'acero': numero_estanques * np.pi * (altura * ((radio + espesor_acero) ** 2 - radio ** 2) + 2 * espesor_acero * radio ** 2),
+        'aislamiento': numero_estanques * np.pi * (altura * ((radio + espesor_acero + espesor_aislamiento) ** 2 - (radio + espesor_acero) ** 2)
+                                                   + 2 * espesor_aislamiento * radio ** 2),
+        'medio': np.pi * altura * radio ** 2,
+    }
+
+
+def jacobiano_cilindro(altura, radio, espesor_acero, espesor_aislamiento, numero_estanques=1):
+    """
+    Derivadas de los volúmenes de volumenes_cilindro respecto de cada dimensión.
+
+    Retorna:
+    - dict: {'acero' | 'aislamiento' | 'medio': {dimensión: derivada}}.
+    """
+    n = numero_estanques * np.pi
+    ts, ti = espesor_acero, espesor_aislamiento
+    cero = np.zeros_like(np.asarray(altura * radio, dtype=np.float64))
+    return {
+        'acero': {
+            'altura': n * (2 * radio * ts + ts ** 2),
+            'radio': n * (2 * altura * ts + 4 * ts * radio),
+            'espesor_acero': n * (2 * altura * (radio + ts) + 2 * radio ** 2),
+            'espesor_aislamiento': cero,
+        },
+        'aislamiento': {
+            'altura': n * (2 * (radio + ts) * ti + ti ** 2),
+            'radio': n * (2 * altura * ti + 4 * ti * radio),
+            'espesor_acero': n * 2 * altura * ti,
+            'espesor_aislamiento': n * (2 * altura * (radio + ts + ti) + 2 * radio ** 2),
+        },
+        'medio': {
+            'altura': np.pi * radio ** 2,
+            'radio': 2 * np.pi * altura * radio,
+            'espesor_acero': cero,
+            'espesor_aislamiento': cero,
+        },
+    }
+
+
+def volumenes_esfera(radio, espesor_acero, espesor_aislamiento, numero_estanques=1):
+    """
+    Calcula los volúmenes de acero, aislamiento y medio de almacenamiento de estanques esféricos.
+
+    Parámetros:
+    - radio, espesor_acero, espesor_aislamiento (float o np.ndarray): Dimensiones en metros.
+    - numero_estanques (int): Número de estanques; el medio es el volumen interior de uno.
+
+    Retorna:
+    - dict: {'acero', 'aislamiento', 'medio'} en m³.
+    """
+    exterior_acero = radio + espesor_acero
+    exterior_aislamiento = exterior_acero + espesor_aislamiento
+    return {
+        'acero': numero_estanques * 4 / 3 * np.pi * (exterior_acero ** 3 - radio ** 3),
+        'aislamiento': numero_estanques * 4 / 3 * np.pi * (exterior_aislamiento ** 3 - exterior_acero ** 3),
+        'medio': 4 / 3 * np.pi * radio ** 3,
+    }
+
+
+def jacobiano_esfera(radio, espesor_acero, espesor_aislamiento, numero_estanques=1):
+    """
+    Derivadas de los volúmenes de volumenes_esfera respecto de cada dimensión.
+
+    Retorna:
+    - dict: {'acero' | 'aislamiento' | 'medio': {dimensión: derivada}}.
+    """
+    n = numero_estanques * 4 * np.pi
+    exterior_acero = radio + espesor_acero
+    exterior_aislamiento = exterior_acero + espesor_aislamiento
+    cero = np.zeros_like(np.asarray(radio, dtype=np.float64))
+    return {
+        'acero': {
+            'radio': n * (exterior_acero ** 2 - radio ** 2),
+            'espesor_acero': n * exterior_acero ** 2,
+            'espesor_aislamiento': cero,
+        },
+        'aislamiento': {
+            'radio': n * (exterior_aislamiento ** 2 - exterior_acero ** 2),
+            'espesor_acero': n * (exterior_aislamiento ** 2 - exterior_acero ** 2),
+            'espesor_aislamiento': n * exterior_aislamiento ** 2,
+        },
+        'medio': {
+            'radio': 4 * np.pi * radio ** 2,
+            'espesor_acero': cero,
+            'espesor_aislamiento': cero,
+        },
+    }
+
+
+def volumenes_lecho_empacado(altura, radio, espesor_acero, espesor_aislamiento, porosidad, numero_estanques=1):
+    """
+    Calcula los volúmenes de un lecho empacado en un estanque cilíndrico.
+
+    El acero y el aislamiento son los de volumenes_cilindro; el medio es el volumen de sólido del lecho,
+    (1 - porosidad) veces el volumen interior (el valor de `volume_tes_material` en los estudios de lecho de rocas).
+
+    Parámetros:
+    - altura, radio, espesor_acero, espesor_aislamiento (float o np.ndarray): Dimensiones en metros.
+    - porosidad (float o np.ndarray): Fracción de vacío del lecho.
+    - numero_estanques (int): Número de estanques.
+
+    Retorna:
+    - dict: {'acero', 'aislamiento', 'medio'} en m³.
+    """
+    volumenes = volumenes_cilindro(altura, radio, espesor_acero, espesor_aislamiento, numero_estanques)
+    volumenes['medio'] = (1 - porosidad) * volumenes['medio']
+    return volumenes
+
+
+def jacobiano_lecho_empacado(altura, radio, espesor_acero, espesor_aislamiento, porosidad, numero_estanques=1):
+    """
+    Derivadas de los volúmenes de volumenes_lecho_empacado respecto de cada dimensión y de la porosidad.
+
+    Retorna:
+    - dict: {'acero' | 'aislamiento' | 'medio': {dimensión: derivada}}.
+    """
+    jacobiano = jacobiano_cilindro(altura, radio, espesor_acero, espesor_aislamiento, numero_estanques)
+    cero = jacobiano['medio']['espesor_acero']
+    jacobiano['medio'] = {dimension: (1 - porosidad) * derivada for dimension, derivada in jacobiano['medio'].items()}
+    jacobiano['acero']['porosidad'] = cero
+    jacobiano['aislamiento']['porosidad'] = cero
+    jacobiano['medio']['porosidad'] = -np.pi * altura * radio ** 2
+    return jacobiano
+
+
+def _parametros_geometria(volumenes, components, componente_medio, parametro_medio, kwargs):
+    """
+    Arma los argumentos de TES o TESBatch a partir de los volúmenes de una geometría.
+    """
+    parametros = dict(kwargs, iron_volume=volumenes['acero'], insulation_volume=volumenes['aislamiento'])
+    if parametro_medio is not None:
+        parametros[parametro_medio] = volumenes['medio']
+    if componente_medio is not None:
+        nombre, precio = componente_medio
+        medio = np.asarray(volumenes['medio'], dtype=np.float64)
+        if medio.ndim == 0:
+            components = list(components) + [(nombre, precio, medio[()])]
+        else:
+            components = [list(components) + [(nombre, precio, cantidad)] for cantidad in medio.tolist()]
+    return parametros, components
+
+
+def tes_desde_geometria(volumenes, price_per_cubic_meter_iron, price_per_cubic_meter_insulation, components, componente_medio=None, parametro_medio=None, **kwargs):
+    """
+    Crea un objeto TES con los volúmenes de acero y aislamiento de una geometría.
+
+    Parámetros:
+    - volumenes (dict): Resultado de volumenes_cilindro, volumenes_esfera o volumenes_lecho_empacado (escalares).
+    - price_per_cubic_meter_iron, price_per_cubic_meter_insulation (float): Precios por metro cúbico.
+    - components (list of tuples): Componentes del TES, sin el medio de almacenamiento.
+    - componente_medio (tuple, opcional): (nombre, precio por m³) del medio; se agrega como componente con cantidad igual al volumen del medio.
+    - parametro_medio (str, opcional): Parámetro que recibe el volumen del medio, por ejemplo 'volume_tes_material'.
+    - kwargs: Parámetros adicionales (ver TES.set_additional_parameters).
+
+    Retorna:
+    - TES: El diseño construido.
+    """
+    parametros, components = _parametros_geometria(volumenes, components, componente_medio, parametro_medio, kwargs)
+    tes = TES(parametros.pop('iron_volume'), parametros.pop('insulation_volume'), price_per_cubic_meter_iron, price_per_cubic_meter_insulation, components)
+    tes.set_additional_parameters(**parametros)
+    return tes
+
+
+def lote_desde_geometria(volumenes, price_per_cubic_meter_iron, price_per_cubic_meter_insulation, components, componente_medio=None, parametro_medio=None, **kwargs):
+    """
+    Crea un TESBatch con una fila por cada juego de dimensiones de una geometría.
+
+    Los parámetros son los de tes_desde_geometria, con `volumenes` calculado para arreglos de dimensiones.
+
+    Retorna:
+    - TESBatch: El lote construido.
+    """
+    parametros, components = _parametros_geometria(volumenes, components, componente_medio, parametro_medio, kwargs)
+    return TESBatch(price_per_cubic_meter_iron=price_per_cubic_meter_iron, price_per_cubic_meter_insulation=price_per_cubic_meter_insulation,
+                    components=components, **parametros)
@@ -0,0 +1,190 @@
+import functools
+import importlib
+import inspect
+import json
+import sys
+import threading
+import time
+
+# Clases cuyos métodos públicos se instrumentan: (módulo, clase)
+CLASES = (('TES_object', 'TES'), ('TES_batch', 'TESBatch'), ('Flujo_de_caja_columnar', 'ResultadoFlujoDeCaja'))
+# Funciones instrumentadas: (módulo donde se definen, nombre, etiqueta)
+FUNCIONES = (
+    ('Flujo_de_caja', 'calcular_flujo_de_caja', 'Flujo_de_caja.calcular_flujo_de_caja'),
+    ('Flujo_de_caja2', 'calcular_flujo_de_caja', 'Flujo_de_caja2.calcular_flujo_de_caja'),
+    ('Flujo_de_caja2', 'calcular_flujo_de_caja_portafolio', 'Flujo_de_caja2.calcular_flujo_de_caja_portafolio'),
+    ('Flujo_de_caja_columnar', 'calcular_columnas', 'calcular_columnas'),
+    ('Flujo_de_caja_columnar', 'tir_acumulada', 'tir_acumulada'),
+    ('tasa_interna_retorno', 'calcular_tir', 'calcular_tir'),
+    ('tasa_interna_retorno', 'calcular_tir_filas', 'calcular_tir_filas'),
+    ('tasa_interna_retorno', '_irr', 'npf.irr'),
+)
+
+
+class Instrumentacion:
+    def __init__(self):
+        """
+        Registro opcional de llamadas a los métodos de TES, TESBatch y del flujo de caja.
+
+        Mientras está activa (activar() o un bloque `with`), reemplaza esos métodos y funciones por envolturas que
+        cuentan llamadas, tiempo acumulado, tiempo propio (sin las llamadas instrumentadas internas) y aciertos de
+        la caché de TES. Al desactivarla se restauran los originales, de modo que sin instrumentación no hay
+        ningún costo adicional. Solo registra llamadas del hilo que la activó; las de otros hilos se ejecutan sin medir.
+        """
+        self.estadisticas = {}
+        self.pilas = {}
+        self._local = threading.local()
+        self._hilo = None
+        self._originales = []
+
+    def __enter__(self):
+        self.activar()
+        return self
+
+    def __exit__(self, *exc):
+        self.desactivar()
+
+    @property
+    def activa(self):
+        return bool(self._originales)
+
+    def activar(self):
+        """
+        Instala las envolturas sobre las clases y funciones de CLASES y FUNCIONES.
+        """
+        if self.activa:
+            raise RuntimeError("La instrumentación ya está activa.")
+        self._hilo = threading.get_ident()
+        self._local.pila = []
+        try:
+            for modulo, nombre_clase in CLASES:
+                clase = getattr(importlib.import_module(modulo), nombre_clase)
+                memorizados = getattr(clase, '_DEPENDENCIES', {})
+                for nombre, metodo in list(vars(clase).items()):
+                    if not nombre.startswith('_') and inspect.isfunction(metodo):
+                        envoltura = self._envolver(metodo, f"{nombre_clase}.{nombre}", nombre if nombre in memorizados else None)
+                        self._reemplazar(clase, nombre, metodo, envoltura)
+            for modulo, nombre, etiqueta in FUNCIONES:
+                original = getattr(importlib.import_module(modulo), nombre)
+                envoltura = self._envolver(original, etiqueta)
+                # La función también se reemplaza en los módulos que la importaron por nombre
+                for cargado in list(sys.modules.values()):
+                    if getattr(cargado, '__dict__', {}).get(nombre) is original:
+                        self._reemplazar(cargado, nombre, original, envoltura)
+        except BaseException:
+            # Si falla a medio camino (por ejemplo, al importar un módulo), se deshacen los reemplazos ya hechos
+            self.desactivar()
+            raise
+
+    def desactivar(self):
+        """
+        Restaura los métodos y funciones originales. Las estadísticas se conservan.
+        """
+        for objeto, nombre, original in reversed(self._originales):
+            setattr(objeto, nombre, original)
+        self._originales = []
+        self._hilo = None
+
+    def reiniciar(self):
+        """
+        Borra las estadísticas acumuladas.
+        """
+        self.estadisticas.clear()
+        self.pilas.clear()
+
+    def _reemplazar(self, objeto, nombre, original, envoltura):
+        self._originales.append((objeto, nombre, original))
+        setattr(objeto, nombre, envoltura)
+
+    def _envolver(self, funcion, etiqueta, metodo_memorizado=None):
+        """
+        Crea la envoltura que mide una función. Si `metodo_memorizado` es el nombre de un método de TES con caché,
+        se cuenta como acierto cada llamada cuyo resultado ya estaba en la caché del objeto.
+        """
+        estadisticas = self.estadisticas
+        pilas = self.pilas
+        local = self._local
+
+        @functools.wraps(funcion)
+        def envoltura(*args, **kwargs):
+            if threading.get_ident() != self._hilo:
+                return funcion(*args, **kwargs)
+            pila = local.pila
+            registro = estadisticas.get(etiqueta)
+            if registro is None:
+                registro = estadisticas[etiqueta] = {'llamadas': 0, 'segundos': 0.0, 'segundos_propios': 0.0,
+                                                     'aciertos_cache': 0 if metodo_memorizado is not None else None}
+            registro['llamadas'] += 1
+            if metodo_memorizado is not None and metodo_memorizado in (getattr(args[0], '_cache', None) or ()):
+                registro['aciertos_cache'] += 1
+
+            marco = [etiqueta, 0.0]
+            pila.append(marco)
+            inicio = time.perf_counter()
+            try:
+                return funcion(*args, **kwargs)
+            finally:
+                duracion = time.perf_counter() - inicio
+                pila.pop()
+                propio = duracion - marco[1]
+                registro['segundos'] += duracion
+                registro['segundos_propios'] += propio
+                ruta = ';'.join([m[0] for m in pila] + [etiqueta])
+                pilas[ruta] = pilas.get(ruta, 0.0) + propio
+                if pila:
+                    pila[-1][1] += duracion
+        return envoltura
+
+    def resumen(self):
+        """
+        Retorna las estadísticas por función, ordenadas de mayor a menor tiempo acumulado.
+
+        Retorna:
+        - dict: {etiqueta: {'llamadas', 'segundos', 'segundos_propios', 'aciertos_cache', 'tasa_aciertos_cache'}}.
+          Los aciertos de caché son None en las funciones sin caché.
+        """
+        filas = sorted(self.estadisticas.items(), key=lambda item: item[1]['segundos'], reverse=True)
+        return {etiqueta: dict(registro, tasa_aciertos_cache=None if registro['aciertos_cache'] is None else registro['aciertos_cache'] / registro['llamadas'])
+                for etiqueta, registro in filas}
+
+    def a_json(self, ruta=None):
+        """
+        Exporta el resumen y las pilas en JSON.
+
+        Parámetros:
+        - ruta (str, opcional): Archivo de salida. Si no se entrega, solo se retorna el texto.
+
+        Retorna:
+        - str: El JSON generado.
+        """
+        texto = json.dumps({'funciones': self.resumen(), 'pilas': self.pilas}, indent=2, ensure_ascii=False)
+        if ruta is not None:
+            with open(ruta, 'w', encoding='utf-8') as archivo:
+                archivo.write(texto)
+        return texto
+
+    def a_pilas_colapsadas(self, ruta=None):
+        """
+        Exporta las pilas en formato colapsado ('a;b;c valor' por línea), compatible con flamegraph.pl y speedscope.
+        El valor es el tiempo propio de cada pila en microsegundos.
+
+        Parámetros:
+        - ruta (str, opcional): Archivo de salida. Si no se entrega, solo se retorna el texto.
+
+        Retorna:
+        - str: Las pilas colapsadas.
+        """
+        texto = ''.join(f"{ruta_pila} {round(segundos * 1e6)}\n" for ruta_pila, segundos in sorted(self.pilas.items()))
+        if ruta is not None:
+            with open(ruta, 'w', encoding='utf-8') as archivo:
+                archivo.write(texto)
+        return texto
+
+    def imprimir(self):
+        """
+        Imprime una tabla con las estadísticas por función.
+        """
+        print(f"{'Función':<45} {'Llamadas':>10} {'Total [ms]':>12} {'Propio [ms]':>12} {'Caché':>7}")
+        for etiqueta, registro in self.resumen().items():
+            tasa = '-' if registro['tasa_aciertos_cache'] is None else f"{registro['tasa_aciertos_cache']:.1%}"
+            print(f"{etiqueta:<45} {registro['llamadas']:>10} {registro['segundos'] * 1e3:>12.3f} {registro['segundos_propios'] * 1e3:>12.3f} {tasa:>7}")
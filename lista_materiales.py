@@ -0,0 +1,108 @@
+import numpy as np
+
+# Categoría de los componentes que no tienen una
+CATEGORIA_GENERAL = 'general'
+
+
+class ListaMateriales:
+    def __init__(self, nombres, precios, cantidades, categorias=None):
+        """
+        Lista de materiales (BOM) guardada como arreglos de NumPy, con una categoría por ítem.
+
+        Se puede usar como `components` de TES y TESBatch: al iterarla entrega tuplas (nombre, precio, cantidad) y el
+        costo total se calcula una sola vez. Los arreglos son de solo lectura, de modo que una misma lista se puede
+        compartir entre muchos diseños sin copiarla.
+
+        Parámetros:
+        - nombres (array_like of str): Nombre de cada ítem.
+        - precios (array_like): Precio por unidad de cada ítem en dólares.
+        - cantidades (array_like): Cantidad de cada ítem.
+        - categorias (array_like of str, opcional): Categoría de cada ítem. Por defecto, CATEGORIA_GENERAL.
+        """
+        self.nombres = np.asarray(nombres, dtype=str)
+        self.precios = np.asarray(precios, dtype=np.float64)
+        self.cantidades = np.asarray(cantidades, dtype=np.float64)
+        if categorias is None:
+            categorias = np.full(len(self.nombres), CATEGORIA_GENERAL)
+        self.categorias, self.codigos = np.unique(np.asarray(categorias, dtype=str), return_inverse=True)
+        if not self.nombres.ndim == self.precios.ndim == self.cantidades.ndim == 1 or \
+                not len(self.nombres) == len(self.precios) == len(self.cantidades) == len(self.codigos):
+            raise ValueError("Los nombres, precios, cantidades y categorías deben ser listas del mismo largo.")
+        for arreglo in (self.nombres, self.precios, self.cantidades, self.categorias, self.codigos):
+            arreglo.flags.writeable = False
+        self._costo = None
+
+    @classmethod
+    def desde_componentes(cls, components, categorias=None):
+        """
+        Crea la lista de materiales desde una lista de tuplas (nombre, precio, cantidad) o (nombre, precio, cantidad, categoría).
+
+        Parámetros:
+        - components (list of tuples): Componentes en el formato de TES.
+        - categorias (dict, opcional): {nombre del ítem: categoría}, para los componentes sin categoría propia.
+
+        Retorna:
+        - ListaMateriales: La lista de materiales.
+        """
+        categorias = categorias or {}
+        filas = [tuple(componente) for componente in components]
+        return cls([fila[0] for fila in filas], [fila[1] for fila in filas], [fila[2] for fila in filas],
+                   [fila[3] if len(fila) > 3 else categorias.get(fila[0], CATEGORIA_GENERAL) for fila in filas])
+
+    def __len__(self):
+        return len(self.nombres)
+
+    def __iter__(self):
+        return zip(self.nombres.tolist(), self.precios.tolist(), self.cantidades.tolist())
+
+    def __getitem__(self, indice):
+        return self.nombres[indice].item(), self.precios[indice].item(), self.cantidades[indice].item()
+
+    def costos(self, cantidades=None):
+        """
+        Costo de cada ítem (precio × cantidad).
+
+        Parámetros:
+        - cantidades (array_like, opcional): Cantidades (ítems,) o por diseño (diseños × ítems) que reemplazan a las
+          de la lista. Los precios y categorías se comparten.
+
+        Retorna:
+        - np.ndarray: Costos con la forma de las cantidades.
+        """
+        return self.precios * (self.cantidades if cantidades is None else np.asarray(cantidades, dtype=np.float64))
+
+    def costo_total(self, cantidades=None):
+        """
+        Costo total de la lista de materiales. Sin `cantidades`, se calcula una vez y se guarda.
+
+        Parámetros:
+        - cantidades (array_like, opcional): Como en costos; con una matriz (diseños × ítems) se obtiene un total por diseño.
+
+        Retorna:
+        - float o np.ndarray: El costo total.
+        """
+        if cantidades is not None:
+            return np.asarray(cantidades, dtype=np.float64) @ self.precios
+        if self._costo is None:
+            # Misma suma en orden que la de una lista de tuplas en TES, para obtener exactamente el mismo costo
+            self._costo = sum(self.costos().tolist())
+        return self._costo
+
+    def subtotales(self, cantidades=None):
+        """
+        Costo por categoría, en una sola pasada sobre los ítems.
+
+        Parámetros:
+        - cantidades (array_like, opcional): Como en costos.
+
+        Retorna:
+        - dict o np.ndarray: {categoría: subtotal} para las cantidades de la lista (o un vector de cantidades); con una
+          matriz (diseños × ítems), una matriz (diseños × categorías) en el orden de `self.categorias`.
+        """
+        costos = self.costos(cantidades)
+        if costos.ndim == 1:
+            return dict(zip(self.categorias.tolist(), np.bincount(self.codigos, weights=costos, minlength=len(self.categorias)).tolist()))
+        # Suma por categoría de cada fila: columnas desplazadas en len(categorias) por diseño
+        disenos = costos.shape[0]
+        codigos = self.codigos + len(self.categorias) * np.arange(disenos)[:, None]
+        return np.bincount(codigos.ravel(), weights=costos.ravel(), minlength=disenos * len(self.categorias)).reshape(disenos, len(self.categorias))
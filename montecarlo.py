@@ -0,0 +1,341 @@
+import warnings
+
+import numpy as np
+
+from TES_batch import TESBatch
+from TES_object import TES
+from anualidad import factores_anualidad
+from Flujo_de_caja2 import PARAMETROS_FLUJO
+
+# Número de muestras de cada flujo de números aleatorios. Los bloques de evaluación se arman con estos tramos, por lo
+# que las muestras no dependen del tamaño de bloque ni del número de procesos
+MUESTRAS_POR_TRAMO = 8192
+
+
+class EstadisticaStreaming:
+    def __init__(self, minimo, maximo, n_bins=2048):
+        """
+        Acumula estadísticas de una métrica por bloques en memoria acotada.
+
+        Guarda un histograma de ancho fijo entre `minimo` y `maximo` (más conteos bajo y sobre el rango),
+        el mínimo y máximo observados, y la media y varianza con el método de Welford/Chan.
+
+        Parámetros:
+        - minimo (float): Límite inferior del histograma.
+        - maximo (float): Límite superior del histograma.
+        - n_bins (int): Número de intervalos del histograma.
+        """
+        self.bordes = np.linspace(minimo, maximo, n_bins + 1)
+        self.conteos = np.zeros(n_bins, dtype=np.int64)
+        self.bajo_rango = 0
+        self.sobre_rango = 0
+        self.nulos = 0
+        self.n = 0
+        self.media = 0.0
+        self.m2 = 0.0
+        self.minimo = np.inf
+        self.maximo = -np.inf
+
+    def agregar(self, valores):
+        """
+        Agrega un bloque de valores a las estadísticas.
+
+        Parámetros:
+        - valores (np.ndarray): Valores del bloque.
+        """
+        valores = np.asarray(valores, dtype=np.float64).ravel()
+        finitos = np.isfinite(valores)
+        self.nulos += int(valores.size - np.count_nonzero(finitos))
+        valores = valores[finitos]
+        if valores.size == 0:
+            return
+
+        n_bins = len(self.conteos)
+        inferior, superior = self.bordes[0], self.bordes[-1]
+        indices = np.floor((valores - inferior) / (superior - inferior) * n_bins).astype(np.int64)
+        indices[valores == superior] = n_bins - 1
+        self.bajo_rango += int(np.count_nonzero(indices < 0))
+        self.sobre_rango += int(np.count_nonzero(indices >= n_bins))
+        dentro = (indices >= 0) & (indices < n_bins)
+        self.conteos += np.bincount(indices[dentro], minlength=n_bins)
+
+        bloque = EstadisticaStreaming.__new__(EstadisticaStreaming)
+        bloque.n = valores.size
+        bloque.media = float(valores.mean())
+        bloque.m2 = float(((valores - bloque.media) ** 2).sum())
+        self._combinar_momentos(bloque)
+        self.minimo = min(self.minimo, float(valores.min()))
+        self.maximo = max(self.maximo, float(valores.max()))
+
+    def _combinar_momentos(self, otra):
+        """
+        Combina la media y la suma de cuadrados de otra estadística (fórmula de Chan).
+        """
+        n = self.n + otra.n
+        if n == 0:
+            return
+        delta = otra.media - self.media
+        self.media += delta * otra.n / n
+        self.m2 += otra.m2 + delta ** 2 * self.n * otra.n / n
+        self.n = n
+
+    def combinar(self, otra):
+        """
+        Combina las estadísticas de otro bloque o proceso con el mismo histograma.
+
+        Parámetros:
+        - otra (EstadisticaStreaming): Estadística a combinar.
+        """
+        if not np.array_equal(self.bordes, otra.bordes):
+            raise ValueError("Solo se pueden combinar estadísticas con los mismos bordes de histograma.")
+        self.conteos += otra.conteos
+        self.bajo_rango += otra.bajo_rango
+        self.sobre_rango += otra.sobre_rango
+        self.nulos += otra.nulos
+        self._combinar_momentos(otra)
+        self.minimo = min(self.minimo, otra.minimo)
+        self.maximo = max(self.maximo, otra.maximo)
+
+    @property
+    def fuera_de_rango(self):
+        """
+        Número de valores que quedaron fuera del histograma; en esa zona los cuantiles solo se interpolan entre el
+        borde y el mínimo o máximo observado.
+        """
+        return self.bajo_rango + self.sobre_rango
+
+    @property
+    def desviacion(self):
+        """
+        Desviación estándar muestral de los valores agregados.
+        """
+        return np.sqrt(self.m2 / (self.n - 1)) if self.n > 1 else np.nan
+
+    def cuantil(self, q):
+        """
+        Estima el cuantil `q` interpolando linealmente dentro del histograma.
+
+        Los valores fuera del rango se reparten uniformemente entre el mínimo (o máximo) observado y el borde del histograma.
+
+        Parámetros:
+        - q (float): Cuantil entre 0 y 1.
+
+        Retorna:
+        - float: El cuantil estimado.
+        """
+        if self.n == 0:
+            return np.nan
+        objetivo = q * self.n
+        if objetivo <= self.bajo_rango:
+            fraccion = objetivo / self.bajo_rango if self.bajo_rango else 0.0
+            return self.minimo + fraccion * (self.bordes[0] - self.minimo)
+        acumulado = self.bajo_rango + np.cumsum(self.conteos)
+        if objetivo > acumulado[-1]:
+            fraccion = (objetivo - acumulado[-1]) / self.sobre_rango
+            return self.bordes[-1] + fraccion * (self.maximo - self.bordes[-1])
+        indice = int(np.searchsorted(acumulado, objetivo))
+        anterior = acumulado[indice - 1] if indice > 0 else self.bajo_rango
+        fraccion = (objetivo - anterior) / self.conteos[indice] if self.conteos[indice] else 0.0
+        valor = self.bordes[indice] + fraccion * (self.bordes[indice + 1] - self.bordes[indice])
+        return min(max(valor, self.minimo), self.maximo)
+
+    def percentiles(self, percentiles=(10, 50, 90)):
+        """
+        Retorna un diccionario con los percentiles pedidos, por ejemplo {'P10': ..., 'P50': ..., 'P90': ...}.
+        """
+        return {f"P{p}": self.cuantil(p / 100) for p in percentiles}
+
+
+def muestrear(distribuciones, generador, n):
+    """
+    Genera `n` muestras de cada parámetro.
+
+    Parámetros:
+    - distribuciones (dict): Para cada parámetro, un valor fijo o una tupla (método, *argumentos) donde el método es el
+      nombre de un método de np.random.Generator, por ejemplo ('normal', 1630, 100) o ('triangular', 0.6, 0.7, 0.8).
+    - generador (np.random.Generator): Generador de números aleatorios.
+    - n (int): Número de muestras.
+
+    Retorna:
+    - dict: Arreglos de largo `n` por parámetro.
+    """
+    muestras = {}
+    for parametro, distribucion in distribuciones.items():
+        if isinstance(distribucion, tuple):
+            metodo, *argumentos = distribucion
+            muestras[parametro] = getattr(generador, metodo)(*argumentos, size=n)
+        else:
+            muestras[parametro] = np.full(n, distribucion, dtype=np.float64)
+    return muestras
+
+
+def muestrear_rango(distribuciones, semilla, inicio, tamano):
+    """
+    Genera las muestras `inicio`, ..., `inicio + tamano - 1` de la simulación.
+
+    La muestra i viene del tramo i // MUESTRAS_POR_TRAMO, cuyo generador es SeedSequence(semilla, spawn_key=(tramo,)),
+    así que su valor es el mismo sin importar cómo se dividan las muestras en bloques.
+
+    Parámetros:
+    - distribuciones (dict): Distribución de cada parámetro (ver muestrear).
+    - semilla (int): Semilla de la simulación.
+    - inicio (int): Índice de la primera muestra.
+    - tamano (int): Número de muestras.
+
+    Retorna:
+    - dict: Arreglos de largo `tamano` por parámetro.
+    """
+    primero, ultimo = inicio // MUESTRAS_POR_TRAMO, (inicio + tamano - 1) // MUESTRAS_POR_TRAMO
+    tramos = [muestrear(distribuciones, np.random.default_rng(np.random.SeedSequence(semilla, spawn_key=(tramo,))), MUESTRAS_POR_TRAMO)
+              for tramo in range(primero, ultimo + 1)]
+    desplazamiento = inicio - primero * MUESTRAS_POR_TRAMO
+    return {parametro: np.concatenate([tramo[parametro] for tramo in tramos])[desplazamiento:desplazamiento + tamano]
+            for parametro in distribuciones}
+
+
+def van_vectorizado(años, precio_energia, produccion_anual, subsidios, costos_om, costos_combustible, costos_capital, costos_seguro,
+                    otros_costos, inversion_inicial, tasa_impuestos, tasa_descuento):
+    """
+    Calcula el VAN final de Flujo_de_caja.calcular_flujo_de_caja para arreglos de escenarios, sin construir el DataFrame.
+
+    Con ingresos y gastos constantes el flujo operativo es igual todos los años, por lo que el VAN es
+    flujo_operativo * (1 + suma de factores de descuento de los años 1 a años-1) - inversión inicial.
+
+    Parámetros:
+    - Los mismos de Flujo_de_caja.calcular_flujo_de_caja, como escalares o arreglos que se puedan combinar.
+
+    Retorna:
+    - np.ndarray: El VAN de cada escenario.
+    """
+    ingresos = np.asarray(produccion_anual) * np.asarray(precio_energia)
+    total_gastos = np.asarray(costos_om) + costos_combustible + costos_capital + costos_seguro + otros_costos
+    ingresos_netos = ingresos + subsidios - total_gastos
+    flujo_caja_operativo = ingresos_netos - ingresos_netos * tasa_impuestos
+    return flujo_caja_operativo * (1 + factores_anualidad(tasa_descuento, np.asarray(años) - 1)) - inversion_inicial
+
+
+def _evaluar_bloque(tes, distribuciones, flujo_de_caja, metricas, inicio, tamano, semilla):
+    """
+    Evalúa las muestras `inicio`, ..., `inicio + tamano - 1` (ver muestrear_rango).
+    """
+    muestras = muestrear_rango(distribuciones, semilla, inicio, tamano)
+    columnas = {key: value for key, value in muestras.items() if key not in PARAMETROS_FLUJO}
+    lote = TESBatch.from_template(tes, tamano, **columnas)
+
+    resultados = {}
+    for metrica in metricas:
+        if metrica == 'VAN':
+            continue
+        valor = getattr(lote, metrica)()
+        if isinstance(valor, str):
+            raise ValueError(valor)
+        resultados[metrica] = valor
+
+    if 'VAN' in metricas:
+        argumentos = {}
+        for parametro in PARAMETROS_FLUJO:
+            valor = muestras[parametro] if parametro in muestras else flujo_de_caja[parametro]
+            if isinstance(valor, str):
+                # Igual que en Total.py, un parámetro del flujo puede venir de un resultado del TES (por ejemplo 'opex')
+                valor = resultados[valor] if valor in resultados else getattr(lote, valor)()
+            argumentos[parametro] = valor
+        resultados['VAN'] = van_vectorizado(**argumentos)
+    return resultados
+
+
+def _bloque_a_estadisticas(tes, distribuciones, flujo_de_caja, metricas, inicio, tamano, semilla, rangos, n_bins):
+    """
+    Evalúa un bloque y lo resume en un EstadisticaStreaming por métrica.
+    """
+    resultados = _evaluar_bloque(tes, distribuciones, flujo_de_caja, metricas, inicio, tamano, semilla)
+    estadisticas = {}
+    for metrica, valores in resultados.items():
+        estadisticas[metrica] = EstadisticaStreaming(*rangos[metrica], n_bins=n_bins)
+        estadisticas[metrica].agregar(valores)
+    return estadisticas
+
+
+def simular_montecarlo(tes, distribuciones, n_muestras, flujo_de_caja=None, metricas=None, tamano_bloque=100_000, semilla=0,
+                       procesos=1, rangos=None, n_bins=2048):
+    """
+    Simulación de Monte Carlo del LCOS (y del VAN) de un diseño TES con parámetros inciertos.
+
+    Las muestras se evalúan por bloques vectorizados con TESBatch y se resumen en histogramas, por lo que la memoria
+    no depende de `n_muestras`. Las muestras dependen solo de la semilla (ver muestrear_rango), así que los histogramas,
+    mínimos, máximos y percentiles son los mismos con cualquier tamano_bloque o número de procesos; la media y la
+    desviación pueden diferir en el último dígito con otro tamano_bloque, por el orden en que se combinan.
+
+    Parámetros:
+    - tes (TES): Diseño base con todos los parámetros necesarios.
+    - distribuciones (dict): Distribución de cada parámetro incierto (ver muestrear). Puede incluir parámetros del TES y del flujo de caja.
+    - n_muestras (int): Número total de muestras.
+    - flujo_de_caja (dict, opcional): Parámetros de Flujo_de_caja.calcular_flujo_de_caja para el VAN. Un valor string
+      ('opex', 'capex_pereira', ...) toma el resultado de ese método del TES para cada muestra.
+    - metricas (tuple, opcional): Métricas a calcular. Por defecto ('LCOS', 'VAN') si hay flujo de caja, o ('LCOS',).
+    - tamano_bloque (int): Número de muestras por bloque.
+    - semilla (int): Semilla de la simulación.
+    - procesos (int): Número de procesos. Con 1 se evalúa en el proceso actual.
+    - rangos (dict, opcional): Rango (mínimo, máximo) del histograma de cada métrica. Si falta, se estima con las
+      primeras MUESTRAS_POR_TRAMO muestras, ampliado en 50 % a cada lado. El rango no se amplía después: si quedan
+      valores fuera de él se emite una advertencia con cuántos son (ver EstadisticaStreaming.fuera_de_rango).
+    - n_bins (int): Número de intervalos de los histogramas.
+
+    Retorna:
+    - dict: Un EstadisticaStreaming por métrica, con percentiles(), media, desviacion, etc.
+    """
+    if n_muestras < 1:
+        raise ValueError("El número de muestras debe ser al menos 1.")
+    # Un nombre mal escrito generaría una columna que ningún cálculo usa
+    conocidos = set(PARAMETROS_FLUJO) | set(TES._SCHEMA) | set(tes.get_parameters())
+    desconocidos = sorted(set(distribuciones) - conocidos)
+    if desconocidos:
+        raise ValueError(f"Parámetros desconocidos en las distribuciones: {desconocidos}")
+    if metricas is None:
+        metricas = ('LCOS', 'VAN') if flujo_de_caja is not None else ('LCOS',)
+    if 'VAN' in metricas and flujo_de_caja is None:
+        raise ValueError("Se necesitan los parámetros del flujo de caja para calcular el VAN.")
+    flujo_de_caja = flujo_de_caja or {}
+
+    inicios = range(0, n_muestras, tamano_bloque)
+    tamanos = [min(tamano_bloque, n_muestras - inicio) for inicio in inicios]
+
+    # El primer bloque se evalúa aquí para fijar los rangos de los histogramas con las primeras muestras (las mismas
+    # con cualquier tamano_bloque), ampliados a cada lado
+    primero = _evaluar_bloque(tes, distribuciones, flujo_de_caja, metricas, 0, tamanos[0], semilla)
+    piloto = min(n_muestras, MUESTRAS_POR_TRAMO)
+    if tamanos[0] < piloto:
+        piloto = _evaluar_bloque(tes, distribuciones, flujo_de_caja, metricas, 0, piloto, semilla)
+    else:
+        piloto = {metrica: valores[:piloto] for metrica, valores in primero.items()}
+    rangos = dict(rangos or {})
+    for metrica, valores in piloto.items():
+        if metrica not in rangos:
+            finitos = valores[np.isfinite(valores)]
+            minimo, maximo = (float(finitos.min()), float(finitos.max())) if finitos.size else (0.0, 1.0)
+            margen = 0.5 * (maximo - minimo) or 0.5 * abs(maximo) or 1.0
+            rangos[metrica] = (minimo - margen, maximo + margen)
+
+    estadisticas = {metrica: EstadisticaStreaming(*rangos[metrica], n_bins=n_bins) for metrica in primero}
+    for metrica, valores in primero.items():
+        estadisticas[metrica].agregar(valores)
+
+    argumentos = [(tes, distribuciones, flujo_de_caja, metricas, inicios[indice], tamanos[indice], semilla, rangos, n_bins)
+                  for indice in range(1, len(tamanos))]
+    if procesos == 1 or not argumentos:
+        bloques = (_bloque_a_estadisticas(*args) for args in argumentos)
+        for bloque in bloques:
+            for metrica, estadistica in bloque.items():
+                estadisticas[metrica].combinar(estadistica)
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=procesos) as executor:
+            # map entrega los bloques en orden, de modo que la combinación es determinista
+            for bloque in executor.map(_bloque_a_estadisticas, *zip(*argumentos)):
+                for metrica, estadistica in bloque.items():
+                    estadisticas[metrica].combinar(estadistica)
+    for metrica, estadistica in estadisticas.items():
+        if estadistica.fuera_de_rango:
+            warnings.warn(f"{metrica}: {estadistica.fuera_de_rango} de {estadistica.n} valores quedaron fuera del rango del histograma "
+                          f"{tuple(rangos[metrica])}; los cuantiles en esas colas son aproximados. Use `rangos` para ampliarlo.", stacklevel=2)
+    return estadisticas
@@ -0,0 +1,187 @@
+import numpy as np
+
+from anualidad import factor_anualidad
+from geometria import jacobiano_cilindro, volumenes_cilindro
+from perfiles_anuales import PARAMETROS_ANUALES, factores_descuento, suma_descontada, valores_anuales
+from TES_object import TES, _varies_by_year
+
+DIMENSIONES = ('altura', 'radio', 'espesor_acero', 'espesor_aislamiento')
+
+
+def _componente_medio(tes, componente_medio):
+    """
+    Retorna el índice y el precio unitario del componente que representa el medio de almacenamiento.
+    """
+    for indice, (nombre, precio, cantidad) in enumerate(tes.components):
+        if nombre == componente_medio:
+            return indice, precio
+    raise ValueError(f"El TES no tiene un componente llamado '{componente_medio}'.")
+
+
+def coeficientes_lcos(tes, componente_medio):
+    """
+    Descompone el LCOS del TES como función afín de los volúmenes:
+    LCOS = c0 + c_acero * V_acero + c_aislamiento * V_aislamiento + c_medio * V_medio.
+
+    El CAPEX de Pereira y la mantención del OPEX son lineales en los volúmenes (el medio entra como la cantidad
+    del componente `componente_medio`); el resto del OPEX no depende de la geometría. Si tes_efficiency,
+    cycles_per_year o electricity_cost_per_joule varían por año (ver perfiles_anuales), la energía descargada se
+    descuenta año a año, como en TES.LCOS.
+
+    Parámetros:
+    - tes (TES): Diseño con todos los parámetros de LCOS.
+    - componente_medio (str): Nombre del componente cuya cantidad es el volumen del medio (m³).
+
+    Retorna:
+    - dict: {'c0', 'acero', 'aislamiento', 'medio'}.
+    """
+    lcos = tes.LCOS()
+    if isinstance(lcos, str):
+        raise ValueError(lcos)
+    indice, precio_medio = _componente_medio(tes, componente_medio)
+
+    if any(_varies_by_year(getattr(tes, nombre)) for nombre in PARAMETROS_ANUALES):
+        años = int(tes.service_years)
+        factores = factores_descuento(tes.annual_discount_rate, años)
+        discount_factor_sum = float(factores.sum())
+        ciclos = valores_anuales(tes.cycles_per_year, años) * valores_anuales(tes.tes_efficiency, años)
+        total_cycles = tes.tes_energy_capacity * float(suma_descontada(ciclos, factores))
+    else:
+        discount_factor_sum = factor_anualidad(tes.annual_discount_rate, tes.service_years)
+        total_cycles = tes.cycles_per_year * tes.tes_energy_capacity * tes.tes_efficiency * discount_factor_sum
+    mantencion = tes.capex_maintenance_percentage * discount_factor_sum / tes.service_years
+    instalacion = 1 + tes.installation_percentage
+    coeficientes = {
+        'acero': tes.price_per_cubic_meter_iron * (instalacion + mantencion) / total_cycles,
+        'aislamiento': tes.price_per_cubic_meter_insulation * (tes.temporal_adjustment_index * instalacion + mantencion) / total_cycles,
+        'medio': precio_medio * (instalacion + mantencion) / total_cycles,
+    }
+    coeficientes['c0'] = (lcos - coeficientes['acero'] * tes.iron_volume - coeficientes['aislamiento'] * tes.insulation_volume
+                          - coeficientes['medio'] * tes.components[indice][2])
+    return coeficientes
+
+
+def lcos_estanque_cilindrico(tes, altura, radio, espesor_acero, espesor_aislamiento, componente_medio, numero_estanques=2):
+    """
+    Evalúa el LCOS del TES para arreglos de dimensiones del estanque, sin crear objetos TES.
+
+    Retorna:
+    - np.ndarray: El LCOS de cada combinación de dimensiones.
+    """
+    coeficientes = coeficientes_lcos(tes, componente_medio)
+    volumenes = volumenes_cilindro(altura, radio, espesor_acero, espesor_aislamiento, numero_estanques)
+    return coeficientes['c0'] + sum(coeficientes[volumen] * valor for volumen, valor in volumenes.items())
+
+
+def gradiente_lcos_estanque_cilindrico(tes, altura, radio, espesor_acero, espesor_aislamiento, componente_medio, numero_estanques=2):
+    """
+    Gradiente analítico del LCOS del TES respecto de las dimensiones del estanque.
+
+    Retorna:
+    - dict: {dimensión: dLCOS/d dimensión} para 'altura', 'radio', 'espesor_acero' y 'espesor_aislamiento'.
+    """
+    coeficientes = coeficientes_lcos(tes, componente_medio)
+    jacobiano = jacobiano_cilindro(altura, radio, espesor_acero, espesor_aislamiento, numero_estanques)
+    return {dimension: sum(coeficientes[volumen] * jacobiano[volumen][dimension] for volumen in ('acero', 'aislamiento', 'medio'))
+            for dimension in DIMENSIONES}
+
+
+def tes_con_estanque_cilindrico(tes, altura, radio, espesor_acero, espesor_aislamiento, componente_medio, numero_estanques=2):
+    """
+    Crea una copia del TES con los volúmenes y la cantidad de medio de un estanque cilíndrico dado.
+
+    Retorna:
+    - TES: El nuevo diseño.
+    """
+    volumenes = volumenes_cilindro(altura, radio, espesor_acero, espesor_aislamiento, numero_estanques)
+    indice, precio_medio = _componente_medio(tes, componente_medio)
+    components = list(tes.components)
+    components[indice] = (componente_medio, precio_medio, float(volumenes['medio']))
+
+    parametros = tes.get_parameters()
+    nuevo = TES(float(volumenes['acero']), float(volumenes['aislamiento']), parametros.pop('price_per_cubic_meter_iron'), parametros.pop('price_per_cubic_meter_insulation'), components)
+    for clave in ('iron_volume', 'insulation_volume', 'components'):
+        parametros.pop(clave)
+    nuevo.set_additional_parameters(**parametros)
+    return nuevo
+
+
+def optimizar_estanque_cilindrico(tes, limites, componente_medio, densidad_energetica=None, numero_estanques=2, tolerancia=1e-12, max_iteraciones=100):
+    """
+    Busca las dimensiones del estanque cilíndrico de menor LCOS que almacenan la capacidad `tes_energy_capacity` del TES.
+
+    La capacidad fija el volumen del medio V = tes_energy_capacity / densidad_energetica, y por lo tanto la altura
+    h = V / (π R²). El LCOS crece con ambos espesores (sus derivadas son positivas), de modo que no se optimizan: se
+    fijan en su límite inferior y su límite superior no se usa. Con la altura eliminada, el LCOS en función del radio es a/R + b/R² + c·R² + cte, convexo,
+    y su mínimo se obtiene con Newton protegido por bisección dentro de los límites de radio y altura.
+
+    Parámetros:
+    - tes (TES): Diseño base con todos los parámetros de LCOS.
+    - limites (dict): Límites (mínimo, máximo) en metros de 'altura', 'radio', 'espesor_acero' y 'espesor_aislamiento'.
+      De los espesores solo se usa el mínimo.
+    - componente_medio (str): Nombre del componente cuya cantidad es el volumen del medio (por ejemplo 'Therminol1').
+    - densidad_energetica (float, opcional): Energía almacenada por m³ de medio (kWh/m³). Por defecto, la del diseño base.
+    - numero_estanques (int): Número de estanques.
+    - tolerancia (float): Tolerancia relativa en el radio.
+    - max_iteraciones (int): Número máximo de iteraciones de Newton/bisección.
+
+    Retorna:
+    - dict: Dimensiones óptimas, 'LCOS', 'gradiente' (gradiente analítico en el óptimo) y 'tes' (el diseño óptimo).
+    """
+    faltantes = [dimension for dimension in DIMENSIONES if dimension not in limites]
+    if faltantes:
+        raise ValueError(f"Faltan los límites de: {faltantes}")
+    coeficientes = coeficientes_lcos(tes, componente_medio)
+    indice, _ = _componente_medio(tes, componente_medio)
+    if densidad_energetica is None:
+        densidad_energetica = tes.tes_energy_capacity / tes.components[indice][2]
+    volumen = tes.tes_energy_capacity / densidad_energetica
+
+    espesor_acero = limites['espesor_acero'][0]
+    espesor_aislamiento = limites['espesor_aislamiento'][0]
+    altura_minima, altura_maxima = limites['altura']
+    radio_bajo = max(limites['radio'][0], np.sqrt(volumen / (np.pi * altura_maxima)))
+    radio_alto = min(limites['radio'][1], np.sqrt(volumen / (np.pi * altura_minima)) if altura_minima > 0 else np.inf)
+    if not radio_bajo <= radio_alto or not np.isfinite(radio_alto):
+        raise ValueError("Los límites de altura y radio no permiten almacenar la capacidad pedida.")
+
+    # LCOS(R) - cte = a/R + b/R² + c·R² con h = V / (π R²)
+    n = numero_estanques
+    ca, ci = coeficientes['acero'], coeficientes['aislamiento']
+    a = n * volumen * (2 * ca * espesor_acero + 2 * ci * espesor_aislamiento)
+    b = n * volumen * (ca * espesor_acero ** 2 + ci * (2 * espesor_acero * espesor_aislamiento + espesor_aislamiento ** 2))
+    c = 2 * n * np.pi * (ca * espesor_acero + ci * espesor_aislamiento)
+
+    def derivadas(radio):
+        return -a / radio ** 2 - 2 * b / radio ** 3 + 2 * c * radio, 2 * a / radio ** 3 + 6 * b / radio ** 4 + 2 * c
+
+    bajo, alto = radio_bajo, radio_alto
+    if derivadas(bajo)[0] >= 0:
+        radio = bajo
+    elif derivadas(alto)[0] <= 0:
+        radio = alto
+    else:
+        radio = (bajo + alto) / 2
+        for _ in range(max_iteraciones):
+            primera, segunda = derivadas(radio)
+            if primera > 0:
+                alto = radio
+            else:
+                bajo = radio
+            siguiente = radio - primera / segunda
+            if not bajo < siguiente < alto:
+                siguiente = (bajo + alto) / 2
+            if abs(siguiente - radio) <= tolerancia * radio:
+                radio = siguiente
+                break
+            radio = siguiente
+
+    altura = volumen / (np.pi * radio ** 2)
+    dimensiones = dict(altura=altura, radio=radio, espesor_acero=espesor_acero, espesor_aislamiento=espesor_aislamiento)
+    optimo = tes_con_estanque_cilindrico(tes, componente_medio=componente_medio, numero_estanques=numero_estanques, **dimensiones)
+    return {
+        **dimensiones,
+        'LCOS': optimo.LCOS(),
+        'gradiente': gradiente_lcos_estanque_cilindrico(tes, componente_medio=componente_medio, numero_estanques=numero_estanques, **dimensiones),
+        'tes': optimo,
+    }
@@ -0,0 +1,104 @@
+import numpy as np
+
+# Parámetros que pueden variar año a año en el OPEX y el LCOS
+PARAMETROS_ANUALES = ('tes_efficiency', 'cycles_per_year', 'electricity_cost_per_joule')
+
+
+class CurvaGeometrica:
+    def __init__(self, valor_inicial, tasa_anual):
+        """
+        Curva que cambia a una tasa anual compuesta: valor_inicial * (1 + tasa_anual)^(año - 1).
+
+        Sirve como valor de un parámetro de PARAMETROS_ANUALES en TES o TESBatch. A diferencia de una función
+        cualquiera, se puede guardar con pickle y tiene huella en cache_resultados.
+
+        Parámetros:
+        - valor_inicial (float o array_like): Valor del primer año, o uno por diseño (diseños,).
+        - tasa_anual (float o array_like): Tasa anual de cambio, o una por diseño; negativa para una degradación.
+        """
+        self.valor_inicial = valor_inicial
+        self.tasa_anual = tasa_anual
+
+    def __call__(self, años):
+        valor_inicial = np.asarray(self.valor_inicial, dtype=np.float64)[..., None]
+        tasa_anual = np.asarray(self.tasa_anual, dtype=np.float64)[..., None]
+        return valor_inicial * (1 + tasa_anual) ** (años - 1)
+
+
+def escalamiento(valor_inicial, tasa_anual):
+    """
+    Curva de un valor que sube cada año en `tasa_anual` (por ejemplo, el costo de la electricidad).
+    """
+    return CurvaGeometrica(valor_inicial, tasa_anual)
+
+
+def degradacion(valor_inicial, tasa_anual):
+    """
+    Curva de un valor que baja cada año en `tasa_anual` (por ejemplo, la eficiencia del TES).
+    """
+    return CurvaGeometrica(valor_inicial, -np.asarray(tasa_anual, dtype=np.float64))
+
+
+def valores_anuales(valor, años):
+    """
+    Evalúa un parámetro por año en los años 1, ..., `años`.
+
+    Parámetros:
+    - valor (float, array_like o callable): Valor constante, valores por año (el último eje son los años y debe
+      tener al menos `años` elementos), o una función que recibe el arreglo de años y retorna sus valores.
+    - años (int): Número de años.
+
+    Retorna:
+    - np.ndarray: Valores con el último eje de largo `años`.
+    """
+    if callable(valor):
+        valor = valor(np.arange(1, años + 1, dtype=np.float64))
+    arreglo = np.asarray(valor, dtype=np.float64)
+    if arreglo.ndim == 0:
+        return np.broadcast_to(arreglo, (años,))
+    if arreglo.shape[-1] < años:
+        raise ValueError(f"Los valores por año deben tener al menos {años} elementos (uno por año de servicio).")
+    return arreglo[..., :años]
+
+
+def factores_descuento(annual_discount_rate, service_years):
+    """
+    Factores de descuento (1 + r)^-n de cada año n = 1, ..., N.
+
+    Parámetros:
+    - annual_discount_rate (float o array_like): Tasa de descuento anual, o una por diseño.
+    - service_years (int o array_like): Años de servicio, o unos por diseño.
+
+    Retorna:
+    - np.ndarray: Factores (años,) si la tasa y los años son los mismos para todos los diseños; si no, una matriz
+      (diseños × años) hasta el mayor número de años, con ceros después de los años de servicio de cada diseño.
+    """
+    tasa = np.asarray(annual_discount_rate, dtype=np.float64)
+    años = np.asarray(service_years)
+    maximo = int(años.max())
+    potencias = np.arange(1, maximo + 1, dtype=np.float64)
+    if (tasa == tasa.flat[0]).all() and (años == maximo).all():
+        return (1 + tasa.flat[0]) ** -potencias
+    tasa, años = np.broadcast_arrays(tasa, años)
+    factores = (1 + tasa[:, None]) ** -potencias
+    factores[potencias > años[:, None]] = 0.0
+    return factores
+
+
+def suma_descontada(valores, factores):
+    """
+    Suma por diseño de los valores por año multiplicados por sus factores de descuento, sin expandir a una matriz
+    (diseños × años) lo que es común a todos los diseños.
+
+    Parámetros:
+    - valores (np.ndarray): Valores por año (años,) o por diseño y año (diseños o 1 × años).
+    - factores (np.ndarray): Factores de descuento, como los de factores_descuento.
+
+    Retorna:
+    - float o np.ndarray: La suma de cada diseño.
+    """
+    if factores.ndim == 1:
+        return valores @ factores
+    if valores.ndim == 1:
+        return factores @ valores
+    return np.einsum('...j,...j->...', valores, factores)
@@ -0,0 +1,85 @@
+import numpy as np
+
+from Flujo_de_caja2 import PARAMETROS_FLUJO
+from Flujo_de_caja_columnar import _por_año, _por_planta, calcular_columnas
+from tasa_interna_retorno import calcular_tir_filas
+
+# Signo con que cada parámetro por año entra a los ingresos netos (precio y producción se multiplican entre sí)
+_SIGNO_POR_AÑO = {'subsidios': 1.0, 'costos_om': -1.0, 'costos_combustible': -1.0, 'costos_capital': -1.0,
+                  'costos_seguro': -1.0, 'otros_costos': -1.0}
+# Parámetros que se pueden despejar: el VAN es lineal en todos salvo en la tasa de descuento
+VARIABLES = ('precio_energia', 'produccion_anual', *_SIGNO_POR_AÑO, 'inversion_inicial', 'tasa_impuestos', 'tasa_descuento')
+
+
+def punto_equilibrio(variable, parametros, van_objetivo=0.0, tir_objetivo=None):
+    """
+    Calcula el valor de un parámetro del flujo de caja con el que se alcanza un VAN (o una TIR) objetivo.
+
+    El VAN final es lineal en cada parámetro salvo la tasa de descuento:
+    VAN = (1 - tasa_impuestos) * sum(d_t * (precio_t * produccion_t + subsidios_t - costos_t)) - inversion_inicial,
+    con d_t = (1 + tasa_descuento)^-t, así que el valor se despeja en forma cerrada. Para la tasa de descuento, el
+    VAN objetivo se resta al flujo del primer año y la tasa es la TIR de esos flujos (calcular_tir_filas). Una TIR
+    objetivo equivale a un VAN nulo con tasa_descuento = tir_objetivo.
+
+    Todo se calcula en arreglos para un portafolio de plantas a la vez, como calcular_flujo_de_caja_portafolio. El
+    parámetro despejado se supone constante en todos los años; su valor en `parametros`, si está, se ignora.
+
+    Parámetros:
+    - variable (str): Parámetro a despejar, uno de VARIABLES; por ejemplo 'precio_energia' para el precio de
+      equilibrio o 'inversion_inicial' para la mayor inversión viable.
+    - parametros (dict): Parámetros de Flujo_de_caja2.calcular_flujo_de_caja (Flujo_de_caja2.PARAMETROS_FLUJO), escalares,
+      por año, por planta o por planta y año.
+    - van_objetivo (float o np.ndarray): VAN final buscado, escalar o uno por planta (plantas,).
+    - tir_objetivo (float o np.ndarray, opcional): TIR buscada, escalar o una por planta; reemplaza a van_objetivo.
+
+    Retorna:
+    - float o np.ndarray: El valor del parámetro (uno por planta si los parámetros son por planta), o nan si el VAN
+      no depende del parámetro o no hay solución.
+    """
+    if variable not in VARIABLES:
+        raise ValueError(f"No se puede despejar '{variable}'; las variables posibles son {VARIABLES}.")
+    faltantes = [parametro for parametro in PARAMETROS_FLUJO if parametro != variable and parametro not in parametros]
+    if faltantes:
+        raise ValueError(f"Faltan los siguientes datos: {faltantes}")
+    parametros = {parametro: parametros[parametro] for parametro in PARAMETROS_FLUJO if parametro != variable}
+    parametros[variable] = 0.0
+    if tir_objetivo is not None:
+        if variable == 'tasa_descuento':
+            raise ValueError("La TIR no depende de la tasa de descuento.")
+        parametros['tasa_descuento'] = tir_objetivo
+        van_objetivo = 0.0
+    años = parametros['años']
+    van_objetivo = np.asarray(van_objetivo, dtype=np.float64)
+
+    if variable == 'tasa_descuento':
+        flujos = calcular_columnas(**parametros, columnas=['Flujo de Caja Libre'])['Flujo de Caja Libre']
+        # El primer año no se descuenta: restarle el VAN objetivo deja un problema de TIR
+        flujos = np.array(np.atleast_2d(flujos))
+        flujos[:, 0] -= van_objetivo
+        solucion = calcular_tir_filas(flujos)
+        return float(solucion[0]) if flujos.shape[0] == 1 and van_objetivo.ndim == 0 else solucion
+
+    ingresos_netos = calcular_columnas(**parametros, columnas=['Ingresos Netos'])['Ingresos Netos']
+    descuento = (1 + _por_planta(parametros['tasa_descuento'], 'tasa_descuento')) ** -np.arange(años, dtype=np.float64)
+    inversion_inicial = np.asarray(parametros['inversion_inicial'], dtype=np.float64)
+    retencion = 1 - np.asarray(parametros['tasa_impuestos'], dtype=np.float64)
+    # Valor presente de los ingresos netos con el parámetro en cero: VAN(x) = base + pendiente * x
+    presente = (ingresos_netos * descuento).sum(axis=-1)
+
+    if variable == 'inversion_inicial':
+        base, pendiente = retencion * presente, -1.0
+    elif variable == 'tasa_impuestos':
+        base, pendiente = presente - inversion_inicial, -presente
+    else:
+        if variable == 'precio_energia':
+            peso = _por_año(parametros['produccion_anual'], años, 'produccion_anual')
+        elif variable == 'produccion_anual':
+            peso = _por_año(parametros['precio_energia'], años, 'precio_energia')
+        else:
+            peso = _SIGNO_POR_AÑO[variable]
+        base = retencion * presente - inversion_inicial
+        pendiente = retencion * (peso * descuento).sum(axis=-1)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        solucion = np.where(pendiente != 0, (van_objetivo - base) / np.where(pendiente != 0, pendiente, 1.0), np.nan)
+    return float(solucion) if solucion.ndim == 0 else solucion
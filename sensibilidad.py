@@ -0,0 +1,97 @@
+import numpy as np
+
+from TES_batch import TESBatch
+
+
+def parametros_numericos(tes):
+    """
+    Retorna los nombres de los parámetros numéricos de un objeto TES (todos menos los componentes).
+
+    Parámetros:
+    - tes (TES): Diseño a revisar.
+
+    Retorna:
+    - list: Nombres de los parámetros.
+    """
+    return [key for key, value in tes.get_parameters().items() if key != 'components' and isinstance(value, (int, float)) and not isinstance(value, bool)]
+
+
+def analisis_tornado(tes, variacion=0.1, parametros=None, metricas=('LCOS', 'capex_pereira')):
+    """
+    Análisis de sensibilidad uno a la vez: cada parámetro se mueve ±`variacion` (fracción) dejando el resto en su valor base.
+
+    Todas las perturbaciones se evalúan en un único TESBatch de 2P + 1 filas (la primera es el caso base).
+
+    Parámetros:
+    - tes (TES): Diseño base.
+    - variacion (float): Variación relativa de cada parámetro, por ejemplo 0.1 para ±10%.
+    - parametros (list, opcional): Parámetros a perturbar. Por defecto, todos los parámetros numéricos del TES.
+    - metricas (tuple): Métodos de TESBatch a evaluar.
+
+    Retorna:
+    - pd.DataFrame: Tabla con columnas 'Métrica', 'Parámetro', 'Valor Base', 'Bajo', 'Alto' y 'Variación',
+      ordenada por métrica y de mayor a menor variación absoluta.
+    """
+    import pandas as pd
+
+    if parametros is None:
+        parametros = parametros_numericos(tes)
+    n = 2 * len(parametros) + 1
+
+    columnas = {}
+    for i, parametro in enumerate(parametros):
+        base = getattr(tes, parametro)
+        columna = np.full(n, base, dtype=np.float64)
+        columna[2 * i + 1] = base * (1 - variacion)
+        columna[2 * i + 2] = base * (1 + variacion)
+        if parametro == 'service_years':
+            columna = np.rint(columna)
+        columnas[parametro] = columna
+    lote = TESBatch.from_template(tes, n, **columnas)
+
+    filas = []
+    for metrica in metricas:
+        valores = getattr(lote, metrica)()
+        if isinstance(valores, str):
+            raise ValueError(valores)
+        filas_metrica = []
+        for i, parametro in enumerate(parametros):
+            bajo, alto = valores[2 * i + 1], valores[2 * i + 2]
+            filas_metrica.append([metrica, parametro, valores[0], bajo, alto, abs(alto - bajo)])
+        filas.extend(sorted(filas_metrica, key=lambda fila: fila[-1], reverse=True))
+
+    return pd.DataFrame(filas, columns=['Métrica', 'Parámetro', 'Valor Base', 'Bajo', 'Alto', 'Variación'])
+
+
+def _tornado_estudio(nombre, tes, variacion, parametros, metricas):
+    """
+    Ejecuta analisis_tornado para un estudio y agrega su nombre a la tabla.
+    """
+    tabla = analisis_tornado(tes, variacion, parametros, metricas)
+    tabla.insert(0, 'Estudio', nombre)
+    return tabla
+
+
+def analisis_tornado_estudios(estudios, variacion=0.1, parametros=None, metricas=('LCOS', 'capex_pereira'), procesos=None):
+    """
+    Ejecuta el análisis de tornado de varios estudios en paralelo.
+
+    Parámetros:
+    - estudios (dict): Diccionario {nombre: TES}.
+    - variacion (float): Variación relativa de cada parámetro.
+    - parametros (list, opcional): Parámetros a perturbar. Por defecto, todos los numéricos de cada estudio.
+    - metricas (tuple): Métodos de TESBatch a evaluar.
+    - procesos (int, opcional): Número de procesos. Por defecto, el número de núcleos.
+
+    Retorna:
+    - pd.DataFrame: Las tablas de todos los estudios, con una columna 'Estudio'.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    import pandas as pd
+
+    nombres = list(estudios)
+    with ProcessPoolExecutor(max_workers=procesos) as executor:
+        tablas = list(executor.map(_tornado_estudio, nombres, [estudios[nombre] for nombre in nombres],
+                                   [variacion] * len(nombres), [parametros] * len(nombres), [metricas] * len(nombres)))
+    return pd.concat(tablas, ignore_index=True)
@@ -0,0 +1,197 @@
+import os
+
+import numpy as np
+
+
+class AcumuladorAnual:
+    def __init__(self):
+        """
+        Acumula, por año calendario, la energía producida y los ingresos (precio × producción) de una serie
+        horaria que llega por bloques.
+        """
+        self.produccion = {}
+        self.ingresos = {}
+        self.pasos = {}
+
+    def agregar(self, años, precio, produccion):
+        """
+        Agrega un bloque de pasos de la serie.
+
+        Parámetros:
+        - años (np.ndarray): Año calendario de cada paso.
+        - precio (np.ndarray): Precio de la energía en cada paso ($/kWh).
+        - produccion (np.ndarray): Energía producida en cada paso (kWh).
+        """
+        unicos, indices = np.unique(np.asarray(años, dtype=np.int64), return_inverse=True)
+        produccion = np.asarray(produccion, dtype=np.float64)
+        suma_produccion = np.bincount(indices, weights=produccion, minlength=len(unicos))
+        suma_ingresos = np.bincount(indices, weights=produccion * np.asarray(precio, dtype=np.float64), minlength=len(unicos))
+        pasos = np.bincount(indices, minlength=len(unicos))
+        for año, energia, ingreso, n in zip(unicos.tolist(), suma_produccion, suma_ingresos, pasos):
+            self.produccion[año] = self.produccion.get(año, 0.0) + energia
+            self.ingresos[año] = self.ingresos.get(año, 0.0) + ingreso
+            self.pasos[año] = self.pasos.get(año, 0) + int(n)
+
+    def resultado(self, años=None):
+        """
+        Retorna los totales por año, ordenados, listos para Flujo_de_caja2.calcular_flujo_de_caja.
+
+        Parámetros:
+        - años (int, opcional): Número de años a retornar, desde el primero. Por defecto, todos.
+
+        Retorna:
+        - dict: 'año' (año calendario), 'produccion_anual' (kWh), 'ingresos' ($), 'precio_energia' (precio medio
+          ponderado por la producción, de modo que produccion_anual × precio_energia = ingresos) y 'pasos'.
+        """
+        calendario = sorted(self.produccion)[:años]
+        produccion = np.array([self.produccion[año] for año in calendario])
+        ingresos = np.array([self.ingresos[año] for año in calendario])
+        with np.errstate(divide='ignore', invalid='ignore'):
+            precio = np.where(produccion != 0, ingresos / produccion, 0.0)
+        return {
+            'año': np.array(calendario, dtype=np.int64),
+            'produccion_anual': produccion,
+            'ingresos': ingresos,
+            'precio_energia': precio,
+            'pasos': np.array([self.pasos[año] for año in calendario], dtype=np.int64),
+        }
+
+
+def _años_de_fechas(fechas):
+    """
+    Obtiene el año calendario de una columna de fechas (texto ISO 'AAAA-...') o de años enteros.
+    """
+    import pandas as pd
+
+    if pd.api.types.is_integer_dtype(fechas.dtype):
+        return fechas.to_numpy(np.int64)
+    return fechas.astype(str).str.slice(0, 4).astype(np.int64).to_numpy()
+
+
+def agregar_csv(ruta, columna_fecha='fecha', columna_precio='precio', columna_produccion='produccion', tamano_bloque=500_000, años=None, **opciones_csv):
+    """
+    Lee una serie horaria desde un CSV por bloques y la agrega por año, sin cargar el archivo completo.
+
+    Solo se leen las tres columnas indicadas, `tamano_bloque` filas a la vez (pandas se importa solo aquí).
+
+    Parámetros:
+    - ruta (str): Archivo CSV con una fila por paso de tiempo.
+    - columna_fecha (str): Columna con la fecha en formato ISO ('2024-01-01 00:00') o el año.
+    - columna_precio (str): Columna con el precio de la energía ($/kWh).
+    - columna_produccion (str): Columna con la energía producida en el paso (kWh).
+    - tamano_bloque (int): Número de filas por bloque.
+    - años (int, opcional): Número de años a retornar. Por defecto, todos.
+    - opciones_csv: Opciones adicionales para pandas.read_csv (por ejemplo sep=';' o decimal=',').
+
+    Retorna:
+    - dict: Resultado de AcumuladorAnual.resultado.
+    """
+    import pandas as pd
+
+    acumulador = AcumuladorAnual()
+    columnas = [columna_fecha, columna_precio, columna_produccion]
+    for bloque in pd.read_csv(ruta, usecols=columnas, chunksize=tamano_bloque, **opciones_csv):
+        acumulador.agregar(_años_de_fechas(bloque[columna_fecha]), bloque[columna_precio].to_numpy(np.float64),
+                           bloque[columna_produccion].to_numpy(np.float64))
+    return acumulador.resultado(años)
+
+
+def csv_a_npy(ruta, directorio, columna_fecha='fecha', columna_precio='precio', columna_produccion='produccion', tamano_bloque=500_000, **opciones_csv):
+    """
+    Convierte un CSV horario en archivos .npy ('año.npy', 'precio.npy', 'produccion.npy') escritos por bloques,
+    para luego leerlos como memoria mapeada con agregar_npy o series_por_año sin volver a interpretar el texto.
+
+    Parámetros:
+    - ruta (str): Archivo CSV con una fila por paso de tiempo.
+    - directorio (str): Directorio donde se escriben los .npy.
+    - columna_fecha, columna_precio, columna_produccion, tamano_bloque, opciones_csv: Como en agregar_csv.
+
+    Retorna:
+    - int: Número de pasos escritos.
+    """
+    import pandas as pd
+
+    # Se cuentan las filas primero para crear los arreglos en disco con su tamaño final
+    with open(ruta, 'rb') as archivo:
+        lineas = sum(pedazo.count(b'\n') for pedazo in iter(lambda: archivo.read(1 << 24), b''))
+        archivo.seek(-1, os.SEEK_END)
+        if archivo.read(1) != b'\n':
+            lineas += 1
+    filas = lineas - 1
+
+    os.makedirs(directorio, exist_ok=True)
+    salida = {
+        'año': np.lib.format.open_memmap(os.path.join(directorio, 'año.npy'), mode='w+', dtype=np.int64, shape=(filas,)),
+        'precio': np.lib.format.open_memmap(os.path.join(directorio, 'precio.npy'), mode='w+', dtype=np.float64, shape=(filas,)),
+        'produccion': np.lib.format.open_memmap(os.path.join(directorio, 'produccion.npy'), mode='w+', dtype=np.float64, shape=(filas,)),
+    }
+    inicio = 0
+    columnas = [columna_fecha, columna_precio, columna_produccion]
+    for bloque in pd.read_csv(ruta, usecols=columnas, chunksize=tamano_bloque, **opciones_csv):
+        fin = inicio + len(bloque)
+        salida['año'][inicio:fin] = _años_de_fechas(bloque[columna_fecha])
+        salida['precio'][inicio:fin] = bloque[columna_precio].to_numpy(np.float64)
+        salida['produccion'][inicio:fin] = bloque[columna_produccion].to_numpy(np.float64)
+        inicio = fin
+    if inicio != filas:
+        raise ValueError(f"Se esperaban {filas} filas en {ruta} y se leyeron {inicio} (¿líneas vacías o comentarios?).")
+    for arreglo in salida.values():
+        arreglo.flush()
+    return filas
+
+
+def agregar_npy(ruta_precio, ruta_produccion, ruta_año=None, pasos_por_año=8760, año_inicial=0, tamano_bloque=1_000_000, años=None):
+    """
+    Agrega por año series horarias guardadas en .npy, leídas como memoria mapeada y por bloques.
+
+    Parámetros:
+    - ruta_precio (str): Archivo .npy con el precio de cada paso ($/kWh).
+    - ruta_produccion (str): Archivo .npy con la energía producida en cada paso (kWh).
+    - ruta_año (str, opcional): Archivo .npy con el año de cada paso. Si no se entrega, cada `pasos_por_año`
+      pasos consecutivos forman un año, numerados desde `año_inicial`.
+    - pasos_por_año (int o list of int): Pasos por año cuando no hay archivo de años (8760 horario, 35040 cada
+      15 minutos), o los pasos de cada año en orden, por ejemplo [8784, 8760, 8760] si el primero es bisiesto.
+      Los pasos después del último año de la lista forman un año más.
+    - año_inicial (int): Año del primer paso cuando no hay archivo de años.
+    - tamano_bloque (int): Número de pasos por bloque.
+    - años (int, opcional): Número de años a retornar. Por defecto, todos.
+
+    Retorna:
+    - dict: Resultado de AcumuladorAnual.resultado.
+    """
+    precio = np.load(ruta_precio, mmap_mode='r')
+    produccion = np.load(ruta_produccion, mmap_mode='r')
+    año = np.load(ruta_año, mmap_mode='r') if ruta_año is not None else None
+    if precio.shape != produccion.shape:
+        raise ValueError("Las series de precio y producción deben tener el mismo largo.")
+
+    # Primer paso de cada año siguiente, si los años no tienen todos el mismo número de pasos
+    limites = np.cumsum(pasos_por_año) if np.ndim(pasos_por_año) == 1 else None
+
+    acumulador = AcumuladorAnual()
+    for inicio in range(0, len(precio), tamano_bloque):
+        fin = min(inicio + tamano_bloque, len(precio))
+        if año is not None:
+            año_bloque = año[inicio:fin]
+        elif limites is not None:
+            año_bloque = año_inicial + np.searchsorted(limites, np.arange(inicio, fin), side='right')
+        else:
+            año_bloque = año_inicial + np.arange(inicio, fin) // pasos_por_año
+        acumulador.agregar(año_bloque, precio[inicio:fin], produccion[inicio:fin])
+    return acumulador.resultado(años)
+
+
+def series_por_año(ruta, pasos_por_año=8760):
+    """
+    Abre una serie .npy como memoria mapeada con forma (años × pasos), por ejemplo para despacho.simular_despacho.
+
+    Parámetros:
+    - ruta (str): Archivo .npy de una dimensión.
+    - pasos_por_año (int): Pasos por año.
+
+    Retorna:
+    - np.memmap: Vista (años × pasos) de los años completos de la serie; no se copia a memoria.
+    """
+    serie = np.load(ruta, mmap_mode='r')
+    años = len(serie) // pasos_por_año
+    return serie[:años * pasos_por_año].reshape(años, pasos_por_año)
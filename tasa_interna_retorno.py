@@ -0,0 +1,257 @@
+import numpy as np
+
+# Estado de la TIR de cada fila en calcular_tir_filas(..., retornar_estado=True)
+TIR_UNICA = 0
+SIN_CAMBIO_DE_SIGNO = 1
+VARIOS_CAMBIOS_DE_SIGNO = 2
+RESPALDO_NPF = 3
+ESTADOS_TIR = {
+    TIR_UNICA: 'TIR única',
+    SIN_CAMBIO_DE_SIGNO: 'sin cambio de signo',
+    VARIOS_CAMBIOS_DE_SIGNO: 'varios cambios de signo',
+    RESPALDO_NPF: 'sin convergencia, resuelta con npf.irr',
+}
+
+
+def contar_cambios_de_signo(flujos):
+    """
+    Cuenta los cambios de signo de una serie de flujos, ignorando los ceros.
+
+    Parámetros:
+    - flujos (array_like): Flujos de caja por periodo.
+
+    Retorna:
+    - int: Número de cambios de signo.
+    """
+    signos = np.sign(np.asarray(flujos, dtype=np.float64))
+    signos = signos[signos != 0]
+    return int(np.count_nonzero(signos[1:] != signos[:-1]))
+
+
+def _polinomio_escalado(coeficientes, potencias, x):
+    """
+    Evalúa P(x) = sum(c_t * x^t) y su derivada, escaladas por x^-m cuando x > 1 para evitar desbordes.
+    El cociente P/P' y el signo de P no cambian con el escalamiento. También retorna una cota del error de
+    redondeo de P: si |P| es menor, x ya es raíz a precisión de máquina.
+    """
+    if x <= 1:
+        terminos = x ** potencias
+        valor = coeficientes @ terminos
+        derivada = (coeficientes[1:] * potencias[1:]) @ terminos[:-1]
+    else:
+        y = 1 / x
+        terminos = y ** (potencias[-1] - potencias)
+        valor = coeficientes @ terminos
+        derivada = (coeficientes[1:] * potencias[1:]) @ (terminos[1:] * y)
+    cota = 4 * np.finfo(np.float64).eps * (np.abs(coeficientes) @ terminos)
+    return valor, derivada, cota
+
+
+def _irr(flujos):
+    """
+    Llama a npf.irr importando numpy_financial solo cuando se necesita.
+    """
+    import numpy_financial as npf
+    return npf.irr(flujos)
+
+
+def calcular_tir(flujos, tir_inicial=None, max_iteraciones=200):
+    """
+    Calcula la Tasa Interna de Retorno (TIR) de una serie de flujos de caja.
+
+    Cuando los flujos tienen un único cambio de signo existe una sola raíz positiva de
+    sum(c_t * x^t) con x = 1 / (1 + TIR), que se obtiene con Newton protegido por bisección
+    partiendo de `tir_inicial` (por ejemplo, la TIR del año anterior). En otro caso se
+    recurre a npf.irr, de modo que el resultado coincide con el de numpy_financial.
+
+    Parámetros:
+    - flujos (array_like): Flujos de caja por periodo, comenzando en el periodo 0.
+    - tir_inicial (float, opcional): Estimación inicial de la TIR.
+    - max_iteraciones (int): Número máximo de iteraciones de Newton/bisección.
+
+    Retorna:
+    - float: La TIR calculada, o nan si no existe.
+    """
+    flujos = np.asarray(flujos, dtype=np.float64)
+    cambios = contar_cambios_de_signo(flujos)
+    if cambios == 0:
+        return np.nan
+    if cambios > 1:
+        return _irr(flujos)
+
+    # Los ceros al inicio y al final solo agregan raíces en x = 0 o bajan el grado
+    no_nulos = np.flatnonzero(flujos)
+    coeficientes = flujos[no_nulos[0]:no_nulos[-1] + 1]
+    potencias = np.arange(len(coeficientes), dtype=np.float64)
+    signo_inicial = np.sign(coeficientes[0])
+
+    x = 1.0 if tir_inicial is None or not np.isfinite(tir_inicial) or tir_inicial <= -1 else 1 / (1 + tir_inicial)
+    bajo, alto = 0.0, max(2 * x, 1.0)
+    while np.sign(_polinomio_escalado(coeficientes, potencias, alto)[0]) == signo_inicial:
+        bajo, alto = alto, 2 * alto
+        if not np.isfinite(alto):
+            return _irr(flujos)
+    if not bajo < x < alto:
+        x = (bajo + alto) / 2
+
+    for _ in range(max_iteraciones):
+        valor, derivada, cota = _polinomio_escalado(coeficientes, potencias, x)
+        if abs(valor) <= cota:
+            break
+        if np.sign(valor) == signo_inicial:
+            bajo = x
+        else:
+            alto = x
+        siguiente = x - valor / derivada if derivada != 0 else bajo
+        if not bajo < siguiente < alto:
+            siguiente = (bajo + alto) / 2
+        if abs(siguiente - x) <= 4 * np.finfo(np.float64).eps * siguiente or alto - bajo <= 4 * np.finfo(np.float64).eps * alto:
+            x = siguiente
+            break
+        x = siguiente
+    else:
+        return _irr(flujos)
+    return 1 / x - 1
+
+
+def contar_cambios_de_signo_filas(flujos):
+    """
+    Versión vectorizada de contar_cambios_de_signo para cada fila de una matriz de flujos.
+
+    Parámetros:
+    - flujos (np.ndarray): Matriz (filas × periodos) de flujos de caja.
+
+    Retorna:
+    - np.ndarray: Número de cambios de signo de cada fila.
+    """
+    signos = np.sign(flujos)
+    # Cada cero toma el signo del último flujo no nulo anterior, así no cuenta como cambio
+    ultimo_no_nulo = np.maximum.accumulate(np.where(signos != 0, np.arange(flujos.shape[1]), 0), axis=1)
+    signos = np.take_along_axis(signos, ultimo_no_nulo, axis=1)
+    return np.count_nonzero(signos[:, 1:] * signos[:, :-1] < 0, axis=1)
+
+
+def _polinomio_escalado_filas(coeficientes, potencias, x):
+    """
+    Evalúa P(x), P'(x) y la cota de redondeo de P para cada fila, escalados por x^-m en las filas con x > 1
+    (ver _polinomio_escalado).
+    """
+    m = potencias[-1]
+    menor_a_uno = (x <= 1)[:, None]
+    base = np.where(menor_a_uno, x[:, None], 1 / x[:, None])
+    terminos = base ** np.where(menor_a_uno, potencias, m - potencias)
+    valor = (coeficientes * terminos).sum(axis=1)
+    derivada = (coeficientes * potencias * terminos).sum(axis=1) / x
+    cota = 4 * np.finfo(np.float64).eps * (np.abs(coeficientes) * terminos).sum(axis=1)
+    return valor, derivada, cota
+
+
+def calcular_tir_filas(flujos, tir_inicial=None, max_iteraciones=200, retornar_estado=False):
+    """
+    Calcula la TIR de cada fila de una matriz de flujos de caja en forma vectorizada.
+
+    Usa el mismo Newton protegido por bisección que calcular_tir, con derivada analítica y aplicado a todas las
+    filas con un único cambio de signo a la vez. Las filas sin cambios de signo dan nan y las filas con varios
+    cambios se resuelven una por una con npf.irr, igual que calcular_tir.
+
+    Parámetros:
+    - flujos (array_like): Matriz (filas × periodos) de flujos de caja, comenzando en el periodo 0.
+    - tir_inicial (array_like, opcional): Estimación inicial de la TIR de cada fila (escalar o arreglo).
+    - max_iteraciones (int): Número máximo de iteraciones de Newton/bisección.
+    - retornar_estado (bool): Si es True, también retorna el estado de cada fila (ver ESTADOS_TIR).
+
+    Retorna:
+    - np.ndarray: La TIR de cada fila, o nan si no existe.
+    - np.ndarray (solo si retornar_estado): Código de estado de cada fila: TIR_UNICA, SIN_CAMBIO_DE_SIGNO,
+      VARIOS_CAMBIOS_DE_SIGNO o RESPALDO_NPF.
+    """
+    flujos = np.atleast_2d(np.asarray(flujos, dtype=np.float64))
+    filas = flujos.shape[0]
+    tir = np.full(filas, np.nan)
+    cambios = contar_cambios_de_signo_filas(flujos)
+    estado = np.where(cambios == 0, SIN_CAMBIO_DE_SIGNO, np.where(cambios > 1, VARIOS_CAMBIOS_DE_SIGNO, TIR_UNICA))
+    for fila in np.flatnonzero(cambios > 1):
+        tir[fila] = _irr(flujos[fila])
+
+    activas = np.flatnonzero(cambios == 1)
+    if activas.size == 0:
+        return (tir, estado) if retornar_estado else tir
+    coeficientes = flujos[activas]
+    potencias = np.arange(flujos.shape[1], dtype=np.float64)
+    primer_no_nulo = np.argmax(coeficientes != 0, axis=1)
+    signo_inicial = np.sign(coeficientes[np.arange(activas.size), primer_no_nulo])
+
+    if tir_inicial is None:
+        x = np.ones(activas.size)
+    else:
+        inicial = np.broadcast_to(np.asarray(tir_inicial, dtype=np.float64), (filas,))[activas]
+        x = np.where(np.isfinite(inicial) & (inicial > -1), 1 / (1 + np.where(inicial > -1, inicial, 0)), 1.0)
+
+    # Intervalo [bajo, alto] con cambio de signo de P para cada fila
+    bajo = np.zeros(activas.size)
+    alto = np.maximum(2 * x, 1.0)
+    sin_intervalo = np.sign(_polinomio_escalado_filas(coeficientes, potencias, alto)[0]) == signo_inicial
+    while sin_intervalo.any():
+        bajo = np.where(sin_intervalo, alto, bajo)
+        alto = np.where(sin_intervalo, 2 * alto, alto)
+        if not np.isfinite(alto).all():
+            break
+        sin_intervalo = np.sign(_polinomio_escalado_filas(coeficientes, potencias, alto)[0]) == signo_inicial
+    x = np.where((bajo < x) & (x < alto), x, (bajo + alto) / 2)
+
+    pendientes = np.isfinite(alto)
+    convergidas = np.zeros(activas.size, dtype=bool)
+    for _ in range(max_iteraciones):
+        indices = np.flatnonzero(pendientes & ~convergidas)
+        if indices.size == 0:
+            break
+        xi = x[indices]
+        valor, derivada, cota = _polinomio_escalado_filas(coeficientes[indices], potencias, xi)
+        mismo_signo = np.sign(valor) == signo_inicial[indices]
+        bajo[indices] = np.where(mismo_signo, xi, bajo[indices])
+        alto[indices] = np.where(mismo_signo, alto[indices], xi)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            siguiente = xi - valor / derivada
+        fuera = ~((bajo[indices] < siguiente) & (siguiente < alto[indices]))
+        siguiente = np.where(fuera, (bajo[indices] + alto[indices]) / 2, siguiente)
+        en_raiz = np.abs(valor) <= cota
+        convergidas[indices] = (en_raiz | (np.abs(siguiente - xi) <= 4 * np.finfo(np.float64).eps * siguiente)
+                                | (alto[indices] - bajo[indices] <= 4 * np.finfo(np.float64).eps * alto[indices]))
+        x[indices] = np.where(en_raiz, xi, siguiente)
+
+    resueltas = pendientes & convergidas
+    tir[activas[resueltas]] = 1 / x[resueltas] - 1
+    for fila in activas[~resueltas]:
+        tir[fila] = _irr(flujos[fila])
+    estado[activas[~resueltas]] = RESPALDO_NPF
+    return (tir, estado) if retornar_estado else tir
+
+
+def verificar_tir_filas(flujos, rtol=1e-8, atol=1e-10):
+    """
+    Compara calcular_tir_filas con npf.irr fila por fila.
+
+    Pensada para validar el solver vectorizado sobre un lote de flujos; npf.irr resuelve un problema de valores
+    propios por fila, por lo que es mucho más lenta.
+
+    Parámetros:
+    - flujos (array_like): Matriz (filas × periodos) de flujos de caja.
+    - rtol (float): Tolerancia relativa de la comparación.
+    - atol (float): Tolerancia absoluta de la comparación.
+
+    Retorna:
+    - dict: {'tir': TIR vectorizada, 'tir_npf': TIR de npf.irr, 'estado': estado de cada fila,
+      'diferencia_maxima': mayor diferencia absoluta, 'discrepantes': índices de las filas que no coinciden}.
+    """
+    flujos = np.atleast_2d(np.asarray(flujos, dtype=np.float64))
+    tir, estado = calcular_tir_filas(flujos, retornar_estado=True)
+    tir_npf = np.array([_irr(fila) for fila in flujos], dtype=np.float64)
+    coinciden = np.isclose(tir, tir_npf, rtol=rtol, atol=atol, equal_nan=True)
+    diferencias = np.abs(tir - tir_npf)
+    return {
+        'tir': tir,
+        'tir_npf': tir_npf,
+        'estado': estado,
+        'diferencia_maxima': float(np.nanmax(diferencias)) if np.isfinite(diferencias).any() else 0.0,
+        'discrepantes': np.flatnonzero(~coinciden),
+    }
@@ -0,0 +1,22 @@
+import numpy as np
+import pytest
+
+import TES_functions
+from anualidad import factor_anualidad
+
+
+def _lcos(annual_discount_rate, service_years):
+    return TES_functions.LCOS(annual_discount_rate, 37500, 365, service_years, 0.7, 350.0, 200.0, 1630, 7000, [("Therminol1", 210.0, 16000.0)],
+                              101325, 202650, 0.1, 700, 9, 4, 0.396, 0.95, 0.02)
+
+
+def test_factor_anualidad_igual_a_la_suma_de_factores():
+    for tasa in (0.0, 1e-9, 0.07):
+        assert factor_anualidad(tasa, 30) == pytest.approx(sum((1 + tasa) ** -n for n in range(1, 31)), rel=1e-12)
+
+
+def test_lcos_con_arreglos_de_tasas_y_años():
+    tasas, años = np.array([0.0, 0.05, 0.07]), np.array([20, 25, 30])
+    esperado = [_lcos(float(tasa), int(n)) for tasa, n in zip(tasas, años)]
+    np.testing.assert_allclose(_lcos(tasas, años), esperado, rtol=1e-12)
+    np.testing.assert_allclose(_lcos(tasas, 30), [_lcos(float(tasa), 30) for tasa in tasas], rtol=1e-12)
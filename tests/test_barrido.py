@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+import barrido
+from barrido import barrido_parametrico
+from TES_object import TES
+
+
+def _tes():
+    tes = TES(120.0, 40.0, 1630, 7000, [("Therminol1", 210.0, 16000.0)])
+    tes.set_additional_parameters(temporal_adjustment_index=1, installation_percentage=0.1, tes_energy_capacity=37500, cycles_per_year=365,
+                                  tes_efficiency=0.7, delta_pressure_charge=9000, delta_pressure_discharge=9000, mass_flow_rate_charge=161000,
+                                  mass_flow_rate_discharge=413000, working_fluid_density=700, charging_time=9, discharging_time=4, service_years=30,
+                                  annual_discount_rate=0.07, electricity_cost_per_joule=0.396, fan_efficiency=0.95, capex_maintenance_percentage=0.02)
+    return tes
+
+
+_EJES = {'iron_volume': np.linspace(100, 200, 7), 'annual_discount_rate': [0.03, 0.05, 0.07, 0.09], 'tes_efficiency': [0.6, 0.7, 0.8]}
+
+
+class _Interrupcion(Exception):
+    pass
+
+
+def test_continuar_un_barrido_interrumpido(tmp_path, monkeypatch):
+    completo = barrido_parametrico(_tes(), _EJES, str(tmp_path / 'completo'), tamano_bloque=10)
+
+    from_template, llamadas = barrido.TESBatch.from_template, []
+
+    def interrumpir(*args, **kwargs):
+        llamadas.append(1)
+        if len(llamadas) > 3:
+            raise _Interrupcion
+        return from_template(*args, **kwargs)
+
+    monkeypatch.setattr(barrido.TESBatch, 'from_template', interrumpir)
+    with pytest.raises(_Interrupcion):
+        barrido_parametrico(_tes(), _EJES, str(tmp_path / 'continuado'), tamano_bloque=10)
+    assert barrido.CuboResultados(str(tmp_path / 'continuado')).manifiesto['bloques_completados'] == 3
+    monkeypatch.setattr(barrido.TESBatch, 'from_template', from_template)
+
+    continuado = barrido_parametrico(_tes(), _EJES, str(tmp_path / 'continuado'), tamano_bloque=10)
+    assert continuado.manifiesto['bloques_completados'] == continuado.manifiesto['numero_bloques'] == 9
+    for metrica in completo.metricas:
+        np.testing.assert_array_equal(continuado.datos[metrica], completo.datos[metrica])
+
+
+def test_no_continua_con_otro_diseno(tmp_path):
+    barrido_parametrico(_tes(), _EJES, str(tmp_path), tamano_bloque=10)
+    otro = _tes()
+    otro.fan_efficiency = 0.9
+    with pytest.raises(ValueError, match='barrido distinto'):
+        barrido_parametrico(otro, _EJES, str(tmp_path), tamano_bloque=10)
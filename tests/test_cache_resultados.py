@@ -0,0 +1,35 @@
+import numpy as np
+
+import cache_resultados
+from cache_resultados import CacheResultados, huella
+
+
+def test_modulos_calculo_incluye_importaciones():
+    modulos = cache_resultados.modulos_calculo()
+    for modulo in ('perfiles_anuales', 'lista_materiales', 'Flujo_de_caja', 'anualidad', 'tasa_interna_retorno'):
+        assert modulo in modulos
+
+
+def test_huella_enteros_exactos():
+    assert huella(1) == huella(1.0) == huella(np.int64(1))
+    assert huella(2 ** 60) != huella(2 ** 60 + 1)
+    assert huella(np.array([2 ** 60])) != huella(np.array([2 ** 60 + 1]))
+    assert huella(np.array([1, 2])) == huella(np.array([1.0, 2.0]))
+
+
+def test_huella_arreglos_de_objetos():
+    assert huella(np.array([{'a': 1}, 'x'], dtype=object)) == huella(np.array([{'a': 1}, 'x'], dtype=object))
+    assert huella(np.array([{'a': 1}, 'x'], dtype=object)) != huella(np.array([{'a': 2}, 'x'], dtype=object))
+
+
+def test_recorte_sin_medir_en_cada_escritura(tmp_path, monkeypatch):
+    cache = CacheResultados(str(tmp_path), tamano_maximo=50_000)
+    mediciones = []
+    archivos = cache._archivos
+    monkeypatch.setattr(cache, '_archivos', lambda: mediciones.append(1) or archivos())
+    for i in range(300):
+        cache.guardar(f"{i:064x}", b'x' * 1000)
+    assert cache.tamano() <= cache.tamano_maximo
+    # Una medición inicial y una por recorte (cada ~10 % del máximo), no una por escritura
+    assert len(mediciones) < 60
+    assert cache.obtener(f"{299:064x}") == b'x' * 1000
@@ -0,0 +1,51 @@
+import os
+
+import numpy as np
+import pytest
+
+from catalogo import Catalogo
+from ejecutar_escenarios import COLUMNAS_RESULTADO, evaluar_escenarios
+
+ESCENARIOS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'escenarios')
+
+
+def test_escenario_de_total_se_carga():
+    tes = Catalogo.cargar(os.path.join(ESCENARIOS, 'total.toml'), usar_cache=False).tes('Total')
+    assert tes.initial_pressure == 101325
+    assert tes.working_fluid_flow == 0.1
+    assert tes.capex_mctigue() == pytest.approx(5420600.0)
+
+
+def test_datos_faltantes_por_escenario():
+    base = dict(iron_volume=1, insulation_volume=2, price_per_cubic_meter_iron=1000, price_per_cubic_meter_insulation=500, temporal_adjustment_index=1,
+                installation_percentage=0.15)
+    catalogo = Catalogo.compilar({'escenarios': {'a': dict(base, service_years=20), 'b': base, 'c': dict(base, service_years=25)}})
+    assert catalogo.grupos() == [['a', 'c'], ['b']]
+    with pytest.raises(ValueError, match="'b': \\['service_years'\\]"):
+        catalogo.lote()
+    np.testing.assert_array_equal(catalogo.lote(['a', 'c']).service_years, [20, 25])
+
+
+def test_ejecutar_reporta_faltantes_solo_en_su_escenario():
+    ruta = os.path.join(ESCENARIOS, 'estudios.toml')
+    nombres = Catalogo.cargar(ruta, usar_cache=False).nombres
+    filas = {fila[1]: dict(zip(COLUMNAS_RESULTADO, fila)) for fila in evaluar_escenarios(ruta, nombres)}
+    assert list(filas) == nombres
+    assert np.isnan(filas['Orsini']['capex_kocher']) and 'capex_kocher' in filas['Orsini']['faltantes']
+    assert not np.isnan(filas['Touzo']['capex_kocher']) and 'capex_kocher' not in filas['Touzo']['faltantes']
+
+
+def test_cache_se_invalida_si_cambia_el_codigo(tmp_path, monkeypatch):
+    import cache_resultados
+
+    ruta = tmp_path / 'total.toml'
+    ruta.write_bytes(open(os.path.join(ESCENARIOS, 'total.toml'), 'rb').read())
+    Catalogo.cargar(str(ruta))
+    compilados = []
+    compilar = Catalogo.compilar.__func__
+    monkeypatch.setattr(Catalogo, 'compilar', classmethod(lambda cls, contenido: compilados.append(1) or compilar(cls, contenido)))
+    Catalogo.cargar(str(ruta))
+    assert not compilados
+    monkeypatch.setattr(cache_resultados, 'huella_codigo', lambda raices: 'otro código')
+    assert Catalogo.cargar(str(ruta)).nombres == ['Total']
+    assert compilados
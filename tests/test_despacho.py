@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+
+from despacho import parametros_opex, simular_despacho
+from TES_object import TES
+
+
+def _tes():
+    tes = TES(1.0, 1.0, 1.0, 1.0, [])
+    tes.set_additional_parameters(tes_energy_capacity=10.0, charging_time=2.0, discharging_time=1.0, tes_efficiency=0.8, working_fluid_density=1.2,
+                                  fan_efficiency=0.9, mass_flow_rate_charge=3.0, delta_pressure_charge=1000.0, mass_flow_rate_discharge=6.0,
+                                  delta_pressure_discharge=500.0)
+    return tes
+
+
+def test_despacho_calculado_a_mano():
+    # Carga a 5 kW con sol hasta llenarse (el tercer paso ya no cabe) y descarga a 10 kW cuando el precio supera la media (3)
+    resultado = simular_despacho(_tes(), precio=[1.0, 1.0, 5.0, 5.0], disponibilidad_solar=[1.0, 1.0, 1.0, 0.0])
+    assert resultado['energia_cargada'] == pytest.approx([10.0])
+    assert resultado['energia_entregada'] == pytest.approx([8.0])
+    assert resultado['ingresos'] == pytest.approx([40.0])
+    assert resultado['horas_carga'] == pytest.approx([2.0])
+    assert resultado['horas_descarga'] == pytest.approx([1.0])
+    assert resultado['ciclos'] == pytest.approx([1.0])
+    ventilador_carga, ventilador_descarga = 3.0 * 1000.0 / (1.2 * 0.9), 6.0 * 500.0 / (1.2 * 0.9)
+    assert resultado['energia_ventiladores'] == pytest.approx([3600 * (2.0 * ventilador_carga + 1.0 * ventilador_descarga)])
+
+
+def test_estado_de_carga_dentro_de_los_limites():
+    # Sin sol no hay nada que descargar; con sol en todos los pasos no se carga más que la capacidad antes de descargar
+    assert simular_despacho(_tes(), [5.0, 1.0, 5.0], [0.0, 0.0, 0.0])['energia_entregada'] == pytest.approx([0.0])
+    resultado = simular_despacho(_tes(), [1.0] * 23 + [100.0], [1.0] * 24)
+    assert resultado['energia_cargada'] == pytest.approx([10.0])
+    assert resultado['energia_entregada'] == pytest.approx([8.0])
+
+
+def test_parametros_opex_reproducen_las_horas_de_ventilador():
+    rng = np.random.default_rng(1)
+    despacho = simular_despacho(_tes(), rng.random((3, 96)), rng.random((3, 96)))
+    parametros = parametros_opex(despacho)
+    assert parametros['cycles_per_year'] * parametros['charging_time'] == pytest.approx(despacho['horas_carga'].mean())
+    assert parametros['cycles_per_year'] * parametros['discharging_time'] == pytest.approx(despacho['horas_descarga'].mean())
@@ -0,0 +1,68 @@
+import numpy as np
+import numpy_financial as npf
+import pandas as pd
+import pytest
+
+from Flujo_de_caja_columnar import COLUMNAS
+from Flujo_de_caja2 import calcular_flujo_de_caja, calcular_flujo_de_caja_portafolio
+
+
+def _flujo_de_caja_original(años, precio_energia, produccion_anual, subsidios, costos_om, costos_combustible, costos_capital, costos_seguro,
+                            otros_costos, inversion_inicial, tasa_impuestos, tasa_descuento):
+    # Cálculo año a año de la versión original de Flujo_de_caja2, como referencia
+    data, flujos_caja_libre = [], []
+    for año in range(1, años + 1):
+        idx = año - 1
+        ingresos = produccion_anual[idx] * precio_energia[idx]
+        total_gastos = costos_om[idx] + costos_combustible[idx] + costos_capital[idx] + costos_seguro[idx] + otros_costos[idx]
+        ingresos_netos = ingresos + subsidios[idx] - total_gastos
+        impuestos = ingresos_netos * tasa_impuestos
+        flujo_caja_operativo = ingresos_netos - impuestos
+        inversiones_capital = inversion_inicial if año == 1 else 0
+        flujo_caja_libre = flujo_caja_operativo - inversiones_capital
+        flujos_caja_libre.append(flujo_caja_libre)
+        data.append([año, ingresos, subsidios[idx], costos_om[idx], costos_combustible[idx], costos_capital[idx], costos_seguro[idx], otros_costos[idx],
+                     total_gastos, ingresos_netos, impuestos, flujo_caja_operativo, inversiones_capital, flujo_caja_libre,
+                     npf.npv(tasa_descuento, flujos_caja_libre), npf.irr(flujos_caja_libre)])
+    return pd.DataFrame(data, columns=COLUMNAS)
+
+
+def _parametros(años=12, semilla=0):
+    rng = np.random.default_rng(semilla)
+    return dict(años=años, precio_energia=list(rng.uniform(0.08, 0.12, años)), produccion_anual=list(rng.uniform(8e5, 1.2e6, años)),
+                subsidios=[50_000.0] * años, costos_om=list(rng.uniform(1e4, 3e4, años)), costos_combustible=[0.0] * años,
+                costos_capital=[5_000.0] * años, costos_seguro=[10_000.0] * años, otros_costos=list(rng.uniform(0, 1e4, años)),
+                inversion_inicial=400_000.0, tasa_impuestos=0.25, tasa_descuento=0.1)
+
+
+def test_to_dataframe_igual_al_calculo_original():
+    parametros = _parametros()
+    resultado = calcular_flujo_de_caja(**parametros).to_dataframe()
+    esperado = _flujo_de_caja_original(**parametros)
+    assert list(resultado.columns) == COLUMNAS
+    pd.testing.assert_frame_equal(resultado, esperado, check_dtype=False, rtol=1e-9)
+
+
+def test_listas_mas_largas_que_los_años_se_recortan():
+    parametros = _parametros()
+    largas = {nombre: valor + valor if isinstance(valor, list) else valor for nombre, valor in parametros.items()}
+    pd.testing.assert_frame_equal(calcular_flujo_de_caja(**largas).to_dataframe(), calcular_flujo_de_caja(**parametros).to_dataframe())
+
+
+def test_portafolio_igual_a_cada_planta():
+    plantas = [_parametros(semilla=semilla) for semilla in range(3)]
+    portafolio = {nombre: np.array([planta[nombre] for planta in plantas]) for nombre in plantas[0] if nombre != 'años'}
+    resultado = calcular_flujo_de_caja_portafolio(12, **portafolio)
+    for i, planta in enumerate(plantas):
+        esperado = calcular_flujo_de_caja(**planta)
+        for columna in COLUMNAS:
+            np.testing.assert_allclose(resultado[columna][i], esperado[columna], rtol=1e-9, equal_nan=True)
+
+
+def test_portafolio_rechaza_vectores_por_planta_de_una_dimension():
+    parametros = _parametros()
+    parametros['costos_om'] = np.array([1e4, 2e4, 3e4])
+    with pytest.raises(ValueError, match='plantas × 1'):
+        calcular_flujo_de_caja_portafolio(**parametros)
+    parametros['costos_om'] = parametros['costos_om'][:, None]
+    assert calcular_flujo_de_caja_portafolio(**parametros)['VAN'].shape == (3, 12)
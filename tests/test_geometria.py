@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+
+from geometria import (jacobiano_cilindro, jacobiano_esfera, jacobiano_lecho_empacado, volumenes_cilindro, volumenes_esfera,
+                       volumenes_lecho_empacado)
+
+
+def test_volumenes_del_estanque_de_orsini():
+    volumenes = volumenes_cilindro(11.5, 15, 0.07, 0.04, numero_estanques=2)
+    assert volumenes['acero'] == pytest.approx(350.0133, abs=1e-4)
+    assert volumenes['aislamiento'] == pytest.approx(200.3255, abs=1e-4)
+    assert volumenes['medio'] == pytest.approx(8128.87, abs=1e-2)
+
+
+def test_volumenes_con_arreglos_igual_a_escalares():
+    alturas, radios = np.array([8.0, 11.5, 14.0]), np.array([12.0, 15.0, 9.0])
+    volumenes = volumenes_cilindro(alturas, radios, 0.07, 0.04, numero_estanques=2)
+    for i in range(3):
+        for nombre, valor in volumenes_cilindro(float(alturas[i]), float(radios[i]), 0.07, 0.04, numero_estanques=2).items():
+            assert volumenes[nombre][i] == valor
+
+
+@pytest.mark.parametrize('volumenes, jacobiano, dimensiones', [
+    (volumenes_cilindro, jacobiano_cilindro, {'altura': 11.5, 'radio': 15.0, 'espesor_acero': 0.07, 'espesor_aislamiento': 0.04}),
+    (volumenes_esfera, jacobiano_esfera, {'radio': 6.0, 'espesor_acero': 0.05, 'espesor_aislamiento': 0.1}),
+    (volumenes_lecho_empacado, jacobiano_lecho_empacado, {'altura': 8.0, 'radio': 4.0, 'espesor_acero': 0.05, 'espesor_aislamiento': 0.3,
+                                                          'porosidad': 0.35}),
+])
+def test_jacobiano_igual_a_diferencias_finitas(volumenes, jacobiano, dimensiones):
+    analitico = jacobiano(**dimensiones, numero_estanques=2)
+    for dimension, valor in dimensiones.items():
+        paso = 1e-4 * valor
+        alto = volumenes(**dict(dimensiones, **{dimension: valor + paso}), numero_estanques=2)
+        bajo = volumenes(**dict(dimensiones, **{dimension: valor - paso}), numero_estanques=2)
+        for nombre in ('acero', 'aislamiento', 'medio'):
+            assert analitico[nombre][dimension] == pytest.approx((alto[nombre] - bajo[nombre]) / (2 * paso), rel=1e-6, abs=1e-9)
@@ -0,0 +1,49 @@
+import threading
+
+import pytest
+
+import Flujo_de_caja2
+import instrumentacion
+import tasa_interna_retorno
+from instrumentacion import Instrumentacion
+from TES_object import TES
+
+
+def _tes():
+    tes = TES(1.0, 6.45, 1737.47, 2432.64, [("válvulas", 242.82, 8)])
+    tes.set_additional_parameters(temporal_adjustment_index=1, installation_percentage=0.15)
+    return tes
+
+
+def _originales():
+    return {'TES.capex_pereira': TES.__dict__['capex_pereira'], 'calcular_flujo_de_caja': Flujo_de_caja2.calcular_flujo_de_caja,
+            'calcular_tir_filas': tasa_interna_retorno.calcular_tir_filas}
+
+
+def test_desactivar_restaura_las_funciones_originales():
+    originales = _originales()
+    with Instrumentacion() as registro:
+        assert TES.__dict__['capex_pereira'] is not originales['TES.capex_pereira']
+        _tes().capex_pereira()
+    assert _originales() == originales
+    assert registro.estadisticas['TES.capex_pereira']['llamadas'] == 1
+
+
+def test_activar_deshace_los_reemplazos_si_falla(monkeypatch):
+    originales = _originales()
+    monkeypatch.setattr(instrumentacion, 'FUNCIONES', instrumentacion.FUNCIONES + (('modulo_inexistente', 'f', 'f'),))
+    registro = Instrumentacion()
+    with pytest.raises(ImportError):
+        registro.activar()
+    assert not registro.activa
+    assert _originales() == originales
+
+
+def test_no_registra_llamadas_de_otros_hilos():
+    with Instrumentacion() as registro:
+        hilo = threading.Thread(target=lambda: _tes().capex_pereira())
+        hilo.start()
+        hilo.join()
+        assert 'TES.capex_pereira' not in registro.estadisticas
+        _tes().capex_pereira()
+    assert registro.estadisticas['TES.capex_pereira']['llamadas'] == 1
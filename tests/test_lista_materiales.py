@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from lista_materiales import ListaMateriales
+from TES_object import TES
+
+
+def _componentes():
+    rng = np.random.default_rng(0)
+    return [(f"ítem {i}", float(precio), float(cantidad), ('acero', 'válvulas', 'medio')[i % 3])
+            for i, (precio, cantidad) in enumerate(zip(rng.uniform(1, 5000, 200), rng.uniform(0, 50, 200)))]
+
+
+def test_costo_total_igual_a_la_lista_de_tuplas():
+    componentes = _componentes()
+    lista = ListaMateriales.desde_componentes(componentes)
+    tuplas = [componente[:3] for componente in componentes]
+    assert lista.costo_total() == sum(precio * cantidad for _, precio, cantidad in tuplas)
+    assert TES(1.0, 1.0, 1.0, 1.0, lista).capex_knobloch() == TES(1.0, 1.0, 1.0, 1.0, tuplas).capex_knobloch()
+
+
+def test_subtotales_igual_a_un_ciclo():
+    componentes = _componentes()
+    lista = ListaMateriales.desde_componentes(componentes)
+    esperado = {}
+    for _, precio, cantidad, categoria in componentes:
+        esperado[categoria] = esperado.get(categoria, 0.0) + precio * cantidad
+    assert lista.subtotales() == pytest.approx(esperado, rel=1e-12)
+
+    cantidades = np.random.default_rng(1).uniform(0, 50, (4, len(lista)))
+    por_diseño = lista.subtotales(cantidades)
+    for fila, cantidades_fila in zip(por_diseño, cantidades):
+        esperado_fila = dict.fromkeys(lista.categorias.tolist(), 0.0)
+        for (_, precio, _, categoria), cantidad in zip(componentes, cantidades_fila):
+            esperado_fila[categoria] += precio * cantidad
+        np.testing.assert_allclose(fila, list(esperado_fila.values()), rtol=1e-12)
+
+
+def test_arreglos_de_solo_lectura():
+    lista = ListaMateriales.desde_componentes(_componentes())
+    for arreglo in (lista.nombres, lista.precios, lista.cantidades, lista.categorias, lista.codigos):
+        with pytest.raises(ValueError):
+            arreglo[0] = arreglo[1]
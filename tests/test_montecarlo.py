@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+
+from Flujo_de_caja2 import calcular_flujo_de_caja
+from montecarlo import MUESTRAS_POR_TRAMO, EstadisticaStreaming, muestrear_rango, simular_montecarlo, van_vectorizado
+from TES_batch import TESBatch
+from TES_object import TES
+
+
+def _tes():
+    tes = TES(120.0, 40.0, 1630, 7000, [("Therminol1", 210.0, 16000.0)])
+    tes.set_additional_parameters(temporal_adjustment_index=1, installation_percentage=0.1, tes_energy_capacity=37500, cycles_per_year=365,
+                                  tes_efficiency=0.7, delta_pressure_charge=9000, delta_pressure_discharge=9000, mass_flow_rate_charge=161000,
+                                  mass_flow_rate_discharge=413000, working_fluid_density=700, charging_time=9, discharging_time=4, service_years=30,
+                                  annual_discount_rate=0.07, electricity_cost_per_joule=0.396, fan_efficiency=0.95, capex_maintenance_percentage=0.02)
+    return tes
+
+
+_DISTRIBUCIONES = {'price_per_cubic_meter_iron': ('normal', 1630, 100), 'tes_efficiency': ('triangular', 0.6, 0.7, 0.8),
+                   'service_years': ('uniform', 20, 30)}
+
+
+def test_combinar_estadisticas_igual_a_los_datos_concatenados():
+    rng = np.random.default_rng(0)
+    bloques = [rng.lognormal(0, 0.5, tamano) for tamano in (1000, 37, 5000)]
+    total = EstadisticaStreaming(0.0, 10.0, n_bins=4096)
+    total.agregar(bloques[0])
+    for bloque in bloques[1:]:
+        parte = EstadisticaStreaming(0.0, 10.0, n_bins=4096)
+        parte.agregar(bloque)
+        total.combinar(parte)
+
+    datos = np.concatenate(bloques)
+    assert total.n == datos.size and total.minimo == datos.min() and total.maximo == datos.max()
+    assert total.media == pytest.approx(np.mean(datos), rel=1e-12)
+    assert total.desviacion ** 2 == pytest.approx(np.var(datos, ddof=1), rel=1e-12)
+    ancho = 10.0 / 4096
+    for q in (0.1, 0.5, 0.9):
+        assert abs(total.cuantil(q) - np.quantile(datos, q)) <= ancho
+
+
+def test_muestras_independientes_de_los_bloques():
+    todas = muestrear_rango(_DISTRIBUCIONES, 3, 0, 2 * MUESTRAS_POR_TRAMO + 10)
+    inicio = MUESTRAS_POR_TRAMO - 5
+    parte = muestrear_rango(_DISTRIBUCIONES, 3, inicio, MUESTRAS_POR_TRAMO + 10)
+    for parametro, valores in parte.items():
+        np.testing.assert_array_equal(valores, todas[parametro][inicio:inicio + MUESTRAS_POR_TRAMO + 10])
+
+
+def test_simulacion_igual_con_cualquier_bloque_o_numero_de_procesos():
+    n = 3 * MUESTRAS_POR_TRAMO
+    referencia = simular_montecarlo(_tes(), _DISTRIBUCIONES, n, semilla=7)['LCOS']
+    for tamano_bloque, procesos in ((5000, 1), (5000, 2), (n, 1)):
+        resultado = simular_montecarlo(_tes(), _DISTRIBUCIONES, n, semilla=7, tamano_bloque=tamano_bloque, procesos=procesos)['LCOS']
+        np.testing.assert_array_equal(resultado.bordes, referencia.bordes)
+        np.testing.assert_array_equal(resultado.conteos, referencia.conteos)
+        assert (resultado.minimo, resultado.maximo) == (referencia.minimo, referencia.maximo)
+        assert resultado.percentiles() == referencia.percentiles()
+        assert resultado.media == pytest.approx(referencia.media, rel=1e-12)
+
+
+def test_advertencia_si_quedan_valores_fuera_del_rango():
+    with pytest.warns(UserWarning, match='fuera del rango del histograma'):
+        estadisticas = simular_montecarlo(_tes(), _DISTRIBUCIONES, 2000, rangos={'LCOS': (0.0, 1e-9)})
+    assert estadisticas['LCOS'].sobre_rango == 2000
+
+
+def test_service_years_muestreado_se_redondea():
+    lote = TESBatch.from_template(_tes(), 3, service_years=np.array([19.6, 20.4, 24.9]))
+    np.testing.assert_array_equal(lote.service_years, [20, 20, 25])
+
+
+def test_van_vectorizado_igual_al_flujo_de_caja():
+    años, tasas, inversiones = 15, np.array([0.05, 0.08, 0.1]), np.array([3e5, 4e5, 5e5])
+    van = van_vectorizado(años, 0.1, 1e6, 5e4, 2e4, 0.0, 5e3, 1e4, 3e3, inversiones, 0.25, tasas)
+    for i in range(3):
+        esperado = calcular_flujo_de_caja(años, [0.1] * años, [1e6] * años, [5e4] * años, [2e4] * años, [0.0] * años, [5e3] * años,
+                                          [1e4] * años, [3e3] * años, inversiones[i], 0.25, tasas[i])['VAN'][-1]
+        assert van[i] == pytest.approx(esperado, rel=1e-12)
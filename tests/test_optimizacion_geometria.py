@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+
+from optimizacion_geometria import DIMENSIONES, gradiente_lcos_estanque_cilindrico, lcos_estanque_cilindrico, optimizar_estanque_cilindrico
+from TES_object import TES
+
+
+def _tes():
+    # Estanques de aceite de Orsini, con el medio como componente
+    tes = TES(350.0133, 200.3255, 1630, 7000, [("Therminol1", 210.0, 8128.87)])
+    tes.set_additional_parameters(temporal_adjustment_index=1, installation_percentage=0.1, tes_energy_capacity=37500, cycles_per_year=365,
+                                  tes_efficiency=0.7, delta_pressure_charge=9000, delta_pressure_discharge=9000, mass_flow_rate_charge=161000,
+                                  mass_flow_rate_discharge=413000, working_fluid_density=700, charging_time=9, discharging_time=4, service_years=30,
+                                  annual_discount_rate=0.07, electricity_cost_per_joule=0.396, fan_efficiency=0.95, capex_maintenance_percentage=0.02)
+    return tes
+
+
+_LIMITES = {'altura': (2.0, 60.0), 'radio': (5.0, 30.0), 'espesor_acero': (0.05, 0.1), 'espesor_aislamiento': (0.03, 0.1)}
+
+
+def test_optimo_igual_a_una_busqueda_en_grilla():
+    tes = _tes()
+    optimo = optimizar_estanque_cilindrico(tes, _LIMITES, "Therminol1")
+    assert (optimo['espesor_acero'], optimo['espesor_aislamiento']) == (0.05, 0.03)
+
+    # Mismo volumen de medio que el diseño base, con la altura que lo completa para cada radio
+    volumen = 8128.87
+    radios = np.linspace(5.0, 30.0, 200_001)
+    alturas = volumen / (np.pi * radios ** 2)
+    validos = (alturas >= 2.0) & (alturas <= 60.0)
+    lcos = lcos_estanque_cilindrico(tes, alturas[validos], radios[validos], 0.05, 0.03, "Therminol1")
+    assert optimo['LCOS'] <= lcos.min() * (1 + 1e-12)
+    # El óptimo queda dentro de los límites
+    assert 5.0 < optimo['radio'] < 30.0 and 2.0 < optimo['altura'] < 60.0
+    assert optimo['radio'] == pytest.approx(radios[validos][np.argmin(lcos)], abs=radios[1] - radios[0])
+
+
+def test_gradiente_igual_a_diferencias_finitas():
+    tes = _tes()
+    dimensiones = {'altura': 11.5, 'radio': 15.0, 'espesor_acero': 0.07, 'espesor_aislamiento': 0.04}
+    gradiente = gradiente_lcos_estanque_cilindrico(tes, **dimensiones, componente_medio="Therminol1")
+    for dimension in DIMENSIONES:
+        paso = 1e-6 * dimensiones[dimension]
+        alto = lcos_estanque_cilindrico(tes, **dict(dimensiones, **{dimension: dimensiones[dimension] + paso}), componente_medio="Therminol1")
+        bajo = lcos_estanque_cilindrico(tes, **dict(dimensiones, **{dimension: dimensiones[dimension] - paso}), componente_medio="Therminol1")
+        assert gradiente[dimension] == pytest.approx((alto - bajo) / (2 * paso), rel=1e-6)
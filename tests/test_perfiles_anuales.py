@@ -0,0 +1,96 @@
+import numpy as np
+import pytest
+
+from despacho import simular_despacho
+from optimizacion_geometria import coeficientes_lcos, lcos_estanque_cilindrico, tes_con_estanque_cilindrico
+import TES_functions
+from perfiles_anuales import degradacion
+from TES_batch import TESBatch
+from TES_object import TES
+
+
+def _tes():
+    # Estanques de aceite de Orsini, con el medio como componente
+    tes = TES(120.0, 40.0, 1630, 7000, [("Therminol1", 210.0, 16000.0)])
+    tes.set_additional_parameters(temporal_adjustment_index=1, installation_percentage=0.1, tes_energy_capacity=37500, cycles_per_year=365,
+                                  tes_efficiency=0.7, delta_pressure_charge=9000, delta_pressure_discharge=9000, mass_flow_rate_charge=161000,
+                                  mass_flow_rate_discharge=413000, working_fluid_density=700, charging_time=9, discharging_time=4, service_years=30,
+                                  annual_discount_rate=0.07, electricity_cost_per_joule=0.396, fan_efficiency=0.95, capex_maintenance_percentage=0.02)
+    return tes
+
+
+def test_coeficientes_lcos_con_valores_constantes_por_año():
+    tes = _tes()
+    constantes = coeficientes_lcos(tes, "Therminol1")
+    tes.tes_efficiency = [0.7] * 30
+    por_año = coeficientes_lcos(tes, "Therminol1")
+    for nombre, valor in constantes.items():
+        assert por_año[nombre] == pytest.approx(valor, rel=1e-12)
+
+
+def test_lcos_estanque_cilindrico_con_degradacion():
+    tes = _tes()
+    tes.tes_efficiency = degradacion(0.7, 0.01)
+    dimensiones = (12.0, 14.0, 0.07, 0.04)
+    esperado = tes_con_estanque_cilindrico(tes, *dimensiones, "Therminol1").LCOS()
+    assert lcos_estanque_cilindrico(tes, *dimensiones, "Therminol1") == pytest.approx(esperado, rel=1e-12)
+
+
+def test_despacho_usa_la_eficiencia_de_cada_año():
+    rng = np.random.default_rng(0)
+    precio, disponibilidad = rng.random((3, 48)), rng.random((3, 48))
+    tes = _tes()
+    base = simular_despacho(tes, precio, disponibilidad)
+    tes.tes_efficiency = [0.7, 0.6, 0.5]
+    por_año = simular_despacho(tes, precio, disponibilidad)
+    np.testing.assert_allclose(por_año['energia_entregada'] / base['energia_entregada'], [1.0, 0.6 / 0.7, 0.5 / 0.7])
+
+    lote = TESBatch.from_objects([_tes(), _tes()])
+    lote.tes_efficiency = np.array([[0.7, 0.6, 0.5], [0.7, 0.7, 0.7]])
+    resultado = simular_despacho(lote, precio, disponibilidad)
+    np.testing.assert_allclose(resultado['energia_entregada'], [por_año['energia_entregada'], base['energia_entregada']])
+
+
+def test_opex_by_year_es_de_solo_lectura():
+    tes = _tes()
+    tes.cycles_per_year = [365] * 30
+    opex = tes.opex_by_year()
+    with pytest.raises(ValueError):
+        opex[0] = 0.0
+    assert tes.opex_by_year() is opex
+
+
+def _argumentos_lcos(**cambios):
+    argumentos = dict(annual_discount_rate=0.07, tes_energy_capacity=37500, cycles_per_year=365, service_years=30, tes_efficiency=0.7,
+                      iron_volume=120.0, insulation_volume=40.0, price_per_cubic_meter_iron=1630, price_per_cubic_meter_insulation=7000,
+                      components=[("Therminol1", 210.0, 16000.0)], initial_pressure=101325, final_pressure=110325, working_fluid_flow=230.0,
+                      working_fluid_density=700, charging_time=9, discharging_time=4, electricity_cost_per_joule=0.396, fan_efficiency=0.95,
+                      capex_maintenance_percentage=0.02)
+    argumentos.update(cambios)
+    return argumentos
+
+
+def _argumentos_opex(argumentos):
+    return {nombre: argumentos[nombre] for nombre in ('initial_pressure', 'final_pressure', 'working_fluid_flow', 'working_fluid_density', 'charging_time',
+                                                      'discharging_time', 'cycles_per_year', 'service_years', 'electricity_cost_per_joule', 'fan_efficiency',
+                                                      'capex_maintenance_percentage', 'iron_volume', 'insulation_volume', 'price_per_cubic_meter_iron',
+                                                      'price_per_cubic_meter_insulation', 'components')}
+
+
+def test_lcos_de_funciones_con_valores_por_año():
+    constante = TES_functions.LCOS(**_argumentos_lcos())
+    assert TES_functions.LCOS(**_argumentos_lcos(tes_efficiency=[0.7] * 30, cycles_per_year=(365,) * 30)) == pytest.approx(constante, rel=1e-12)
+
+    # Con degradación, el OPEX y la energía descargada de cada año se descuentan por separado
+    argumentos = _argumentos_lcos(tes_efficiency=degradacion(0.7, 0.01), electricity_cost_per_joule=[0.396 * 1.02 ** año for año in range(30)])
+    factores = 1.07 ** -np.arange(1, 31)
+    opex = np.array([TES_functions.opex(**{**_argumentos_opex(argumentos), 'electricity_cost_per_joule': costo})
+                     for costo in argumentos['electricity_cost_per_joule']])
+    capex = TES_functions.capex_knobloch(120.0, 40.0, 1630, 7000, argumentos['components'])
+    energia = 37500 * 365 * np.sum(0.7 * 0.99 ** np.arange(30) * factores)
+    assert TES_functions.LCOS(**argumentos) == pytest.approx((capex + np.sum(opex * factores)) / energia, rel=1e-12)
+
+
+def test_lcos_de_funciones_rechaza_tasas_por_diseño_con_valores_por_año():
+    with pytest.raises(ValueError, match="deben ser escalares"):
+        TES_functions.LCOS(**_argumentos_lcos(annual_discount_rate=np.array([0.05, 0.07]), tes_efficiency=[0.7] * 30))
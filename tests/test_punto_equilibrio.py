@@ -0,0 +1,32 @@
+import numpy as np
+import pytest
+
+from Flujo_de_caja2 import calcular_flujo_de_caja, calcular_flujo_de_caja_portafolio
+from punto_equilibrio import VARIABLES, punto_equilibrio
+from tasa_interna_retorno import calcular_tir
+
+PARAMETROS = dict(años=10, precio_energia=[0.1 + 0.002 * año for año in range(10)], produccion_anual=[1e6] * 10, subsidios=50_000.0,
+                  costos_om=20_000.0, costos_combustible=0.0, costos_capital=5_000.0, costos_seguro=10_000.0, otros_costos=5_000.0,
+                  inversion_inicial=500_000.0, tasa_impuestos=0.25, tasa_descuento=0.08)
+
+
+@pytest.mark.parametrize('variable', VARIABLES)
+def test_van_recalculado_igual_al_objetivo(variable):
+    objetivo = 25_000.0
+    valor = punto_equilibrio(variable, PARAMETROS, van_objetivo=objetivo)
+    van = calcular_flujo_de_caja(**dict(PARAMETROS, **{variable: valor}))['VAN'][-1]
+    assert van == pytest.approx(objetivo, rel=1e-9, abs=1e-6)
+
+
+def test_tir_recalculada_igual_al_objetivo():
+    valor = punto_equilibrio('precio_energia', PARAMETROS, tir_objetivo=0.12)
+    flujos = calcular_flujo_de_caja(**dict(PARAMETROS, precio_energia=valor))['Flujo de Caja Libre']
+    assert calcular_tir(flujos) == pytest.approx(0.12, rel=1e-9)
+
+
+def test_portafolio():
+    inversiones = np.array([3e5, 5e5, 7e5])
+    objetivos = np.array([0.0, 1e4, -1e4])
+    precios = punto_equilibrio('precio_energia', dict(PARAMETROS, inversion_inicial=inversiones), van_objetivo=objetivos)
+    flujo = calcular_flujo_de_caja_portafolio(**dict(PARAMETROS, precio_energia=precios[:, None], inversion_inicial=inversiones))
+    np.testing.assert_allclose(flujo['VAN'][:, -1], objetivos, atol=1e-6)
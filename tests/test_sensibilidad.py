@@ -0,0 +1,41 @@
+import copy
+
+import numpy as np
+import pytest
+
+from sensibilidad import analisis_tornado
+from TES_object import TES
+
+
+def _tes():
+    tes = TES(120.0, 40.0, 1630, 7000, [("Therminol1", 210.0, 16000.0)])
+    tes.set_additional_parameters(temporal_adjustment_index=1, installation_percentage=0.1, tes_energy_capacity=37500, cycles_per_year=365,
+                                  tes_efficiency=0.7, delta_pressure_charge=9000, delta_pressure_discharge=9000, mass_flow_rate_charge=161000,
+                                  mass_flow_rate_discharge=413000, working_fluid_density=700, charging_time=9, discharging_time=4, service_years=30,
+                                  annual_discount_rate=0.07, electricity_cost_per_joule=0.396, fan_efficiency=0.95, capex_maintenance_percentage=0.02)
+    return tes
+
+
+def _movido(tes, parametro, factor):
+    movido = copy.copy(tes)
+    valor = getattr(tes, parametro) * factor
+    setattr(movido, parametro, round(valor) if parametro == 'service_years' else valor)
+    return movido
+
+
+def test_barras_iguales_al_lcos_con_un_parametro_movido():
+    tes = _tes()
+    tabla = analisis_tornado(tes, variacion=0.2, metricas=('LCOS',))
+    assert len(tabla) == len(tes.get_parameters()) - 1
+    for fila in tabla.itertuples(index=False):
+        assert fila[2] == pytest.approx(tes.LCOS(), rel=1e-12)
+        assert fila[3] == pytest.approx(_movido(tes, fila[1], 0.8).LCOS(), rel=1e-12)
+        assert fila[4] == pytest.approx(_movido(tes, fila[1], 1.2).LCOS(), rel=1e-12)
+
+
+def test_barras_ordenadas_por_variacion():
+    tabla = analisis_tornado(_tes(), metricas=('LCOS', 'capex_pereira'))
+    for _, grupo in tabla.groupby('Métrica', sort=False):
+        variaciones = grupo['Variación'].to_numpy()
+        assert np.all(np.diff(variaciones) <= 0)
+        np.testing.assert_allclose(variaciones, np.abs(grupo['Alto'] - grupo['Bajo']))
@@ -0,0 +1,44 @@
+import numpy as np
+import pandas as pd
+
+from series_horarias import agregar_csv, agregar_npy, csv_a_npy
+
+
+def _serie(tmp_path):
+    # 25 pasos en tres años; con bloques de 10 filas el último bloque queda incompleto
+    rng = np.random.default_rng(0)
+    tabla = pd.DataFrame({'fecha': [f"{año}-01-01 {hora:02d}:00" for año, horas in ((2023, 9), (2024, 11), (2025, 5)) for hora in range(horas)],
+                          'precio': rng.uniform(0.05, 0.2, 25), 'produccion': rng.uniform(0, 100, 25)})
+    ruta = tmp_path / 'serie.csv'
+    tabla.to_csv(ruta, index=False)
+    tabla['año'] = tabla['fecha'].str.slice(0, 4).astype(int)
+    tabla['ingresos'] = tabla['precio'] * tabla['produccion']
+    return str(ruta), tabla.groupby('año')[['produccion', 'ingresos']].sum()
+
+
+def test_csv_a_npy_y_agregar_npy_igual_a_groupby(tmp_path):
+    ruta, esperado = _serie(tmp_path)
+    assert csv_a_npy(ruta, str(tmp_path / 'npy'), tamano_bloque=10) == 25
+    for resultado in (agregar_npy(str(tmp_path / 'npy' / 'precio.npy'), str(tmp_path / 'npy' / 'produccion.npy'), str(tmp_path / 'npy' / 'año.npy'),
+                                  tamano_bloque=10),
+                      agregar_csv(ruta, tamano_bloque=10)):
+        np.testing.assert_array_equal(resultado['año'], [2023, 2024, 2025])
+        np.testing.assert_array_equal(resultado['pasos'], [9, 11, 5])
+        np.testing.assert_allclose(resultado['produccion_anual'], esperado['produccion'], rtol=1e-12)
+        np.testing.assert_allclose(resultado['ingresos'], esperado['ingresos'], rtol=1e-12)
+
+
+def test_año_bisiesto_sin_columna_de_años(tmp_path):
+    pasos = [8784, 8760]
+    precio, produccion = np.full(sum(pasos), 0.1), np.ones(sum(pasos))
+    np.save(tmp_path / 'precio.npy', precio)
+    np.save(tmp_path / 'produccion.npy', produccion)
+    resultado = agregar_npy(str(tmp_path / 'precio.npy'), str(tmp_path / 'produccion.npy'), pasos_por_año=pasos, año_inicial=2024, tamano_bloque=5000)
+    np.testing.assert_array_equal(resultado['año'], [2024, 2025])
+    np.testing.assert_array_equal(resultado['pasos'], pasos)
+    np.testing.assert_allclose(resultado['produccion_anual'], pasos)
+    np.testing.assert_allclose(resultado['precio_energia'], 0.1)
+
+    # Con un número fijo de pasos, un año bisiesto completo también se agrega como un solo año
+    resultado = agregar_npy(str(tmp_path / 'precio.npy'), str(tmp_path / 'produccion.npy'), pasos_por_año=8784, tamano_bloque=5000, años=1)
+    np.testing.assert_array_equal(resultado['pasos'], [8784])
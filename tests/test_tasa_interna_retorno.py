@@ -0,0 +1,30 @@
+import numpy as np
+import numpy_financial as npf
+import pytest
+
+from tasa_interna_retorno import calcular_tir, calcular_tir_filas
+
+
+def _npf_irr(fila):
+    tir = npf.irr(fila)
+    return np.nan if tir is None else tir
+
+
+def test_calcular_tir_filas_igual_a_npf_irr_con_un_cambio_de_signo():
+    rng = np.random.default_rng(0)
+    flujos = np.column_stack([-rng.uniform(500, 1500, 200), rng.uniform(50, 300, (200, 15))])
+    np.testing.assert_allclose(calcular_tir_filas(flujos), [_npf_irr(fila) for fila in flujos], rtol=1e-9)
+
+
+@pytest.mark.parametrize('fila', [
+    [-100.0, 230.0, -132.0],                    # dos cambios de signo: TIR de 10 % y 20 %
+    [-1000.0, 3000.0, -3200.0, 1500.0, -200.0],  # cuatro cambios de signo
+    [0.0, 0.0, -100.0, 60.0, 60.0],             # ceros al inicio
+    [0.0, -100.0, 0.0, 0.0, 150.0],             # ceros al inicio y entre flujos
+    [100.0, 50.0, 20.0],                        # sin cambios de signo
+])
+def test_calcular_tir_filas_casos_especiales(fila):
+    esperado = _npf_irr(np.array(fila))
+    resultado = calcular_tir_filas([fila, fila])
+    np.testing.assert_allclose(resultado, [esperado, esperado], rtol=1e-9, equal_nan=True)
+    np.testing.assert_allclose(calcular_tir(np.array(fila)), esperado, rtol=1e-9, equal_nan=True)
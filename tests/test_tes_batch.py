@@ -0,0 +1,103 @@
+import numpy as np
+import pytest
+
+from TES_batch import TESBatch
+
+CAPEX_PARAMS = ('iron_volume', 'insulation_volume', 'price_per_cubic_meter_iron', 'price_per_cubic_meter_insulation', 'temporal_adjustment_index',
+                'installation_percentage', 'density_tes_material', 'volume_tes_material', 'specific_heat_tes_material', 'temperature_difference',
+                'tes_efficiency', 'k_mctigue', 'final_pressure')
+
+
+def _columnas(n=200, semilla=0):
+    rng = np.random.default_rng(semilla)
+    escalas = dict(iron_volume=10, insulation_volume=5, price_per_cubic_meter_iron=2000, price_per_cubic_meter_insulation=900, temporal_adjustment_index=2,
+                   installation_percentage=1, density_tes_material=3000, volume_tes_material=9, specific_heat_tes_material=2, temperature_difference=600,
+                   tes_efficiency=1, k_mctigue=1, final_pressure=2e5)
+    return {parametro: 1 + rng.random(n) * escalas[parametro] for parametro in CAPEX_PARAMS}
+
+
+@pytest.mark.parametrize('dtype', [np.float64, np.float32, np.int64])
+@pytest.mark.parametrize('inicio', [0, 1])
+def test_capex_all_igual_a_metodos_individuales(dtype, inicio):
+    lote = TESBatch(components=[('válvulas', 242.82, 8)], **_columnas())
+    # Asignar columnas después de crear el lote conserva su tipo (sin la conversión de TESBatch); solo algunas
+    # cambian de tipo, para mezclar tipos en cada operación
+    for parametro, columna in list(_columnas().items())[inicio::2]:
+        setattr(lote, parametro, columna.astype(dtype))
+    todos = lote.capex_all()
+    assert list(todos) == list(TESBatch._CAPEX_METHODS)
+    for metodo in TESBatch._CAPEX_METHODS:
+        individual = getattr(lote, metodo)()
+        assert todos[metodo].dtype == individual.dtype
+        np.testing.assert_array_equal(todos[metodo], individual)
+
+
+def test_capex_all_reporta_datos_faltantes():
+    columnas = {parametro: valor for parametro, valor in _columnas().items() if parametro not in ('k_mctigue', 'installation_percentage')}
+    lote = TESBatch(components=[], **columnas)
+    todos = lote.capex_all()
+    assert todos['capex_mctigue'] == lote.capex_mctigue()
+    assert todos['capex_pereira'] == lote.capex_pereira()
+    np.testing.assert_array_equal(todos['capex_trevisan'], lote.capex_trevisan())
+
+
+def _diseños():
+    from TES_object import TES
+    diseños = []
+    for i, columnas in enumerate(zip(*_columnas(n=4).values())):
+        parametros = dict(zip(CAPEX_PARAMS, columnas))
+        tes = TES(*(parametros.pop(nombre) for nombre in CAPEX_PARAMS[:4]), [('válvulas', 242.82, 8 + i), ('ventilador', 475.94, 1)])
+        tes.set_additional_parameters(**parametros, delta_pressure_charge=11000.0 + i, delta_pressure_discharge=1000.0, mass_flow_rate_charge=0.58,
+                                      mass_flow_rate_discharge=0.65 + i, working_fluid_density=1.274, charging_time=9.0, discharging_time=4.0,
+                                      cycles_per_year=365.0 - i, service_years=30 - i, electricity_cost_per_joule=0.396, fan_efficiency=0.95,
+                                      capex_maintenance_percentage=0.02, annual_discount_rate=0.07 + i / 100, tes_energy_capacity=1900.0)
+        diseños.append(tes)
+    return diseños
+
+
+@pytest.mark.parametrize('metodo', [*TESBatch._CAPEX_METHODS, 'opex', 'LCOS'])
+def test_lote_igual_a_tes_escalar(metodo):
+    diseños = _diseños()
+    resultado = getattr(TESBatch.from_objects(diseños), metodo)()
+    np.testing.assert_array_equal(resultado, [getattr(tes, metodo)() for tes in diseños])
+
+
+def test_lcos_del_lote_identico_con_muchas_tasas():
+    rng = np.random.default_rng(1)
+    diseños = _diseños()[:1] * 2000
+    lote = TESBatch.from_objects(diseños)
+    lote.annual_discount_rate = rng.random(2000) * 0.3
+    lote.service_years = rng.integers(1, 60, 2000)
+    esperado = []
+    for tasa, años in zip(lote.annual_discount_rate.tolist(), lote.service_years.tolist()):
+        diseños[0].set_additional_parameters(annual_discount_rate=tasa, service_years=años)
+        esperado.append(diseños[0].LCOS())
+    np.testing.assert_array_equal(lote.LCOS(), esperado)
+
+
+@pytest.mark.parametrize('componentes', [[['válvulas', 242.82, 8], ['ventilador', 475.94, 1]],
+                                         (('válvulas', 242.82, 8), ('ventilador', 475.94, 1))])
+def test_lista_de_componentes_compartida_como_listas(componentes):
+    lote = TESBatch(1.0, 2.0, 3.0, 4.0, componentes, temporal_adjustment_index=[1.0, 1.1, 1.2])
+    assert len(lote) == 3
+    np.testing.assert_array_equal(lote.capex_knobloch(), 11.0 + 242.82 * 8 + 475.94)
+
+
+def test_listas_de_componentes_por_diseño():
+    from lista_materiales import ListaMateriales
+    componentes = [[['válvulas', 242.82, 8]], [], ListaMateriales.desde_componentes([('ventilador', 475.94, 2)])]
+    lote = TESBatch(1.0, 2.0, 3.0, 4.0, componentes)
+    assert len(lote) == 3
+    np.testing.assert_array_equal(lote.capex_knobloch(), [11.0 + 242.82 * 8, 11.0, 11.0 + 475.94 * 2])
+
+
+def test_lote_igual_a_tes_escalar_con_valores_por_año():
+    from perfiles_anuales import degradacion
+    diseños = _diseños()
+    for i, tes in enumerate(diseños):
+        tes.tes_efficiency = degradacion(0.9 - i / 20, 0.005)
+        tes.cycles_per_year = [300.0 + año for año in range(30)]
+    lote = TESBatch.from_objects(diseños)
+    # Las sumas por año del lote van en forma cerrada, con otro orden de operaciones que TES (ver TESBatch.LCOS)
+    for metodo in ('opex', 'LCOS', 'capex_kocher'):
+        np.testing.assert_allclose(getattr(lote, metodo)(), [getattr(tes, metodo)() for tes in diseños], rtol=1e-12)
@@ -0,0 +1,106 @@
+import copy
+import pickle
+import tracemalloc
+
+import pytest
+
+from TES_object import TES
+
+
+def _tes():
+    tes = TES(1.0, 6.45, 1737.47, 2432.64, [("válvulas", 242.82, 8)])
+    tes.set_additional_parameters(temporal_adjustment_index=1, installation_percentage=0.15, service_years=30)
+    return tes
+
+
+class _ConDict:
+    # Objeto con __dict__ de instancia, como el TES original
+    def __init__(self, iron_volume, insulation_volume, price_per_cubic_meter_iron, price_per_cubic_meter_insulation, components):
+        self.iron_volume = iron_volume
+        self.insulation_volume = insulation_volume
+        self.price_per_cubic_meter_iron = price_per_cubic_meter_iron
+        self.price_per_cubic_meter_insulation = price_per_cubic_meter_insulation
+        self.components = components
+
+    def set_additional_parameters(self, **kwargs):
+        for key, value in kwargs.items():
+            setattr(self, key, value)
+
+
+def _bytes_por_diseño(clase, parametros, n=2000):
+    componentes = [("válvulas", 242.82, 8)]
+    diseños = []
+    tracemalloc.start()
+    try:
+        inicio = tracemalloc.get_traced_memory()[0]
+        for _ in range(n):
+            tes = clase(1.0, 6.45, 1737.47, 2432.64, componentes)
+            tes.set_additional_parameters(**parametros)
+            diseños.append(tes)
+        return (tracemalloc.get_traced_memory()[0] - inicio) / n
+    finally:
+        tracemalloc.stop()
+
+
+def test_sin_dict_de_instancia():
+    tes = _tes()
+    assert not hasattr(tes, '__dict__')
+    tes.mi_parametro = 1
+    assert type(tes) is TES
+    assert not hasattr(tes, '__dict__')
+
+
+@pytest.mark.parametrize('adicionales', [{}, {'mi_parametro': 1.0}])
+def test_memoria_frente_a_un_objeto_con_dict(adicionales):
+    # Un diseño con todos los parámetros del esquema, que sirve para los cinco métodos de CAPEX
+    parametros = {nombre: 1.0 for nombre in TES._SCHEMA if nombre not in ('iron_volume', 'insulation_volume', 'price_per_cubic_meter_iron',
+                                                                          'price_per_cubic_meter_insulation', 'components')}
+    parametros.update(service_years=30, **adicionales)
+    assert _bytes_por_diseño(TES, parametros) < _bytes_por_diseño(_ConDict, parametros)
+
+
+@pytest.mark.parametrize('parametro, valor', [('iron_volume', '3'), ('iron_volume', None), ('insulation_volume', True),
+                                              ('service_years', [30]), ('components', 'válvulas'), ('tes_efficiency', '0.9')])
+def test_tipos_fuera_del_esquema(parametro, valor):
+    with pytest.raises(TypeError):
+        setattr(_tes(), parametro, valor)
+
+
+def test_valores_por_año_y_parametros_adicionales():
+    tes = _tes()
+    tes.tes_efficiency = [0.9] * 30
+    tes.cycles_per_year = lambda años: 365 - años
+    tes.initial_pressure = 101325
+    tes.mi_parametro = 'a'
+    assert tes.initial_pressure == 101325 and tes.mi_parametro == 'a'
+    assert tes.get_parameters()['mi_parametro'] == 'a'
+    del tes.initial_pressure, tes.mi_parametro
+    assert not hasattr(tes, 'initial_pressure') and not hasattr(tes, 'mi_parametro')
+    with pytest.raises(AttributeError, match="'TES' object has no attribute 'otro_parametro'"):
+        tes.otro_parametro
+
+
+def test_pickle_y_copia_con_parametros_adicionales():
+    tes = _tes()
+    tes.initial_pressure = 101325
+    tes.mi_parametro = 'a'
+    for copia in (pickle.loads(pickle.dumps(tes)), pickle.loads(pickle.dumps(tes, protocol=2)), copy.deepcopy(tes)):
+        assert type(copia) is TES
+        assert copia.get_parameters() == tes.get_parameters()
+        assert copia.mi_parametro == 'a'
+
+
+def _tes_con(**parametros):
+    tes = _tes()
+    tes.set_additional_parameters(**parametros)
+    return tes
+
+
+def test_capex_all_se_invalida_al_cambiar_un_parametro():
+    tes = _tes()
+    antes = tes.capex_all()
+    assert antes['capex_pereira'] == tes.capex_pereira()
+    tes.price_per_cubic_meter_iron *= 2
+    despues = tes.capex_all()
+    assert despues['capex_knobloch'] > antes['capex_knobloch'] and despues['capex_pereira'] > antes['capex_pereira']
+    assert despues == {nombre: getattr(_tes_con(price_per_cubic_meter_iron=tes.price_per_cubic_meter_iron), nombre)() for nombre in despues}
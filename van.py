@@ -59,7 +59,7 @@ tasa_impuestos = 0 # Tasa de impuestos sobre la renta
 tasa_descuento = 0.07 # Tasa de descuento para el cálculo del VAN
 
 # Llamada a la función calcular_flujo_de_caja
-df_flujo_caja = calcular_flujo_de_caja(años, precio_energia, produccion_anual, subsidios, costos_om, costos_combustible, costos_capital, costos_seguro, otros_costos, inversion_inicial, tasa_impuestos, tasa_descuento)
+df_flujo_caja = calcular_flujo_de_caja(años, precio_energia, produccion_anual, subsidios, costos_om, costos_combustible, costos_capital, costos_seguro, otros_costos, inversion_inicial, tasa_impuestos, tasa_descuento).to_dataframe()
 
 # Mostrar el DataFrame resultante
 # print(df_flujo_caja)